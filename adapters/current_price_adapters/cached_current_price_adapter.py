@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter, DEFAULT_MAX_WORKERS
+from adapters.market_status_adapters.market_status_adapter import MarketStatusAdapter
+from registries.standards.adapter_standards import market_open, market_closed, market_pre_market
+
+DEFAULT_OPEN_TTL_SECONDS = 15
+DEFAULT_PRE_MARKET_TTL_SECONDS = 60
+DEFAULT_STATUS_TTL_SECONDS = 60
+
+class CachedCurrentPriceAdapter(CurrentPriceAdapter):
+    """
+    Current price adapter that caches the wrapped adapter's prices according to the market status.
+
+    While the market is open a price is reused for open_ttl seconds and during pre-market for
+    pre_market_ttl seconds. While it is closed, a price fetched after the close cannot change, so it
+    is served until the market reopens (a price fetched before the close is refreshed once).
+    Concurrent requests for a ticker that is already being fetched wait for that fetch instead of
+    issuing their own. The market status itself is cached for status_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        adapter: CurrentPriceAdapter,
+        market_status_adapter: Optional[MarketStatusAdapter] = None,
+        open_ttl: float = DEFAULT_OPEN_TTL_SECONDS,
+        pre_market_ttl: float = DEFAULT_PRE_MARKET_TTL_SECONDS,
+        status_ttl: float = DEFAULT_STATUS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            adapter (CurrentPriceAdapter): Adapter that fetches prices
+            market_status_adapter (MarketStatusAdapter): Source of the market status; None treats the market as open
+            open_ttl (float): Seconds a price is reused while the market is open
+            pre_market_ttl (float): Seconds a price is reused during pre-market
+            status_ttl (float): Seconds the market status is reused
+            clock (callable): Monotonic time source, in seconds
+        """
+        self.adapter = adapter
+        self.market_status_adapter = market_status_adapter
+        self.open_ttl = open_ttl
+        self.pre_market_ttl = pre_market_ttl
+        self.status_ttl = status_ttl
+        self.clock = clock
+        self._prices: Dict[str, Tuple[float, float, str]] = {}  # ticker -> (price, fetched at, market status then)
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._status: Optional[Tuple[str, float]] = None
+
+    def get_current_price(self, ticker: str) -> Optional[float]:
+        return self.get_current_prices([ticker])[ticker]
+
+    def get_current_prices(self, tickers: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Optional[float]]:
+        tickers = list(dict.fromkeys(tickers))
+        status = self.get_market_status()
+        now = self.clock()
+
+        prices: Dict[str, Optional[float]] = {}
+        waiting: Dict[str, Future] = {}
+        owned: List[str] = []
+        with self._lock:
+            for ticker in tickers:
+                entry = self._prices.get(ticker)
+                if entry is not None and self._is_fresh(entry, status, now):
+                    prices[ticker] = entry[0]
+                elif ticker in self._in_flight:
+                    waiting[ticker] = self._in_flight[ticker]
+                else:
+                    self._in_flight[ticker] = Future()
+                    owned.append(ticker)
+
+        if owned:
+            prices.update(self._fetch(owned, status, now, max_workers))
+        for ticker, future in waiting.items():
+            prices[ticker] = future.result()
+        return {ticker: prices.get(ticker) for ticker in tickers}
+
+    def get_market_status(self) -> str:
+        """The market status, refreshed at most every status_ttl seconds. Unknown statuses count as open."""
+        if self.market_status_adapter is None:
+            return market_open
+        now = self.clock()
+        cached = self._status
+        if cached is not None and now - cached[1] < self.status_ttl:
+            return cached[0]
+        try:
+            status = self.market_status_adapter.get_market_status()
+        except Exception as e:
+            logging.error(f"CachedCurrentPriceAdapter market status error: {e}")
+            # Keep the last known status for another period rather than hammering a failing API
+            status = cached[0] if cached is not None else market_open
+        self._status = (status, now)
+        return status
+
+    def invalidate(self, tickers: Optional[Iterable[str]] = None):
+        """Drops cached prices for the tickers (all tickers when None)."""
+        with self._lock:
+            if tickers is None:
+                self._prices.clear()
+            else:
+                for ticker in tickers:
+                    self._prices.pop(ticker, None)
+
+    def _fetch(self, tickers: List[str], status: str, now: float, max_workers: int) -> Dict[str, Optional[float]]:
+        fetched: Dict[str, Optional[float]] = {}
+        try:
+            if len(tickers) == 1:
+                fetched = {tickers[0]: self.adapter.get_current_price(tickers[0])}
+            else:
+                fetched = self.adapter.get_current_prices(tickers, max_workers)
+        except Exception as e:
+            logging.error(f"CachedCurrentPriceAdapter error: {e}")
+        finally:
+            # Always release waiters, with None for anything that could not be priced
+            with self._lock:
+                for ticker in tickers:
+                    price = fetched.get(ticker)
+                    if price is not None:
+                        self._prices[ticker] = (price, now, status)
+                    self._in_flight.pop(ticker).set_result(price)
+        return fetched
+
+    def _is_fresh(self, entry: Tuple[float, float, str], status: str, now: float) -> bool:
+        _, fetched_at, fetched_status = entry
+        if status == market_closed:
+            return fetched_status == market_closed
+        ttl = self.pre_market_ttl if status == market_pre_market else self.open_ttl
+        return now - fetched_at < ttl
@@ -1,9 +1,46 @@
+import contextvars
+import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from clients.metrics_client import instrument, kind_current_price
+
+DEFAULT_MAX_WORKERS = 8
 
 class CurrentPriceAdapter(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument(cls, kind_current_price)
+
     @abstractmethod
     def get_current_price(self, ticker: str):
         """
         Retrieve the current price for a given ticker.
         """
         pass
+
+    def get_current_prices(self, tickers: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Optional[float]]:
+        """
+        Retrieve the current price of every ticker.
+        Returns a dict ticker -> price (None when no price is available), in the order the tickers were given.
+
+        The default implementation calls get_current_price concurrently; adapters whose provider can
+        price many tickers per request override it with bulk requests.
+        """
+        return self._get_prices_concurrently(list(dict.fromkeys(tickers)), max_workers)
+
+    def _get_prices_concurrently(self, tickers, max_workers: int) -> Dict[str, Optional[float]]:
+        if not tickers:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+            # Run each lookup in a copy of the caller's context so its request priority applies in the workers
+            futures = [executor.submit(contextvars.copy_context().run, self._get_price_or_none, ticker) for ticker in tickers]
+            prices = [future.result() for future in futures]
+        return dict(zip(tickers, prices))
+
+    def _get_price_or_none(self, ticker: str) -> Optional[float]:
+        try:
+            return self.get_current_price(ticker)
+        except Exception as e:
+            logging.error(f"{type(self).__name__} error for {ticker}: {e}")
+            return None
@@ -1,10 +1,17 @@
 import logging
+from typing import Dict, Iterable, Optional
 from config import Tiingo_API_KEY
-from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter
+from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter, DEFAULT_MAX_WORKERS
+from adapters.request_scheduler import request_scheduler
+from registries.standards.adapter_standards import provider_tiingo
 import requests
 
 class TiingoCurrentPriceAdapter(CurrentPriceAdapter):
     BASE_URL = "https://api.tiingo.com/tiingo/daily/{ticker}/prices"
+    # IEX top-of-book endpoint, prices many tickers per request
+    IEX_URL = "https://api.tiingo.com/iex/"
+    # Tickers per IEX request (keeps the query string well under URL limits)
+    BATCH_CHUNK_SIZE = 100
 
     def get_current_price(self, ticker: str) -> float:
         """
@@ -16,7 +23,7 @@ class TiingoCurrentPriceAdapter(CurrentPriceAdapter):
             "token": Tiingo_API_KEY,
         }
         try:
-            response = requests.get(url, params=params)
+            response = request_scheduler.get(provider_tiingo, url, key=Tiingo_API_KEY, params=params)
             response.raise_for_status()
             data = response.json()
             if data and isinstance(data, list):
@@ -39,3 +46,34 @@ class TiingoCurrentPriceAdapter(CurrentPriceAdapter):
                 except Exception:
                     pass
             return None
+
+    def get_current_prices(self, tickers: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Optional[float]]:
+        """
+        Prices the universe with one IEX request per chunk of tickers, using Tiingo's last price
+        (tngoLast, then last, then the previous close). Tickers IEX does not cover fall back to
+        get_current_price, run concurrently.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        prices: Dict[str, Optional[float]] = {}
+        with requests.Session() as session:
+            for start in range(0, len(tickers), self.BATCH_CHUNK_SIZE):
+                chunk = tickers[start:start + self.BATCH_CHUNK_SIZE]
+                params = {"tickers": ",".join(chunk), "token": Tiingo_API_KEY}
+                try:
+                    response = request_scheduler.get(provider_tiingo, self.IEX_URL, key=Tiingo_API_KEY, session=session, params=params)
+                    response.raise_for_status()
+                    data = response.json()
+                except (requests.RequestException, ValueError) as e:
+                    logging.error(f"TiingoCurrentPriceAdapter IEX error: {e}")
+                    continue
+                by_symbol = {ticker.upper(): ticker for ticker in chunk}
+                for quote in data if isinstance(data, list) else []:
+                    ticker = by_symbol.get(str(quote.get("ticker", "")).upper())
+                    price = next((quote.get(key) for key in ("tngoLast", "last", "prevClose") if quote.get(key) is not None), None)
+                    if ticker is not None and price is not None:
+                        prices[ticker] = round(float(price), 2)
+
+        missing = [ticker for ticker in tickers if prices.get(ticker) is None]
+        if missing:
+            prices.update(self._get_prices_concurrently(missing, max_workers))
+        return {ticker: prices.get(ticker) for ticker in tickers}
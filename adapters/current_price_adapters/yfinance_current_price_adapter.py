@@ -1,14 +1,23 @@
 import logging
-from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter, DEFAULT_MAX_WORKERS
+from adapters.request_scheduler import request_scheduler
+from clients.metrics_client import metrics
+from registries.standards.adapter_standards import provider_yfinance
 import yfinance as yf
 
 class YFinanceCurrentPriceAdapter(CurrentPriceAdapter):
+    # Tickers per yf.download call
+    BATCH_CHUNK_SIZE = 100
+
     def get_current_price(self, ticker: str) -> float:
         """
         Returns the latest available current price for the given ticker as a float using yfinance, rounded to 2 decimal places.
         If no price is available, returns None.
         """
         try:
+            request_scheduler.acquire(provider_yfinance)
             data = yf.Ticker(ticker)
             # Try to get the real-time price from fast_info or info
             price = None
@@ -31,4 +40,56 @@ class YFinanceCurrentPriceAdapter(CurrentPriceAdapter):
                 return None
         except Exception as e:
             logging.error(f"YFinanceCurrentPriceAdapter error: {e}")
+            metrics.record_error()
             return None
+
+    def get_current_prices(self, tickers: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Optional[float]]:
+        """
+        Prices the whole universe with one yf.download of today's 1-minute bars per chunk of tickers;
+        each price is the ticker's latest close. Tickers the bulk download misses fall back to
+        get_current_price, run concurrently.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        prices: Dict[str, Optional[float]] = {}
+        for start in range(0, len(tickers), self.BATCH_CHUNK_SIZE):
+            chunk = tickers[start:start + self.BATCH_CHUNK_SIZE]
+            try:
+                # yf.download requests each ticker separately
+                request_scheduler.acquire(provider_yfinance, tokens=len(chunk))
+                bars = yf.download(
+                    chunk,
+                    period="1d",
+                    interval="1m",
+                    group_by="ticker",
+                    auto_adjust=True,
+                    actions=False,
+                    threads=min(max_workers, len(chunk)),
+                    progress=False,
+                )
+            except Exception as e:
+                logging.error(f"YFinanceCurrentPriceAdapter bulk download error: {e}")
+                continue
+            prices.update(self._latest_closes(bars, chunk))
+
+        missing = [ticker for ticker in tickers if prices.get(ticker) is None]
+        if missing:
+            prices.update(self._get_prices_concurrently(missing, max_workers))
+        return {ticker: prices.get(ticker) for ticker in tickers}
+
+    def _latest_closes(self, bars: pd.DataFrame, tickers) -> Dict[str, float]:
+        closes = {}
+        if bars is None or bars.empty:
+            return closes
+        for ticker in tickers:
+            if isinstance(bars.columns, pd.MultiIndex):
+                if ticker not in bars.columns.get_level_values(0):
+                    continue
+                close = bars[ticker]["Close"]
+            elif len(tickers) == 1 and "Close" in bars.columns:
+                close = bars["Close"]
+            else:
+                continue
+            close = close.dropna()
+            if not close.empty:
+                closes[ticker] = round(float(close.iloc[-1]), 2)
+        return closes
@@ -0,0 +1,110 @@
+from datetime import datetime, time as clock_time, timedelta
+from typing import Any
+import numpy as np
+import pandas as pd
+from adapters.historical_data_adapters.historical_data_formats import BAR_COLUMNS, empty_bar_frame
+from registries.standards.adapter_standards import daily, weekly, monthly, annually, intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+# Base increment each derived increment is built from
+RESAMPLE_SOURCES = {
+    intraday_5min: intraday_1min,
+    intraday_10min: intraday_1min,
+    intraday_30min: intraday_1min,
+    intraday_1hour: intraday_1min,
+    weekly: daily,
+    monthly: daily,
+    annually: daily,
+}
+
+INTRADAY_MINUTES = {intraday_5min: 5, intraday_10min: 10, intraday_30min: 30, intraday_1hour: 60}
+
+# Intraday buckets are anchored on the regular session open in exchange time
+SESSION_TZ = "America/New_York"
+SESSION_OPEN = clock_time(9, 30)
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+
+def resample_bars(bars: pd.DataFrame, tick_increment: str) -> pd.DataFrame:
+    """
+    Aggregate standardized bars of the base increment into tick_increment bars.
+
+    Each output bar takes the first open, the highest high, the lowest low, the last close and the
+    summed volume of its bucket. Intraday buckets start at the 9:30 ET session open (so a 1hour bar
+    covers 9:30-10:30 and a half day simply ends with a shorter bar), never span two days and are
+    labelled with their start time. Weekly (Monday to Sunday), monthly and annual bars are built from
+    daily bars and labelled with the DateTime of the last daily bar in the period, so a holiday Friday
+    gives a week ending Thursday. Grouping is done with NumPy reductions over the sorted bars.
+    Args:
+        bars (pd.DataFrame): Bars in the standard frame format (see standardize_bar_frame) of the increment
+            RESAMPLE_SOURCES lists for tick_increment.
+        tick_increment (str): The increment to build.
+    Returns:
+        pd.DataFrame: Resampled bars in the standard frame format.
+    """
+    if tick_increment not in RESAMPLE_SOURCES:
+        raise ValueError(f"Cannot resample to '{tick_increment}'. Must be one of {set(RESAMPLE_SOURCES)}.")
+    if bars.empty:
+        return empty_bar_frame()
+
+    timestamps = pd.to_datetime(bars[df_datetime], utc=True)
+    order = np.argsort(timestamps.to_numpy(dtype="datetime64[ns]"), kind="stable")
+    timestamps = timestamps.iloc[order]
+    utc_ns = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    if tick_increment in INTRADAY_MINUTES:
+        keys, labels = _intraday_buckets(timestamps, utc_ns, INTRADAY_MINUTES[tick_increment] * NS_PER_MINUTE)
+    else:
+        keys = _calendar_keys(utc_ns, tick_increment)
+        labels = None
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+    if labels is None:
+        labels = utc_ns[ends]
+    else:
+        labels = labels[starts]
+
+    def column(name):
+        return bars[name].to_numpy(dtype=np.float64)[order]
+
+    resampled = pd.DataFrame({df_datetime: pd.to_datetime(labels, utc=True).astype("datetime64[ns, UTC]")})
+    resampled[df_open] = column(df_open)[starts]
+    resampled[df_close] = column(df_close)[ends]
+    resampled[df_high] = np.fmax.reduceat(column(df_high), starts)
+    resampled[df_low] = np.fmin.reduceat(column(df_low), starts)
+    resampled[df_volume] = np.add.reduceat(np.nan_to_num(column(df_volume)), starts).astype(np.int64)
+    return resampled[BAR_COLUMNS]
+
+def resample_start(start_date: Any, tick_increment: str) -> Any:
+    """
+    The start date to request base bars from so the first tick_increment bar is complete:
+    the Monday, first of the month or first of the year on or before start_date.
+    Intraday buckets never cross days, so intraday starts are returned unchanged.
+    """
+    day = start_date.date() if isinstance(start_date, datetime) else start_date
+    if tick_increment == weekly:
+        day -= timedelta(days=day.weekday())
+    elif tick_increment == monthly:
+        day = day.replace(day=1)
+    elif tick_increment == annually:
+        day = day.replace(month=1, day=1)
+    else:
+        return start_date
+    return datetime.combine(day, clock_time.min) if isinstance(start_date, datetime) else day
+
+def _intraday_buckets(timestamps: pd.Series, utc_ns: np.ndarray, interval_ns: int):
+    """Bucket keys (local bucket start) and UTC bucket start labels for intraday bars."""
+    local_ns = timestamps.dt.tz_convert(SESSION_TZ).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    session_open = local_ns // NS_PER_DAY * NS_PER_DAY + (SESSION_OPEN.hour * 60 + SESSION_OPEN.minute) * NS_PER_MINUTE
+    local_start = session_open + (local_ns - session_open) // interval_ns * interval_ns
+    return local_start, utc_ns - (local_ns - local_start)
+
+def _calendar_keys(utc_ns: np.ndarray, tick_increment: str) -> np.ndarray:
+    """Period keys for daily bars. Daily bars carry their trading date at midnight UTC."""
+    if tick_increment == weekly:
+        # 1970-01-01 was a Thursday; shift so weeks run Monday to Sunday
+        return (utc_ns // NS_PER_DAY + 3) // 7
+    unit = "M" if tick_increment == monthly else "Y"
+    return utc_ns.view("datetime64[ns]").astype(f"datetime64[{unit}]").astype(np.int64)
@@ -0,0 +1,210 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter, HistoricalDataResult
+from adapters.historical_data_adapters.historical_data_formats import validate_output_format, standardize_bar_frame, format_bar_frame, bar_frame_to_records, empty_bars
+from clients.metrics_client import kind_historical_data, metrics
+from dbs.duck_db_client import DuckDBClient, subtract_date_ranges
+from dbs.memmap_bar_store import MemmapBarStore
+from registries.standards.adapter_standards import daily, intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
+from registries.standards.adapter_standards import output_records, output_dataframe, output_arrays
+
+class CachedHistoricalDataAdapter(HistoricalDataAdapter):
+    """
+    Historical data adapter that serves bars from a local DuckDB store and only asks the wrapped
+    adapter for the calendar days it has not fetched yet.
+
+    Each fetched day range is recorded in the store. The current UTC day is never recorded as fetched
+    because its bars are still forming, so a refresh of a daily lookback downloads just the latest bar
+    per ticker. Days the provider returns nothing for (weekends, holidays) are still recorded and will
+    not be requested again; ranges whose request failed are not, so they are retried on the next call.
+    Only the window the wrapped adapter actually queries is recorded (see get_query_window), so days
+    before a provider's intraday lookback stay missing rather than being cached as empty.
+
+    Only daily and intraday increments are cached. Weekly, monthly and annual bars are aggregated by
+    the provider over the requested range, so fetching a partial gap would store partial bars; those
+    increments are passed straight through to the wrapped adapter.
+
+    With a bar_store, every stored bar is mirrored into memory-mapped bar files and output_arrays
+    requests are answered with zero-copy views of those files instead of a DuckDB query. A ticker
+    whose file does not exist yet is exported from DuckDB on first use. The fetched ranges are mirrored
+    beside the files too, so a fully cached output_arrays request never opens DuckDB: several reader
+    processes can share the files' page cache while one writer process holds the DuckDB file lock.
+    """
+    CACHED_FREQS = {daily, intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour}
+
+    def __init__(
+        self,
+        adapter: HistoricalDataAdapter,
+        db_client: Optional[DuckDBClient] = None,
+        bar_store: Optional[MemmapBarStore] = None,
+    ):
+        self.adapter = adapter
+        self.db_client = db_client if db_client is not None else DuckDBClient()
+        self.bar_store = bar_store
+
+    def get_historical_data(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        output_format: str = output_records,
+    ) -> Any:
+        """
+        Return bars for the ticker and date range, fetching only the missing days from the wrapped adapter.
+        Returns a list of dicts in the same format as TiingoHistoricalDataAdapter, ordered by DateTime,
+        or a DataFrame / dict of arrays when output_format asks for a columnar format.
+        """
+        validate_output_format(output_format)
+        if tick_increment not in self.CACHED_FREQS:
+            return self.adapter.get_historical_data(ticker, start_date, end_date, tick_increment, output_format=output_format)
+
+        for gap_start, gap_end in self._get_missing_ranges(ticker, tick_increment, start_date, end_date, output_format):
+            # The batch path reports failures instead of returning empty bars, so a failed request is
+            # not mistaken for days without bars and recorded as fetched
+            for _, data, error in self.adapter.get_historical_data_batch(
+                [ticker],
+                self._to_datetime(gap_start),
+                self._to_datetime(gap_end, end_of_day=True),
+                tick_increment,
+                max_workers=1,
+                output_format=output_dataframe,
+            ):
+                if error is None:
+                    self._store(ticker, tick_increment, self._queried_start(gap_start, gap_end, tick_increment), gap_end, data)
+                else:
+                    logging.error(f"CachedHistoricalDataAdapter failed to fetch {ticker} {gap_start} to {gap_end}: {error}")
+        return self._load(ticker, tick_increment, start_date, end_date, output_format)
+
+    def get_historical_data_batch(
+        self,
+        tickers: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        max_workers: int = HistoricalDataAdapter.DEFAULT_MAX_WORKERS,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """
+        Return bars for many tickers, serving fully cached tickers first.
+        Tickers missing the same day range are fetched together through the wrapped adapter's own
+        get_historical_data_batch, so a routine refresh is a single batch for the whole universe.
+        """
+        validate_output_format(output_format)
+        if tick_increment not in self.CACHED_FREQS:
+            yield from self.adapter.get_historical_data_batch(
+                tickers, start_date, end_date, tick_increment, max_workers, output_format=output_format
+            )
+            return
+
+        tickers = list(dict.fromkeys(tickers))
+        tickers_by_gap: Dict[Tuple[date, date], List[str]] = defaultdict(list)
+        pending_gaps: Dict[str, int] = {}
+        for ticker in tickers:
+            gaps = self._get_missing_ranges(ticker, tick_increment, start_date, end_date, output_format)
+            if not gaps:
+                yield HistoricalDataResult(ticker, self._measured_load(ticker, tick_increment, start_date, end_date, output_format))
+                continue
+            pending_gaps[ticker] = len(gaps)
+            for gap in gaps:
+                tickers_by_gap[gap].append(ticker)
+
+        failed: Dict[str, Exception] = {}
+        for (gap_start, gap_end), gap_tickers in tickers_by_gap.items():
+            queried_start = self._queried_start(gap_start, gap_end, tick_increment)
+            results = self.adapter.get_historical_data_batch(
+                gap_tickers,
+                self._to_datetime(gap_start),
+                self._to_datetime(gap_end, end_of_day=True),
+                tick_increment,
+                max_workers,
+                output_format=output_dataframe,
+            )
+            for ticker, data, error in results:
+                if error is None:
+                    try:
+                        self._store(ticker, tick_increment, queried_start, gap_end, data)
+                    except Exception as e:
+                        logging.error(f"CachedHistoricalDataAdapter failed to store {ticker}: {e}")
+                        error = e
+                if error is not None:
+                    failed.setdefault(ticker, error)
+                pending_gaps[ticker] -= 1
+                if pending_gaps[ticker] == 0:
+                    if ticker in failed:
+                        yield HistoricalDataResult(ticker, empty_bars(output_format), failed[ticker])
+                    else:
+                        yield HistoricalDataResult(ticker, self._measured_load(ticker, tick_increment, start_date, end_date, output_format))
+
+    def _measured_load(self, ticker: str, tick_increment: str, start_date: datetime, end_date: datetime, output_format: str) -> Any:
+        # Batch reads from the store are measured per ticker; fetches of the gaps are measured by the wrapped adapter
+        return metrics.call(kind_historical_data, self, ticker, self._load, ticker, tick_increment, start_date, end_date, output_format)
+
+    def _get_missing_ranges(
+        self,
+        ticker: str,
+        tick_increment: str,
+        start_date: datetime,
+        end_date: datetime,
+        output_format: str = output_records,
+    ) -> List[Tuple[date, date]]:
+        if output_format == output_arrays and self.bar_store is not None and self.bar_store.has_bars(ticker, tick_increment):
+            # Answered from the bar files alone, so readers never wait on the DuckDB writer's file lock
+            covered = self.bar_store.get_covered_ranges(ticker, tick_increment)
+        else:
+            covered = self.db_client.get_covered_ranges(ticker, tick_increment)
+        return subtract_date_ranges(self._to_date(start_date), self._to_date(end_date), covered)
+
+    def _queried_start(self, gap_start: date, gap_end: date, tick_increment: str) -> date:
+        # The wrapped adapter may query less than the gap (e.g. Tiingo's intraday lookback); days before
+        # its query window were never downloaded and must not be recorded as covered
+        query_start, _ = self.adapter.get_query_window(
+            self._to_datetime(gap_start), self._to_datetime(gap_end, end_of_day=True), tick_increment
+        )
+        return max(gap_start, self._to_date(query_start))
+
+    def _store(self, ticker: str, tick_increment: str, gap_start: date, gap_end: date, data: Any):
+        self.db_client.upsert_bars(ticker, tick_increment, data)
+        # Bars for today (UTC) can still change, so leave today uncovered to be refreshed next time
+        settled_end = min(gap_end, datetime.now(timezone.utc).date() - timedelta(days=1))
+        self.db_client.add_covered_range(ticker, tick_increment, gap_start, settled_end)
+        if self.bar_store is not None:
+            if self.bar_store.has_bars(ticker, tick_increment):
+                self.bar_store.append_bars(ticker, tick_increment, data)
+                self.bar_store.set_covered_ranges(ticker, tick_increment, self.db_client.get_covered_ranges(ticker, tick_increment))
+            else:
+                self._export_to_bar_store(ticker, tick_increment)
+
+    def _export_to_bar_store(self, ticker: str, tick_increment: str):
+        self.bar_store.write_bars(ticker, tick_increment, self.db_client.get_bars(ticker, tick_increment))
+        self.bar_store.set_covered_ranges(ticker, tick_increment, self.db_client.get_covered_ranges(ticker, tick_increment))
+
+    def _load(
+        self,
+        ticker: str,
+        tick_increment: str,
+        start_date: datetime,
+        end_date: datetime,
+        output_format: str = output_records,
+    ) -> Any:
+        if output_format == output_arrays and self.bar_store is not None:
+            if not self.bar_store.has_bars(ticker, tick_increment):
+                self._export_to_bar_store(ticker, tick_increment)
+            return self.bar_store.open_bars(ticker, tick_increment, self._to_date(start_date), self._to_date(end_date))
+        frame = self.db_client.get_bars(ticker, tick_increment, self._to_date(start_date), self._to_date(end_date))
+        if frame.empty:
+            return empty_bars(output_format)
+        if output_format != output_records:
+            return format_bar_frame(standardize_bar_frame(frame), output_format)
+        return bar_frame_to_records(frame)
+
+    @staticmethod
+    def _to_date(value) -> date:
+        return value.date() if isinstance(value, datetime) else value
+
+    @staticmethod
+    def _to_datetime(value: date, end_of_day: bool = False) -> datetime:
+        # End the range on the last instant of the day so adapters with an exclusive end still include it
+        return datetime.combine(value, time.max if end_of_day else time.min)
@@ -1,8 +1,30 @@
+import contextvars
+import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+from adapters.historical_data_adapters.historical_data_formats import empty_bars
+from clients.metrics_client import instrument, kind_historical_data, metrics
+from registries.standards.adapter_standards import daily, output_records
+
+class HistoricalDataResult(NamedTuple):
+    """
+    Outcome of fetching historical data for one ticker within a batch.
+    error is None when the fetch succeeded; otherwise data is empty and error holds the exception.
+    """
+    ticker: str
+    data: Any
+    error: Optional[Exception] = None
 
 class HistoricalDataAdapter(ABC):
+    # Upper bound on concurrent requests made by get_historical_data_batch
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument(cls, kind_historical_data)
+
     @abstractmethod
     def get_historical_data(
         self,
@@ -10,6 +32,7 @@ class HistoricalDataAdapter(ABC):
         start_date: datetime,
         end_date: datetime,
         tick_increment: str = '1d',
+        output_format: str = output_records,
     ) -> Any:
         """
         Retrieve historical data for a given ticker and date range.
@@ -18,7 +41,89 @@ class HistoricalDataAdapter(ABC):
             start_date (datetime): The start of the historical period.
             end_date (datetime): The end of the historical period.
             tick_increment (str, optional): The granularity of the data (e.g., '1d', '1h'). Defaults to '1d'.
+            output_format (str, optional): 'records' (list of dicts), 'dataframe' or 'arrays' (dict of NumPy arrays).
+                Defaults to 'records'.
         Returns:
             Any: The historical data in a standardized format (to be defined by implementation).
         """
         pass
+
+    def get_query_window(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+    ) -> Tuple[datetime, datetime]:
+        """
+        The part of a requested range that a request for tick_increment actually asks the provider for.
+        Adapters whose provider limits how far back a timeframe goes narrow the window; callers that
+        record which days were fetched (like CachedHistoricalDataAdapter) only record this window.
+        Returns:
+            Tuple[datetime, datetime]: The queried (start_date, end_date). Defaults to the requested range.
+        """
+        return start_date, end_date
+
+    def get_historical_data_batch(
+        self,
+        tickers: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """
+        Retrieve historical data for many tickers concurrently.
+        Results are yielded as each ticker completes (not in input order). A failure for one ticker
+        is reported on its HistoricalDataResult and does not stop the rest of the batch.
+        The default implementation runs get_historical_data on a bounded thread pool; adapters
+        whose provider supports multi-ticker requests should override it.
+        Args:
+            tickers (Iterable[str]): The symbols to fetch. Duplicates are fetched once.
+            start_date (datetime): The start of the historical period.
+            end_date (datetime): The end of the historical period.
+            tick_increment (str, optional): The granularity of the data. Defaults to daily.
+            max_workers (int, optional): Maximum number of requests in flight at once.
+            output_format (str, optional): Output format of each result's data. Defaults to 'records'.
+        Returns:
+            Iterator[HistoricalDataResult]: One result per unique ticker.
+        """
+        return self._run_batch(
+            lambda ticker: self.get_historical_data(ticker, start_date, end_date, tick_increment, output_format=output_format),
+            tickers,
+            max_workers,
+            output_format,
+        )
+
+    def _run_batch(
+        self,
+        fetch,
+        tickers: Iterable[str],
+        max_workers: int,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """Run fetch(ticker) on a bounded thread pool and yield results as they complete."""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(tickers))),
+            thread_name_prefix=type(self).__name__,
+        )
+        try:
+            # Run each fetch in a copy of the caller's context so its request priority applies in the workers,
+            # measured per ticker like a get_historical_data call
+            futures = {
+                executor.submit(contextvars.copy_context().run, metrics.call, kind_historical_data, self, ticker, fetch, ticker): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    yield HistoricalDataResult(ticker, future.result())
+                except Exception as e:
+                    logging.error(f"{type(self).__name__} batch error for {ticker}: {e}")
+                    yield HistoricalDataResult(ticker, empty_bars(output_format), e)
+        finally:
+            # Abandon queued work if the caller stops consuming the results early
+            executor.shutdown(wait=True, cancel_futures=True)
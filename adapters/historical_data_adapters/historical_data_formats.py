@@ -0,0 +1,83 @@
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from registries.standards.adapter_standards import output_records, output_dataframe, output_arrays
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+OUTPUT_FORMATS = {output_records, output_dataframe, output_arrays}
+
+# Column order of the standard historical data records
+BAR_COLUMNS = [df_datetime, df_open, df_close, df_high, df_low, df_volume]
+PRICE_COLUMNS = [df_open, df_close, df_high, df_low]
+
+def validate_output_format(output_format: str):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output_format '{output_format}'. Must be one of {OUTPUT_FORMATS}.")
+
+def standardize_bar_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized equivalent of the adapters' per-row standardization for the columnar formats.
+    Prices are coerced to float64 and rounded to 2 decimal places, volume is rounded to int64 and
+    DateTime is parsed to a UTC timestamp. Rows with a missing or non-numeric value are dropped.
+    Args:
+        frame (pd.DataFrame): Raw bars with DateTime, open, high, low, close and volume columns.
+    Returns:
+        pd.DataFrame: Bars with a fresh RangeIndex and columns in BAR_COLUMNS order.
+    """
+    if frame.empty:
+        return empty_bar_frame()
+
+    prices = np.column_stack([pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=np.float64) for col in PRICE_COLUMNS])
+    volume = pd.to_numeric(frame[df_volume], errors='coerce').to_numpy(dtype=np.float64)
+    timestamps = pd.to_datetime(frame[df_datetime], utc=True, errors='coerce')
+
+    valid = ~(np.isnan(prices).any(axis=1) | np.isnan(volume) | timestamps.isna().to_numpy())
+    prices = np.round(prices[valid], 2)
+
+    standardized = pd.DataFrame({df_datetime: timestamps[valid].reset_index(drop=True).astype('datetime64[ns, UTC]')})
+    for i, col in enumerate(PRICE_COLUMNS):
+        standardized[col] = prices[:, i]
+    standardized[df_volume] = np.rint(volume[valid]).astype(np.int64)
+    return standardized[BAR_COLUMNS]
+
+def empty_bar_frame() -> pd.DataFrame:
+    frame = pd.DataFrame({col: np.array([], dtype=np.float64) for col in BAR_COLUMNS})
+    frame[df_datetime] = pd.Series([], dtype='datetime64[ns, UTC]')
+    frame[df_volume] = np.array([], dtype=np.int64)
+    return frame[BAR_COLUMNS]
+
+def format_bar_frame(frame: pd.DataFrame, output_format: str) -> Any:
+    """
+    Convert a standardized bar frame into the requested columnar output format.
+    output_dataframe returns the frame itself. output_arrays returns a dict of contiguous arrays:
+    float64 prices, int64 volume and datetime64[ns] DateTime (UTC).
+    """
+    if output_format == output_dataframe:
+        return frame
+    if output_format == output_arrays:
+        return bar_frame_to_arrays(frame)
+    raise ValueError(f"Output format '{output_format}' is not a columnar format.")
+
+def bar_frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a bar frame into the standard list of dicts, with ISO 8601 UTC DateTime strings."""
+    frame = frame[BAR_COLUMNS].copy()
+    frame[df_datetime] = pd.to_datetime(frame[df_datetime], utc=True).dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    records = frame.to_dict("records")
+    for record in records:
+        record[df_volume] = None if pd.isna(record[df_volume]) else int(record[df_volume])
+    return records
+
+def bar_frame_to_arrays(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    arrays = {
+        df_datetime: np.ascontiguousarray(frame[df_datetime].dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(dtype='datetime64[ns]'))
+    }
+    for col in PRICE_COLUMNS:
+        arrays[col] = np.ascontiguousarray(frame[col].to_numpy(dtype=np.float64))
+    arrays[df_volume] = np.ascontiguousarray(frame[df_volume].to_numpy(dtype=np.int64))
+    return arrays
+
+def empty_bars(output_format: str) -> Any:
+    """Return an empty result in the requested output format."""
+    if output_format == output_records:
+        return []
+    return format_bar_frame(empty_bar_frame(), output_format)
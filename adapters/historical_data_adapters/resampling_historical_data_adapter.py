@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Tuple
+import pandas as pd
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter, HistoricalDataResult
+from adapters.historical_data_adapters.historical_data_formats import validate_output_format, standardize_bar_frame, format_bar_frame, bar_frame_to_records, empty_bars
+from adapters.historical_data_adapters.bar_resampler import RESAMPLE_SOURCES, INTRADAY_MINUTES, resample_bars, resample_start
+from clients.metrics_client import kind_historical_data, metrics
+from registries.standards.adapter_standards import daily, df_datetime, output_records, output_dataframe
+
+class ResamplingHistoricalDataAdapter(HistoricalDataAdapter):
+    """
+    Historical data adapter that derives every timeframe from one base series per ticker.
+
+    5min/10min/30min/1hour bars are aggregated from the wrapped adapter's 1min bars and
+    weekly/monthly/annual bars from its daily bars (see bar_resampler.resample_bars), so only the
+    base increments are ever requested. Wrapping a CachedHistoricalDataAdapter means the base series
+    is downloaded once and every derived timeframe is built locally.
+    """
+
+    def __init__(self, adapter: HistoricalDataAdapter):
+        self.adapter = adapter
+
+    def get_historical_data(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        output_format: str = output_records,
+    ) -> Any:
+        """
+        Return bars for the ticker and date range, resampled locally from the base increment when
+        tick_increment is derived. Same formats as the wrapped adapter.
+        """
+        validate_output_format(output_format)
+        if tick_increment not in RESAMPLE_SOURCES:
+            return self.adapter.get_historical_data(ticker, start_date, end_date, tick_increment, output_format=output_format)
+        data = self.adapter.get_historical_data(
+            ticker,
+            resample_start(start_date, tick_increment),
+            end_date,
+            RESAMPLE_SOURCES[tick_increment],
+            output_format=output_dataframe,
+        )
+        return self._resample(data, start_date, tick_increment, output_format)
+
+    def get_query_window(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+    ) -> Tuple[datetime, datetime]:
+        """The window the wrapped adapter queries for the base bars of tick_increment."""
+        if tick_increment not in RESAMPLE_SOURCES:
+            return self.adapter.get_query_window(start_date, end_date, tick_increment)
+        return self.adapter.get_query_window(resample_start(start_date, tick_increment), end_date, RESAMPLE_SOURCES[tick_increment])
+
+    def get_historical_data_batch(
+        self,
+        tickers: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        max_workers: int = HistoricalDataAdapter.DEFAULT_MAX_WORKERS,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """
+        Return bars for many tickers through the wrapped adapter's batch of base bars, resampling
+        each ticker as its base bars arrive.
+        """
+        validate_output_format(output_format)
+        if tick_increment not in RESAMPLE_SOURCES:
+            yield from self.adapter.get_historical_data_batch(
+                tickers, start_date, end_date, tick_increment, max_workers, output_format=output_format
+            )
+            return
+
+        results = self.adapter.get_historical_data_batch(
+            tickers,
+            resample_start(start_date, tick_increment),
+            end_date,
+            RESAMPLE_SOURCES[tick_increment],
+            max_workers,
+            output_format=output_dataframe,
+        )
+        for ticker, data, error in results:
+            if error is not None:
+                yield HistoricalDataResult(ticker, empty_bars(output_format), error)
+                continue
+            try:
+                resampled = metrics.call(kind_historical_data, self, ticker, self._resample, data, start_date, tick_increment, output_format)
+                yield HistoricalDataResult(ticker, resampled)
+            except Exception as e:
+                yield HistoricalDataResult(ticker, empty_bars(output_format), e)
+
+    def _resample(self, data: Any, start_date: datetime, tick_increment: str, output_format: str) -> Any:
+        frame = resample_bars(standardize_bar_frame(pd.DataFrame(data)), tick_increment)
+        if tick_increment not in INTRADAY_MINUTES:
+            # The base request was widened to the start of the first period; drop periods ending before start_date
+            start = pd.Timestamp(start_date.date() if isinstance(start_date, datetime) else start_date, tz="UTC")
+            frame = frame[frame[df_datetime] >= start].reset_index(drop=True)
+        if output_format == output_records:
+            return bar_frame_to_records(frame)
+        return format_bar_frame(frame, output_format)
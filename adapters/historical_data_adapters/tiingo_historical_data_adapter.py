@@ -1,11 +1,15 @@
 import logging
+import threading
 from config import Tiingo_API_KEY
-from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter, HistoricalDataResult
 from datetime import datetime, timedelta
 import requests
-from typing import Any, List, Dict
+import pandas as pd
+from typing import Any, Iterable, Iterator, List, Dict
+from adapters.historical_data_adapters.historical_data_formats import validate_output_format, standardize_bar_frame, format_bar_frame, empty_bars
+from adapters.request_scheduler import request_scheduler
 from registries.standards.adapter_standards import daily, weekly, monthly, annually, intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
-from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime, output_records, provider_tiingo
 
 class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
     DAILY_URL = "https://api.tiingo.com/tiingo/daily/{ticker}/prices"
@@ -14,6 +18,11 @@ class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
     # Valid frequencies for each endpoint
     DAILY_FREQS = {daily, weekly, monthly, annually}
     INTRADAY_FREQS = {intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour}
+    INTRADAY_LOOKBACK = timedelta(days=5)
+
+    def __init__(self):
+        # One keep-alive session per thread so batch workers reuse their connections
+        self._local = threading.local()
 
     def get_historical_data(
         self,
@@ -21,10 +30,13 @@ class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
         start_date: datetime,
         end_date: datetime,
         tick_increment: str = daily,
-    ) -> List[Dict[str, Any]]:
+        output_format: str = output_records,
+    ) -> Any:
         """
         Fetch historical price data from Tiingo for a given ticker and date range.
         Returns a list of dicts with columns: DateTime, open, close, high, low (all floats rounded to 2 decimal places), volume (int).
+        Pass output_format='dataframe' or 'arrays' for the same data as a DataFrame or a dict of NumPy arrays,
+        built without per-row Python work (see historical_data_formats).
         
         Supported tick_increments:
         - Daily data: 'daily', 'weekly', 'monthly', 'annually'
@@ -33,25 +45,74 @@ class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
         Note: Intraday data is only available during market hours and for a limited time range.
         For intraday data, the date range should typically be within the last 5 trading days.
         """
+        validate_output_format(output_format)
+        url, params = self._build_request(ticker, start_date, end_date, tick_increment)
+        return self._make_request(url, params, output_format)
+
+    def get_historical_data_batch(
+        self,
+        tickers: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        max_workers: int = HistoricalDataAdapter.DEFAULT_MAX_WORKERS,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """
+        Fetch historical price data from Tiingo for many tickers concurrently.
+        Tiingo has no multi-ticker price endpoint, so each ticker is its own request; requests run on a
+        bounded thread pool over per-thread keep-alive sessions and are yielded as they complete.
+        An invalid tick_increment raises ValueError up front; request and parsing failures are reported
+        per ticker on the HistoricalDataResult instead of being logged and swallowed.
+        """
+        # Validate once for the whole batch rather than once per ticker
+        validate_output_format(output_format)
+        self._build_request("", start_date, end_date, tick_increment)
+
+        def fetch(ticker: str) -> Any:
+            url, params = self._build_request(ticker, start_date, end_date, tick_increment)
+            return self._fetch(url, params, output_format)
+
+        return self._run_batch(fetch, tickers, max_workers, output_format)
+
+    def get_query_window(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+    ):
+        """Intraday requests only reach back INTRADAY_LOOKBACK from end_date; daily ones span the whole range."""
+        if tick_increment in self.INTRADAY_FREQS:
+            # For intraday data, limit the date range to the last few days to ensure data availability
+            return max(start_date, end_date - self.INTRADAY_LOOKBACK), end_date
+        return start_date, end_date
+
+    def _build_request(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str
+    ):
+        """Return the (url, params) pair for a ticker, validating tick_increment."""
         # Determine which endpoint to use based on tick_increment
         if tick_increment in self.DAILY_FREQS:
-            return self._get_daily_data(ticker, start_date, end_date, tick_increment)
+            return self._get_daily_request(ticker, start_date, end_date, tick_increment)
         elif tick_increment in self.INTRADAY_FREQS:
-            # For intraday data, limit the date range to last 5 days to ensure data availability
-            adjusted_start = max(start_date, end_date - timedelta(days=5))
-            return self._get_intraday_data(ticker, adjusted_start, end_date, tick_increment)
+            adjusted_start, end_date = self.get_query_window(start_date, end_date, tick_increment)
+            return self._get_intraday_request(ticker, adjusted_start, end_date, tick_increment)
         else:
             valid_freqs = self.DAILY_FREQS.union(self.INTRADAY_FREQS)
             raise ValueError(f"Invalid tick_increment '{tick_increment}'. Must be one of {valid_freqs}.")
 
-    def _get_daily_data(
+    def _get_daily_request(
         self,
         ticker: str,
         start_date: datetime,
         end_date: datetime,
         tick_increment: str
-    ) -> List[Dict[str, Any]]:
-        """Fetch daily, weekly, monthly, or annual data."""
+    ):
+        """Build the request for daily, weekly, monthly, or annual data."""
         url = self.DAILY_URL.format(ticker=ticker)
         params = {
             "startDate": start_date.strftime("%Y-%m-%d"),
@@ -59,16 +120,16 @@ class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
             "resampleFreq": tick_increment,
             "token": Tiingo_API_KEY,
         }
-        return self._make_request(url, params)
+        return url, params
 
-    def _get_intraday_data(
+    def _get_intraday_request(
         self,
         ticker: str,
         start_date: datetime,
         end_date: datetime,
         tick_increment: str
-    ) -> List[Dict[str, Any]]:
-        """Fetch intraday data with specified frequency."""
+    ):
+        """Build the request for intraday data with specified frequency."""
         url = self.INTRADAY_URL.format(ticker=ticker)
         params = {
             "startDate": start_date.strftime("%Y-%m-%d"),
@@ -78,47 +139,70 @@ class TiingoHistoricalDataAdapter(HistoricalDataAdapter):
             "token": Tiingo_API_KEY,
             "forceFill": "true"  # Fill missing data points
         }
-        return self._make_request(url, params)
+        return url, params
 
-    def _make_request(self, url: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
-        """Make request to Tiingo API and standardize response."""
-        headers = {
-            'Content-Type': 'application/json'
-        }
+    def _make_request(self, url: str, params: Dict[str, str], output_format: str = output_records) -> Any:
+        """Make request to Tiingo API and standardize response, logging failures."""
         try:
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Handle empty response
-            if not data:
-                logging.warning(f"No data returned from Tiingo API for URL: {url} with params: {params}")
-                return []
-            
-            # Standardize and round data
-            standardized = []
-            for row in data:
-                # Skip rows with missing required data
-                if not all(key in row for key in ['date', 'open', 'close', 'high', 'low', 'volume']):
-                    continue
-                    
-                try:
-                    standardized.append({
-                        df_datetime: row['date'],
-                        df_open: round(float(row['open']), 2),
-                        df_close: round(float(row['close']), 2),
-                        df_high: round(float(row['high']), 2),
-                        df_low: round(float(row['low']), 2),
-                        df_volume: int(round(float(row['volume'])))
-                    })
-                except (ValueError, TypeError) as e:
-                    logging.warning(f"Error processing row {row}: {e}")
-                    continue
-                    
-            return standardized
+            return self._fetch(url, params, output_format)
         except requests.RequestException as e:
             self.handle_error(e, getattr(e, 'response', None))
-            return []
+            return empty_bars(output_format)
+
+    def _fetch(self, url: str, params: Dict[str, str], output_format: str = output_records) -> Any:
+        """Request data from Tiingo API and standardize response. Raises requests.RequestException on failure."""
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        response = request_scheduler.get(
+            provider_tiingo, url, key=Tiingo_API_KEY, session=self._get_session(), params=params, headers=headers
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Handle empty response
+        if not data:
+            logging.warning(f"No data returned from Tiingo API for URL: {url}")
+            return empty_bars(output_format)
+
+        if output_format != output_records:
+            return self._standardize_columnar(data, output_format)
+
+        # Standardize and round data
+        standardized = []
+        for row in data:
+            # Skip rows with missing required data
+            if not all(key in row for key in ['date', 'open', 'close', 'high', 'low', 'volume']):
+                continue
+
+            try:
+                standardized.append({
+                    df_datetime: row['date'],
+                    df_open: round(float(row['open']), 2),
+                    df_close: round(float(row['close']), 2),
+                    df_high: round(float(row['high']), 2),
+                    df_low: round(float(row['low']), 2),
+                    df_volume: int(round(float(row['volume'])))
+                })
+            except (ValueError, TypeError) as e:
+                logging.warning(f"Error processing row {row}: {e}")
+                continue
+
+        return standardized
+
+    def _standardize_columnar(self, data: List[Dict[str, Any]], output_format: str) -> Any:
+        """Standardize a Tiingo response into a DataFrame or dict of arrays with vectorized rounding."""
+        frame = pd.DataFrame(data, columns=['date', df_open, df_high, df_low, df_close, df_volume])
+        frame = frame.rename(columns={'date': df_datetime})
+        return format_bar_frame(standardize_bar_frame(frame), output_format)
+
+    def _get_session(self) -> requests.Session:
+        """Return this thread's keep-alive session, creating it on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
 
     def handle_error(self, error: Exception, response=None):
         logging.error(f"TiingoHistoricalDataAdapter error: {error}")
@@ -1,11 +1,14 @@
 import logging
-from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter, HistoricalDataResult
 from datetime import datetime
-from typing import Any, List, Dict
+from typing import Any, Iterable, Iterator, List, Dict
 import yfinance as yf
 import pandas as pd
+from adapters.historical_data_adapters.historical_data_formats import validate_output_format, standardize_bar_frame, format_bar_frame, empty_bars
+from adapters.request_scheduler import request_scheduler
+from clients.metrics_client import kind_historical_data, metrics
 from registries.standards.adapter_standards import daily, weekly, monthly, annually
-from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime, output_records, provider_yfinance
 
 class YFinanceHistoricalDataAdapter(HistoricalDataAdapter):
     TICKER_FREQ_MAP = {
@@ -14,65 +17,147 @@ class YFinanceHistoricalDataAdapter(HistoricalDataAdapter):
         monthly: '1mo',
     }
 
+    # Number of tickers requested per yf.download call in get_historical_data_batch
+    BATCH_CHUNK_SIZE = 100
+
     def get_historical_data(
         self,
         ticker: str,
         start_date: datetime,
         end_date: datetime,
         tick_increment: str = daily,
-    ) -> List[Dict[str, Any]]:
+        output_format: str = output_records,
+    ) -> Any:
         """
         Fetch historical price data from yfinance for a given ticker and date range.
         Returns a list of dicts with columns: DateTime, open, close, high, low (all floats rounded to 2 decimal places), volume (int).
+        Pass output_format='dataframe' or 'arrays' for a DataFrame or dict of NumPy arrays instead; the columnar
+        formats drop rows with missing values rather than returning None fields.
         Only supports tick_increment: 'daily', 'weekly', 'monthly'.
         """
-        if tick_increment == annually:
-            raise ValueError(f"yfinance does not support '{annually}' tick_increment. Use '{daily}', '{weekly}', or '{monthly}'.")
-        
-        yf_freq = self.TICKER_FREQ_MAP.get(tick_increment)
-        if yf_freq is None:
-            raise ValueError(f"Invalid tick_increment '{tick_increment}'. Must be one of {list(self.TICKER_FREQ_MAP.keys())}.")
-        
+        validate_output_format(output_format)
+        yf_freq = self._get_yf_freq(tick_increment)
+
         try:
+            request_scheduler.acquire(provider_yfinance)
             data = yf.Ticker(ticker)
             hist = data.history(start=start_date, end=end_date, interval=yf_freq)
             
             if hist.empty:
                 logging.info(f"No historical data returned for {ticker} with increment {tick_increment}")
-                return []
-            
-            # Debug info
-            logging.info(f"Retrieved data for {ticker}:")
-            logging.info(f"Shape: {hist.shape}")
-            logging.info(f"Columns: {hist.columns.tolist()}")
-            logging.info(f"First row:\n{hist.iloc[0]}")
-            
-            # Reset index to get Date as a column and standardize column names
-            hist = hist.reset_index()
-            hist.columns = hist.columns.str.lower()
-            
-            standardized = []
-            for _, row in hist.iterrows():
-                try:
-                    # Convert timestamp to string in ISO format
-                    date_str = row['date'].isoformat() if isinstance(row['date'], pd.Timestamp) else str(row['date'])
-                    
-                    record = {
-                        df_datetime: date_str,
-                        df_open: round(float(row['open']), 2) if not pd.isna(row['open']) else None,
-                        df_close: round(float(row['close']), 2) if not pd.isna(row['close']) else None,
-                        df_high: round(float(row['high']), 2) if not pd.isna(row['high']) else None,
-                        df_low: round(float(row['low']), 2) if not pd.isna(row['low']) else None,
-                        df_volume: int(round(float(row['volume']))) if not pd.isna(row['volume']) else None,
-                    }
-                    standardized.append(record)
-                except Exception as row_error:
-                    logging.error(f"Error processing row {row.to_dict()}: {row_error}")
-                    continue
-                    
-            return standardized
+                return empty_bars(output_format)
+
+            # Lazy %-formatting: nothing is built unless debug logging is on
+            logging.debug("Retrieved %d rows for %s", len(hist), ticker)
+
+            return self._standardize(hist, output_format)
             
         except Exception as e:
             logging.error(f"YFinanceHistoricalDataAdapter error for {ticker}: {str(e)}")
             logging.error(f"Full traceback:", exc_info=True)
-            return []
+            metrics.record_error()
+            return empty_bars(output_format)
+
+    def get_historical_data_batch(
+        self,
+        tickers: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        tick_increment: str = daily,
+        max_workers: int = HistoricalDataAdapter.DEFAULT_MAX_WORKERS,
+        output_format: str = output_records,
+    ) -> Iterator[HistoricalDataResult]:
+        """
+        Fetch historical price data from yfinance for many tickers using multi-ticker downloads.
+        Tickers are downloaded BATCH_CHUNK_SIZE at a time with yf.download (which threads internally,
+        up to max_workers), and each chunk's results are yielded as soon as that chunk completes.
+        A failed download is reported on every ticker of its chunk; the remaining chunks still run.
+        """
+        validate_output_format(output_format)
+        yf_freq = self._get_yf_freq(tick_increment)
+        tickers = list(dict.fromkeys(tickers))
+
+        for i in range(0, len(tickers), self.BATCH_CHUNK_SIZE):
+            chunk = tickers[i:i + self.BATCH_CHUNK_SIZE]
+            try:
+                # In the metrics each ticker is charged an equal share of the download plus its own parsing
+                with metrics.batch(kind_historical_data, self, chunk) as batch:
+                    # yf.download requests each ticker separately
+                    request_scheduler.acquire(provider_yfinance, tokens=len(chunk))
+                    hist = yf.download(
+                        chunk,
+                        start=start_date,
+                        end=end_date,
+                        interval=yf_freq,
+                        group_by='ticker',
+                        auto_adjust=True,
+                        actions=False,
+                        threads=max(1, min(max_workers, len(chunk))),
+                        progress=False,
+                    )
+            except Exception as e:
+                logging.error(f"YFinanceHistoricalDataAdapter batch error for {chunk}: {str(e)}")
+                for ticker in chunk:
+                    yield HistoricalDataResult(ticker, empty_bars(output_format), e)
+                continue
+
+            for ticker in chunk:
+                try:
+                    data, error = batch.call(ticker, self._ticker_bars, hist, ticker, tick_increment, output_format), None
+                except Exception as e:
+                    logging.error(f"YFinanceHistoricalDataAdapter error for {ticker}: {str(e)}")
+                    data, error = empty_bars(output_format), e
+                yield HistoricalDataResult(ticker, data, error)
+
+    def _ticker_bars(self, hist: pd.DataFrame, ticker: str, tick_increment: str, output_format: str) -> Any:
+        """One ticker's bars out of a multi-ticker yf.download frame."""
+        if hist is None or hist.empty or ticker not in hist.columns.get_level_values(0):
+            ticker_hist = pd.DataFrame()
+        else:
+            # Rows are the union of all tickers' dates, so drop dates this ticker has no bar for
+            ticker_hist = hist[ticker].dropna(how='all')
+        if ticker_hist.empty:
+            logging.info(f"No historical data returned for {ticker} with increment {tick_increment}")
+            return empty_bars(output_format)
+        return self._standardize(ticker_hist, output_format)
+
+    def _get_yf_freq(self, tick_increment: str) -> str:
+        """Map a standard tick_increment onto the yfinance interval, raising ValueError if unsupported."""
+        if tick_increment == annually:
+            raise ValueError(f"yfinance does not support '{annually}' tick_increment. Use '{daily}', '{weekly}', or '{monthly}'.")
+        
+        yf_freq = self.TICKER_FREQ_MAP.get(tick_increment)
+        if yf_freq is None:
+            raise ValueError(f"Invalid tick_increment '{tick_increment}'. Must be one of {list(self.TICKER_FREQ_MAP.keys())}.")
+        return yf_freq
+
+    def _standardize(self, hist: pd.DataFrame, output_format: str = output_records) -> Any:
+        """Convert a yfinance history frame (indexed by date) into the requested output format."""
+        # Reset index to get Date as a column and standardize column names
+        hist = hist.reset_index()
+        hist.columns = hist.columns.str.lower()
+
+        if output_format != output_records:
+            frame = hist.rename(columns={'date': df_datetime})
+            return format_bar_frame(standardize_bar_frame(frame), output_format)
+        
+        standardized = []
+        for _, row in hist.iterrows():
+            try:
+                # Convert timestamp to string in ISO format
+                date_str = row['date'].isoformat() if isinstance(row['date'], pd.Timestamp) else str(row['date'])
+                
+                record = {
+                    df_datetime: date_str,
+                    df_open: round(float(row['open']), 2) if not pd.isna(row['open']) else None,
+                    df_close: round(float(row['close']), 2) if not pd.isna(row['close']) else None,
+                    df_high: round(float(row['high']), 2) if not pd.isna(row['high']) else None,
+                    df_low: round(float(row['low']), 2) if not pd.isna(row['low']) else None,
+                    df_volume: int(round(float(row['volume']))) if not pd.isna(row['volume']) else None,
+                }
+                standardized.append(record)
+            except Exception as row_error:
+                logging.error(f"Error processing row {row.to_dict()}: {row_error}")
+                continue
+                
+        return standardized
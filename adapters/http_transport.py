@@ -0,0 +1,257 @@
+import base64
+import gzip
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from registries.standards.adapter_standards import df_datetime
+
+# Default location of recorded cassettes (kept out of version control with the rest of data/)
+DEFAULT_CASSETTE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cassettes")
+CASSETTE_SUFFIX = ".jsonl.gz"
+
+# Query parameters holding API keys: never written to a cassette and never part of the match key
+SECRET_PARAMS = frozenset({"token", "apikey", "api_key"})
+# Request date ranges move with the clock; ignore them to replay a capture on any day
+DATE_PARAMS = ("startDate", "endDate", "from", "to")
+
+TIINGO_LOG_PATTERN = re.compile(r"tiingo_intraday_(?P<freq>\w+?)_\d{8}_\d{6}\.json$")
+
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+def cassette_path(name: str, root: str = DEFAULT_CASSETTE_PATH) -> str:
+    """File of a named cassette, e.g. cassette_path("tiingo_daily")."""
+    return os.path.join(root, f"{name}{CASSETTE_SUFFIX}")
+
+class CassetteMiss(requests.ConnectionError):
+    """No recorded response matches the request. Adapters handle it like any failed request."""
+
+class Interaction(NamedTuple):
+    method: str
+    url: str              # with secret query parameters removed
+    status: int
+    content_type: str
+    body: bytes
+    elapsed: float        # seconds the live request took
+
+def request_key(method: str, url: str, ignore_params: Iterable[str] = ()) -> RequestKey:
+    """
+    The match key of a request: method, URL without its query, and the sorted query parameters
+    except secrets and ignore_params (compared case-insensitively).
+    """
+    split = urlsplit(url)
+    skipped = SECRET_PARAMS | {param.lower() for param in ignore_params}
+    params = tuple(sorted((name, value) for name, value in parse_qsl(split.query, keep_blank_values=True) if name.lower() not in skipped))
+    return method.upper(), urlunsplit((split.scheme, split.netloc, split.path, "", "")), params
+
+def redact_url(url: str) -> str:
+    """The URL without its secret query parameters."""
+    split = urlsplit(url)
+    params = [(name, value) for name, value in parse_qsl(split.query, keep_blank_values=True) if name.lower() not in SECRET_PARAMS]
+    return urlunsplit((split.scheme, split.netloc, split.path, urlencode(params), ""))
+
+class Cassette:
+    """
+    Raw HTTP responses recorded from the APIs, replayed by ReplayTransport.
+
+    On disk a cassette is gzip-compressed JSON lines, one interaction per line, with the body kept
+    verbatim as text (or base64 for binary bodies). API keys are stripped from the recorded URLs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str): Cassette file; loaded when it exists and the default target of save()
+        """
+        self.path = path
+        self.interactions: List[Interaction] = []
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.interactions = self._read(path)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def add(self, method: str, url: str, status: int, content_type: str, body: bytes, elapsed: float = 0.0):
+        with self._lock:
+            self.interactions.append(Interaction(method.upper(), redact_url(url), status, content_type, body, elapsed))
+
+    def index(self, ignore_params: Iterable[str] = ()) -> Dict[RequestKey, List[Interaction]]:
+        """Interactions grouped by request_key, in recording order."""
+        ignore_params = tuple(ignore_params)
+        index: Dict[RequestKey, List[Interaction]] = {}
+        with self._lock:
+            for interaction in self.interactions:
+                index.setdefault(request_key(interaction.method, interaction.url, ignore_params), []).append(interaction)
+        return index
+
+    def save(self, path: Optional[str] = None):
+        """Write the cassette, atomically replacing the file."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("Cassette has no path to save to")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            lines = [json.dumps(self._encode(interaction), separators=(",", ":")) for interaction in self.interactions]
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _encode(interaction: Interaction) -> Dict[str, object]:
+        entry = interaction._asdict()
+        try:
+            entry["body"] = interaction.body.decode("utf-8")
+        except UnicodeDecodeError:
+            del entry["body"]
+            entry["body_b64"] = base64.b64encode(interaction.body).decode("ascii")
+        return entry
+
+    @staticmethod
+    def _read(path: str) -> List[Interaction]:
+        interactions = []
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "body_b64" in entry:
+                    body = base64.b64decode(entry.pop("body_b64"))
+                else:
+                    body = entry.pop("body").encode("utf-8")
+                interactions.append(Interaction(body=body, **entry))
+        return interactions
+
+class RecordingTransport(HTTPAdapter):
+    """Sends requests over the network as usual and records every raw response into a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        self.cassette.add(
+            request.method, request.url, response.status_code,
+            response.headers.get("Content-Type", ""), response.content, time.perf_counter() - start,
+        )
+        return response
+
+class ReplayTransport(BaseAdapter):
+    """
+    Local stand-in for the APIs: answers requests from a cassette without touching the network.
+
+    Requests are matched on request_key. When a request was recorded several times the recordings
+    are served in turn, wrapping around. Each response is delayed by latency plus a seeded uniform
+    jitter, so fetch concurrency can be benchmarked against realistic round trips deterministically.
+    A request with no recording raises CassetteMiss.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        ignore_params: Iterable[str] = (),
+        seed: Optional[int] = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            cassette (Cassette): Recorded responses
+            latency (float): Seconds added to every response
+            jitter (float): Up to this many extra seconds per response, drawn uniformly
+            ignore_params: Query parameters left out of matching (e.g. DATE_PARAMS)
+            seed (int): Seed of the jitter
+            sleep (callable): Used to wait out the latency; replace to simulate time
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.ignore_params = tuple(ignore_params)
+        self.sleep = sleep
+        self.requests = 0
+        self.misses = 0
+        self._index = cassette.index(self.ignore_params)
+        self._cursors: Dict[RequestKey, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reload(self):
+        """Pick up interactions added to the cassette since this transport was created."""
+        with self._lock:
+            self._index = self.cassette.index(self.ignore_params)
+            self._cursors.clear()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request.method, request.url, self.ignore_params)
+        with self._lock:
+            self.requests += 1
+            recordings = self._index.get(key)
+            if not recordings:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response for {request.method} {redact_url(request.url)}", request=request)
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            delay = self.latency + (self.jitter * self._random.random() if self.jitter else 0.0)
+        if delay > 0:
+            self.sleep(delay)
+        return self._build_response(request, recordings[cursor % len(recordings)], delay)
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _build_response(request, interaction: Interaction, delay: float) -> requests.Response:
+        response = requests.Response()
+        response.status_code = interaction.status
+        response._content = interaction.body
+        response.headers = CaseInsensitiveDict({"Content-Type": interaction.content_type} if interaction.content_type else {})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.reason = requests.status_codes._codes.get(interaction.status, ("",))[0].upper().replace("_", " ")
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=delay)
+        return response
+
+def seed_from_tiingo_logs(cassette: Cassette, paths: Iterable[str], ticker: str = "AAPL") -> int:
+    """
+    Add the intraday captures written by the Tiingo e2e tests (logs/tiingo_intraday_<freq>_<time>.json)
+    to a cassette as Tiingo IEX responses for the ticker.
+
+    The captures hold standardized records and not the request, so the date range is unknown: replay
+    them with ignore_params=DATE_PARAMS. Captures of the same frequency are served in turn.
+    Returns:
+        int: Number of interactions added.
+    """
+    from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
+    from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume
+
+    added = 0
+    for path in sorted(paths):
+        match = TIINGO_LOG_PATTERN.search(os.path.basename(path))
+        if match is None:
+            continue
+        with open(path) as file:
+            records = json.load(file)
+        rows = [{"date": record[df_datetime], **{field: record[field] for field in (df_open, df_high, df_low, df_close, df_volume)}} for record in records]
+        params = {
+            "resampleFreq": match.group("freq"),
+            "columns": f"{df_open},{df_high},{df_low},{df_close},{df_volume}",
+            "forceFill": "true",
+        }
+        url = f"{TiingoHistoricalDataAdapter.INTRADAY_URL.format(ticker=ticker)}?{urlencode(params)}"
+        cassette.add("GET", url, 200, "application/json", json.dumps(rows).encode("utf-8"))
+        added += 1
+    return added
@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, time as clock_time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+from adapters.market_status_adapters.market_status_adapter import MarketStatusAdapter
+from registries.standards.adapter_standards import market_open, market_closed, market_pre_market
+
+EXCHANGE_TZ = ZoneInfo("America/New_York")
+PRE_MARKET_OPEN = clock_time(4, 0)
+REGULAR_OPEN = clock_time(9, 30)
+REGULAR_CLOSE = clock_time(16, 0)
+EARLY_CLOSE = clock_time(13, 0)
+
+# Unscheduled full-day closures (national days of mourning, ...)
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29): "Hurricane Sandy",
+    date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+DEFAULT_RECONCILE_INTERVAL_SECONDS = 15 * 60
+# Disagreements this close to a scheduled open or close are taken as the live source lagging the edge
+DEFAULT_EDGE_GRACE_SECONDS = 5 * 60
+# Years of sessions precomputed on each side of the current year
+CALENDAR_PADDING_YEARS = 1
+
+def _easter(year: int) -> date:
+    """Western Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday (Mon=0) of the month; n=-1 is the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(day: date) -> date:
+    """NYSE observance: Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+def nyse_holidays(year: int) -> Dict[date, str]:
+    """Full-day NYSE closures in a year, including special closures."""
+    holidays = {}
+    new_year = date(year, 1, 1)
+    # A Saturday New Year's Day is not made up on the preceding Friday (it would fall in the old year)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        holidays[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    holidays[_observed(date(year, 12, 25))] = "Christmas Day"
+    for day, name in SPECIAL_CLOSURES.items():
+        if day.year == year:
+            holidays[day] = name
+    return holidays
+
+def nyse_early_closes(year: int) -> Set[date]:
+    """Days the regular session ends at 1:00 pm ET."""
+    early = set()
+    # July 3rd when it is Monday-Thursday (a Friday July 3rd is the observed Independence Day)
+    july_3 = date(year, 7, 3)
+    if july_3.weekday() < 4:
+        early.add(july_3)
+    early.add(_nth_weekday(year, 11, 3, 4) + timedelta(days=1))
+    # Christmas Eve when it is Monday-Thursday (a Friday Christmas Eve is the observed Christmas)
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < 4:
+        early.add(christmas_eve)
+    return early - set(nyse_holidays(year))
+
+class CalendarMarketStatusAdapter(MarketStatusAdapter):
+    """
+    Market status from a precomputed NYSE session calendar, without network calls.
+
+    Every session's pre-market open, regular open and close are precomputed as UTC timestamps
+    (holidays skipped, half days closing at 1:00 pm ET), so a lookup is one binary search. Like
+    FinnhubMarketStatusAdapter, pre-market (4:00 to 9:30 ET) is reported as pre-market, the regular
+    session as open and everything else, post-market included, as closed.
+
+    With a reconcile_adapter (e.g. FinnhubMarketStatusAdapter), a background thread compares the
+    calendar with that adapter every reconcile_interval seconds. A disagreement, such as an
+    unscheduled closure, is logged and the reconciled status is served until the next check.
+    Disagreements within edge_grace seconds of a scheduled pre-market open, open or close are
+    ignored: there the live source is usually just late to flip, and the calendar is right.
+    """
+
+    def __init__(
+        self,
+        reconcile_adapter: Optional[MarketStatusAdapter] = None,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL_SECONDS,
+        edge_grace: float = DEFAULT_EDGE_GRACE_SECONDS,
+        extra_closures: Iterable[date] = (),
+        clock: Callable[[], float] = time.time,
+        start_background: bool = True,
+    ):
+        """
+        Args:
+            reconcile_adapter (MarketStatusAdapter): Live status source to reconcile against; None disables it
+            reconcile_interval (float): Seconds between reconciliations
+            edge_grace (float): Seconds around each scheduled edge in which disagreements are ignored
+            extra_closures (iterable of date): Additional full-day closures
+            clock (callable): Current time as a UNIX timestamp
+            start_background (bool): Start the reconciliation thread on first use (otherwise call reconcile())
+        """
+        self.reconcile_adapter = reconcile_adapter
+        self.reconcile_interval = reconcile_interval
+        self.edge_grace = edge_grace
+        self.extra_closures = set(extra_closures)
+        self.clock = clock
+        self.start_background = start_background
+        self._override: Optional[Tuple[str, float]] = None  # (status, valid until)
+        self._edges: List[float] = []
+        self._first_year = self._last_year = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        year = datetime.fromtimestamp(clock(), EXCHANGE_TZ).year
+        self._build(year - CALENDAR_PADDING_YEARS, year + CALENDAR_PADDING_YEARS)
+
+    def get_market_status(self) -> str:
+        if self.reconcile_adapter is not None and self.start_background and self._thread is None:
+            self._start_reconciler()
+        now = self.clock()
+        override = self._override
+        if override is not None and now < override[1]:
+            return override[0]
+        return self.status_at(now)
+
+    def status_at(self, timestamp: float) -> str:
+        """Calendar status at a UNIX timestamp."""
+        if not self._edges or timestamp < self._edges[0] or timestamp >= self._edges[-1]:
+            self._extend_to(timestamp)
+        index = bisect_right(self._edges, timestamp) - 1
+        if index < 0:
+            return market_closed
+        # Edges cycle through pre-market open, regular open, regular close
+        return (market_pre_market, market_open, market_closed)[index % 3]
+
+    def get_session(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """Regular session (open, close) in exchange time for a day, or None when the exchange is closed."""
+        if day.weekday() >= 5 or day in self.extra_closures or day in nyse_holidays(day.year):
+            return None
+        close = EARLY_CLOSE if day in nyse_early_closes(day.year) else REGULAR_CLOSE
+        return (datetime.combine(day, REGULAR_OPEN, EXCHANGE_TZ), datetime.combine(day, close, EXCHANGE_TZ))
+
+    def is_trading_day(self, day: date) -> bool:
+        return self.get_session(day) is not None
+
+    def reconcile(self) -> Optional[str]:
+        """
+        Compares the calendar with the reconcile adapter once.
+        Returns the reconciled status (the calendar's when a disagreement falls within the edge grace
+        period), or None when the adapter failed.
+        """
+        try:
+            live = self.reconcile_adapter.get_market_status()
+        except Exception as e:
+            logging.error(f"CalendarMarketStatusAdapter reconcile error: {e}")
+            return None
+        now = self.clock()
+        expected = self.status_at(now)
+        if live != expected and self.seconds_from_edge(now) <= self.edge_grace:
+            logging.info(f"CalendarMarketStatusAdapter: live status {live} lags the scheduled {expected}; keeping the calendar")
+            self._override = None
+            return expected
+        if live != expected:
+            logging.warning(f"CalendarMarketStatusAdapter: calendar says {expected}, live status is {live}; using {live}")
+            self._override = (live, now + self.reconcile_interval)
+        else:
+            self._override = None
+        return live
+
+    def seconds_from_edge(self, timestamp: float) -> float:
+        """Seconds between a UNIX timestamp and the nearest scheduled pre-market open, open or close."""
+        self.status_at(timestamp)  # extends the calendar when needed
+        index = bisect_right(self._edges, timestamp)
+        nearby = self._edges[max(index - 1, 0):index + 1]
+        return min(abs(timestamp - edge) for edge in nearby) if nearby else float("inf")
+
+    def stop(self):
+        """Stops the background reconciliation thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _start_reconciler(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._reconcile_loop, name="market-status-reconciler", daemon=True)
+            self._thread.start()
+
+    def _reconcile_loop(self):
+        while not self._stop.is_set():
+            self.reconcile()
+            self._stop.wait(self.reconcile_interval)
+
+    def _extend_to(self, timestamp: float):
+        year = datetime.fromtimestamp(timestamp, EXCHANGE_TZ).year
+        with self._lock:
+            self._build(min(self._first_year, year - 1), max(self._last_year, year + 1))
+
+    def _build(self, first_year: int, last_year: int):
+        edges = []
+        day = date(first_year, 1, 1)
+        while day.year <= last_year:
+            session = self.get_session(day)
+            if session is not None:
+                pre_open = datetime.combine(day, PRE_MARKET_OPEN, EXCHANGE_TZ)
+                edges.extend((pre_open.timestamp(), session[0].timestamp(), session[1].timestamp()))
+            day += timedelta(days=1)
+        self._edges = edges
+        self._first_year, self._last_year = first_year, last_year
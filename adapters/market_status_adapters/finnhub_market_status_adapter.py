@@ -1,12 +1,23 @@
 from registries.standards.adapter_standards import market_open, market_closed, market_pre_market
 from adapters.market_status_adapters.market_status_adapter import MarketStatusAdapter
+from adapters.request_scheduler import request_scheduler
+from registries.standards.adapter_standards import provider_finnhub
 from config import FINNHUB_API_KEY
 import finnhub
 
 class FinnhubMarketStatusAdapter(MarketStatusAdapter):
+    def __init__(self):
+        # One client (and its HTTP session) for every call
+        self.finnhub_client = finnhub.Client(api_key=FINNHUB_API_KEY)
+        # finnhub.Client makes its own calls; mount its session so a recording/replay transport sees them too.
+        # The client exposes no public session, so skip mounting if a finnhub release renames the attribute.
+        session = getattr(self.finnhub_client, "_session", None)
+        if session is not None:
+            request_scheduler.mount(session)
+
     def get_market_status(self) -> str:
-        finnhub_client = finnhub.Client(api_key=FINNHUB_API_KEY)
-        market_status =finnhub_client.market_status(exchange='US')
+        request_scheduler.acquire(provider_finnhub, FINNHUB_API_KEY)
+        market_status = self.finnhub_client.market_status(exchange='US')
 
         if market_status['session'] == 'regular':
             return market_open
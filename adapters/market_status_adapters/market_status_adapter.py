@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
+from clients.metrics_client import instrument, kind_market_status
 
 class MarketStatusAdapter(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument(cls, kind_market_status)
+
     @abstractmethod
     def get_market_status(
     ) -> str:
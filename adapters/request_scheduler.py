@@ -0,0 +1,272 @@
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from clients.metrics_client import metrics
+from registries.standards.adapter_standards import provider_tiingo, provider_fmp, provider_finnhub, provider_yfinance, provider_arkfunds
+from registries.standards.adapter_standards import priority_trading, priority_ranking, priority_backfill
+
+class RateLimit(NamedTuple):
+    """Sustained requests per second and the burst a bucket can save up."""
+    rate: float
+    burst: float
+
+# Tuned to the plans in use; pass limits to RequestScheduler to override
+DEFAULT_RATE_LIMITS = {
+    provider_tiingo: RateLimit(rate=10000 / 3600, burst=20),
+    provider_fmp: RateLimit(rate=300 / 60, burst=10),
+    provider_finnhub: RateLimit(rate=60 / 60, burst=30),
+    provider_yfinance: RateLimit(rate=20, burst=100),
+    provider_arkfunds: RateLimit(rate=1, burst=5),
+}
+
+# Lower runs first
+PRIORITY_ORDER = {priority_trading: 0, priority_ranking: 1, priority_backfill: 2}
+DEFAULT_PRIORITY = priority_ranking
+
+_current_priority: ContextVar[str] = ContextVar("request_priority", default=DEFAULT_PRIORITY)
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run the block's scheduled requests at the given priority class (trading, ranking or backfill).
+    The priority is a context variable, so it follows the code into batch worker threads.
+    """
+    if priority not in PRIORITY_ORDER:
+        raise ValueError(f"Invalid priority '{priority}'. Must be one of {set(PRIORITY_ORDER)}.")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class _Bucket:
+    def __init__(self, limit: RateLimit, now: float):
+        self.rate = limit.rate
+        self.capacity = limit.burst
+        self.tokens = float(limit.burst)
+        self.updated = now
+        self.waiters: List[Tuple[int, int]] = []  # heap of (priority rank, arrival)
+        self.requests = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_by_priority: Dict[str, List[float]] = {}  # priority -> [requests, total wait]
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class RequestScheduler:
+    """
+    Rate limits API requests with one token bucket per provider and API key.
+
+    A request takes one token (or more for calls that fan out, like a multi-ticker yf.download);
+    a bucket refills at the provider's rate up to its burst. When no token is free the request
+    waits in the bucket's queue instead of failing. The queue is ordered by priority class, trading
+    before ranking before backfill, and by arrival within a class, so a trading request only ever
+    waits behind other trading requests and the next token. A request needing more tokens than the
+    burst runs once the bucket is full and leaves it in debt.
+
+    Providers without a configured limit are not throttled but are still counted in the metrics.
+
+    Every session the scheduler sends through is mounted with a dispatching transport, so setting
+    transport (e.g. a RecordingTransport or ReplayTransport from adapters.http_transport) redirects
+    all the adapters' HTTP traffic at once; with no transport requests go to the network as usual.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        transport: Optional[BaseAdapter] = None,
+    ):
+        """
+        Args:
+            limits (dict): provider -> RateLimit; defaults to DEFAULT_RATE_LIMITS
+            clock (callable): Monotonic time source, in seconds
+            transport (BaseAdapter): requests transport adapter every request is sent through instead of the network
+        """
+        self.limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self.clock = clock
+        self.transport = transport
+        self._buckets: Dict[Tuple[str, Optional[str]], _Bucket] = {}
+        self._condition = threading.Condition()
+        self._arrivals = itertools.count()
+        self._dispatch = _TransportDispatch(self)
+        self._local = threading.local()
+
+    def acquire(self, provider: str, key: Optional[str] = None, tokens: float = 1, priority: Optional[str] = None) -> float:
+        """
+        Block until the provider's bucket for the API key grants the tokens.
+        Args:
+            provider (str): Provider name (see adapter_standards)
+            key (str): API key the quota belongs to; None for keyless providers
+            tokens (float): Tokens the request costs
+            priority (str): Priority class; defaults to the current request_priority
+        Returns:
+            float: Seconds spent waiting
+        """
+        priority = priority or _current_priority.get()
+        rank = PRIORITY_ORDER[priority]
+        limit = self.limits.get(provider)
+        with self._condition:
+            start = self.clock()
+            bucket = self._get_bucket(provider, key, start)
+            entry = (rank, next(self._arrivals))
+            heapq.heappush(bucket.waiters, entry)
+            bucket.max_queue_depth = max(bucket.max_queue_depth, len(bucket.waiters))
+            while True:
+                now = self.clock()
+                if limit is None:
+                    break
+                bucket.refill(now)
+                needed = min(tokens, bucket.capacity)
+                if bucket.waiters[0] == entry:
+                    if bucket.tokens >= needed:
+                        bucket.tokens -= tokens
+                        break
+                    self._condition.wait((needed - bucket.tokens) / bucket.rate)
+                else:
+                    self._condition.wait()
+            heapq.heappop(bucket.waiters)
+            waited = now - start
+            bucket.requests += 1
+            bucket.total_wait += waited
+            bucket.max_wait = max(bucket.max_wait, waited)
+            by_priority = bucket.wait_by_priority.setdefault(priority, [0, 0.0])
+            by_priority[0] += 1
+            by_priority[1] += waited
+            # Wake the next request in line
+            self._condition.notify_all()
+        return waited
+
+    def get(
+        self,
+        provider: str,
+        url: str,
+        key: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Wait for a token, then GET the url through the session (or this thread's scheduler session)."""
+        self.acquire(provider, key)
+        if session is None:
+            session = self._get_session()
+        elif isinstance(session, requests.Session):
+            self.mount(session)
+        return session.get(url, **kwargs)
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route a session's requests through the scheduler's transport, for clients that make their own calls."""
+        if session.get_adapter("https://") is not self._dispatch:
+            session.mount("https://", self._dispatch)
+            session.mount("http://", self._dispatch)
+        return session
+
+    @contextmanager
+    def use_transport(self, transport: Optional[BaseAdapter]) -> Iterator[BaseAdapter]:
+        """Send every request through the transport for the duration of the block."""
+        previous = self.transport
+        self.transport = transport
+        try:
+            yield transport
+        finally:
+            self.transport = previous
+
+    @contextmanager
+    def use_limits(self, limits: Dict[str, RateLimit]) -> Iterator[Dict[str, RateLimit]]:
+        """
+        Rate limit with these limits (e.g. {} for none) for the duration of the block. The block gets
+        fresh buckets, so the ones in use before it are restored untouched.
+        """
+        with self._condition:
+            previous = self.limits, self._buckets
+            self.limits, self._buckets = dict(limits), {}
+        try:
+            yield self.limits
+        finally:
+            with self._condition:
+                self.limits, self._buckets = previous
+                self._condition.notify_all()
+
+    def queue_depth(self, provider: str, key: Optional[str] = None) -> int:
+        """Number of requests currently waiting for the provider's bucket."""
+        with self._condition:
+            bucket = self._buckets.get((provider, key))
+            return len(bucket.waiters) if bucket is not None else 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Metrics per bucket, keyed by provider (with a short hash of the API key when there is one):
+        requests, queue_depth, max_queue_depth, tokens, total/mean/max wait in seconds, and
+        mean_wait_<priority> for every priority class seen.
+        """
+        with self._condition:
+            stats = {}
+            for (provider, key), bucket in self._buckets.items():
+                name = provider if key is None else f"{provider}:{hashlib.sha1(key.encode()).hexdigest()[:8]}"
+                entry = {
+                    "requests": bucket.requests,
+                    "queue_depth": len(bucket.waiters),
+                    "max_queue_depth": bucket.max_queue_depth,
+                    "tokens": bucket.tokens,
+                    "total_wait": bucket.total_wait,
+                    "mean_wait": bucket.total_wait / bucket.requests if bucket.requests else 0.0,
+                    "max_wait": bucket.max_wait,
+                }
+                for priority, (count, total) in bucket.wait_by_priority.items():
+                    entry[f"mean_wait_{priority}"] = total / count
+                stats[name] = entry
+            return stats
+
+    def _get_bucket(self, provider: str, key: Optional[str], now: float) -> _Bucket:
+        bucket = self._buckets.get((provider, key))
+        if bucket is None:
+            limit = self.limits.get(provider, RateLimit(rate=float("inf"), burst=float("inf")))
+            bucket = _Bucket(limit, now)
+            self._buckets[(provider, key)] = bucket
+        return bucket
+
+    def _get_session(self) -> requests.Session:
+        """Return this thread's keep-alive session for callers that bring none, creating it on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.mount(requests.Session())
+            self._local.session = session
+        return session
+
+class _TransportDispatch(HTTPAdapter):
+    """Mounted on every scheduled session: sends through the scheduler's transport when one is set."""
+
+    def __init__(self, scheduler: RequestScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def send(self, request, **kwargs):
+        transport = self.scheduler.transport
+        if not metrics.enabled:
+            return transport.send(request, **kwargs) if transport is not None else super().send(request, **kwargs)
+        try:
+            response = transport.send(request, **kwargs) if transport is not None else super().send(request, **kwargs)
+        except Exception:
+            metrics.record_error()
+            raise
+        # Attribute the body to the adapter call being measured
+        metrics.add_bytes(len(response.content))
+        if response.status_code >= 400:
+            metrics.record_error()
+        return response
+
+    def close(self):
+        # Shared by every mounted session, so one session closing must not drop the others' connections
+        pass
+
+# Shared by every API-backed adapter so quotas are enforced process-wide
+request_scheduler = RequestScheduler()
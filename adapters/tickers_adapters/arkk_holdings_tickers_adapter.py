@@ -1,6 +1,8 @@
 import requests
 from typing import List
 from .ticker_adapter import TickerAdapter
+from adapters.request_scheduler import request_scheduler
+from registries.standards.adapter_standards import provider_arkfunds
 
 class ARKKHoldingsTickersAdapter(TickerAdapter):
     """
@@ -21,7 +23,7 @@ class ARKKHoldingsTickersAdapter(TickerAdapter):
                 "symbol": "ARKK",
                 "limit": 1000  # Get maximum available holdings
             }
-            response = requests.get(self.api_url, params=params)
+            response = request_scheduler.get(provider_arkfunds, self.api_url, params=params)
             response.raise_for_status()  # Raise exception for bad status codes
             
             # Parse response JSON
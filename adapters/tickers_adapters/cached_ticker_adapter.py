@@ -0,0 +1,113 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from dbs.duck_db_client import DuckDBClient
+from .ticker_adapter import TickerAdapter
+
+DEFAULT_REFRESH_INTERVAL = timedelta(days=1)
+
+class TickerDiff(NamedTuple):
+    """Constituent changes between two snapshots of a universe."""
+    added: List[str]
+    removed: List[str]
+    previous_at: Optional[datetime]
+    current_at: Optional[datetime]
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class CachedTickerAdapter(TickerAdapter):
+    """
+    Ticker adapter that keeps dated snapshots of the wrapped adapter's universe in DuckDB.
+
+    fetch_tickers serves the latest snapshot and only calls the wrapped adapter once the snapshot is
+    older than refresh_interval. If that refresh fails, the stale snapshot is served and the error is
+    logged. Every refresh is stored as a new snapshot, so added/removed constituents can be read back
+    with diff() and backfills can process just those tickers instead of the whole index.
+    """
+
+    def __init__(
+        self,
+        adapter: TickerAdapter,
+        universe: Optional[str] = None,
+        refresh_interval: timedelta = DEFAULT_REFRESH_INTERVAL,
+        db_client: Optional[DuckDBClient] = None,
+        clock: Callable[[], datetime] = _utc_now,
+    ):
+        """
+        Args:
+            adapter (TickerAdapter): Adapter that fetches the universe
+            universe (str): Name the snapshots are stored under; defaults to the adapter's class name
+            refresh_interval (timedelta): Age after which the snapshot is refreshed
+            db_client (DuckDBClient): Snapshot store; defaults to the local database
+            clock (callable): Current time as a naive UTC datetime
+        """
+        self.adapter = adapter
+        self.universe = universe or type(adapter).__name__
+        self.refresh_interval = refresh_interval
+        self.db_client = db_client if db_client is not None else DuckDBClient()
+        self.clock = clock
+        self._latest: Optional[Tuple[datetime, List[str]]] = None
+        self._lock = threading.Lock()
+
+    def fetch_tickers(self) -> List[str]:
+        """
+        Retrieve the universe from the latest snapshot, refreshing it when it is due.
+        """
+        with self._lock:
+            latest = self._get_latest()
+            if latest is None or self.clock() - latest[0] >= self.refresh_interval:
+                try:
+                    self._refresh()
+                except Exception as e:
+                    if latest is None:
+                        raise
+                    logging.error(f"CachedTickerAdapter: refresh of {self.universe} failed, serving snapshot from {latest[0]}: {e}")
+            return list(self._latest[1])
+
+    def refresh(self) -> TickerDiff:
+        """Fetches the universe now, stores it as a snapshot and returns the changes since the previous one."""
+        with self._lock:
+            previous = self._get_latest()
+            self._refresh()
+            return self._diff(previous, self._latest)
+
+    def diff(self, since: Optional[datetime] = None) -> TickerDiff:
+        """
+        Constituent changes from the snapshot in effect at since (naive UTC) to the latest snapshot.
+        When since is None, the changes of the latest refresh. Without an earlier snapshot every
+        current ticker counts as added.
+        """
+        current = self.db_client.get_ticker_snapshot(self.universe)
+        if current is None:
+            return TickerDiff([], [], None, None)
+        if since is None:
+            times = self.db_client.get_ticker_snapshot_times(self.universe)
+            previous = self.db_client.get_ticker_snapshot(self.universe, times[-2]) if len(times) > 1 else None
+        else:
+            previous = self.db_client.get_ticker_snapshot(self.universe, since)
+        return self._diff(previous, current)
+
+    def _refresh(self):
+        tickers = list(dict.fromkeys(self.adapter.fetch_tickers()))
+        snapshot_at = self.clock()
+        self.db_client.save_ticker_snapshot(self.universe, snapshot_at, tickers)
+        self._latest = (snapshot_at, tickers)
+
+    def _get_latest(self) -> Optional[Tuple[datetime, List[str]]]:
+        if self._latest is None:
+            self._latest = self.db_client.get_ticker_snapshot(self.universe)
+        return self._latest
+
+    @staticmethod
+    def _diff(previous: Optional[Tuple[datetime, List[str]]], current: Tuple[datetime, List[str]]) -> TickerDiff:
+        previous_at, previous_tickers = previous if previous is not None else (None, [])
+        current_at, current_tickers = current
+        previous_set, current_set = set(previous_tickers), set(current_tickers)
+        return TickerDiff(
+            added=[ticker for ticker in current_tickers if ticker not in previous_set],
+            removed=[ticker for ticker in previous_tickers if ticker not in current_set],
+            previous_at=previous_at,
+            current_at=current_at,
+        )
@@ -1,6 +1,8 @@
 import requests
 from typing import List
 from .ticker_adapter import TickerAdapter
+from adapters.request_scheduler import request_scheduler
+from registries.standards.adapter_standards import provider_fmp
 from config import FMP_API_KEY
 
 class FMPNDAQ100TickerAdapter(TickerAdapter):
@@ -23,7 +25,7 @@ class FMPNDAQ100TickerAdapter(TickerAdapter):
                 "apikey": self.api_key
             }
             
-            response = requests.get(self.api_url, params=params)
+            response = request_scheduler.get(provider_fmp, self.api_url, key=self.api_key, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
 from typing import List
+from clients.metrics_client import instrument, kind_tickers
 
 class TickerAdapter(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument(cls, kind_tickers)
+
     @abstractmethod
     def fetch_tickers(self) -> List[str]:
         """
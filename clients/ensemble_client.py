@@ -0,0 +1,266 @@
+import logging
+import math
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+import numpy as np
+import pandas as pd
+from clients.metrics_client import metrics
+from strategies.strategy import Strategy
+from strategies.strategy_cache import StrategyResultCache
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+PRICE_FIELDS = [df_open, df_high, df_low, df_close, df_volume]
+# Tasks per worker when no chunk size is given: enough chunks to balance uneven tickers
+CHUNKS_PER_WORKER = 4
+
+class EnsembleResult(NamedTuple):
+    """Sentiment of one strategy for one ticker. error is set (and score is None) when the strategy failed."""
+    ticker: str
+    strategy: str
+    score: Optional[float]
+    error: Optional[Exception] = None
+
+class SharedBarsSpec(NamedTuple):
+    """Everything a worker needs to attach to SharedBars: a few names and integers, cheap to pickle."""
+    name: str
+    tickers: Tuple[str, ...]
+    offsets: Tuple[int, ...]
+
+class SharedBars:
+    """
+    The bars of a whole universe in one shared memory segment.
+
+    Every ticker's bars are concatenated along one timeline; offsets[i]:offsets[i + 1] is ticker i.
+    The segment holds a (len(PRICE_FIELDS) + 1, total bars) block: float64 rows for the OHLCV fields
+    followed by the DateTime row as int64 nanoseconds (UTC). Workers attach by name and hand strategies
+    zero-copy NumPy views, so no DataFrame is ever pickled to a worker.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, spec: SharedBarsSpec, owner: bool):
+        self.memory = memory
+        self.spec = spec
+        self.owner = owner
+        total = spec.offsets[-1]
+        self._prices = np.ndarray((len(PRICE_FIELDS), total), dtype=np.float64, buffer=memory.buf)
+        self._datetimes = np.ndarray((total,), dtype=np.int64, buffer=memory.buf, offset=len(PRICE_FIELDS) * total * 8)
+
+    @classmethod
+    def create(cls, historical_data: Dict[str, Any]) -> "SharedBars":
+        """
+        Copies per-ticker historical data (any historical data output format) into a new segment.
+        """
+        tickers, frames, lengths = [], [], []
+        for ticker, data in historical_data.items():
+            frame = pd.DataFrame(data) if isinstance(data, list) else data
+            length = len(frame[df_close]) if len(frame) else 0
+            tickers.append(ticker)
+            frames.append(frame)
+            lengths.append(length)
+        offsets = tuple(int(x) for x in np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]))
+        total = offsets[-1]
+
+        # SharedMemory refuses size 0; keep one spare slot
+        memory = shared_memory.SharedMemory(create=True, size=max((len(PRICE_FIELDS) + 1) * total * 8, 8))
+        bars = cls(memory, SharedBarsSpec(memory.name, tuple(tickers), offsets), owner=True)
+        try:
+            for i, frame in enumerate(frames):
+                start, end = offsets[i], offsets[i + 1]
+                if start == end:
+                    continue
+                for row, field in enumerate(PRICE_FIELDS):
+                    bars._prices[row, start:end] = np.asarray(frame[field], dtype=np.float64)
+                datetimes = pd.to_datetime(pd.Series(np.asarray(frame[df_datetime])), utc=True)
+                bars._datetimes[start:end] = datetimes.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        except Exception:
+            bars.close()
+            raise
+        return bars
+
+    @classmethod
+    def attach(cls, spec: SharedBarsSpec) -> "SharedBars":
+        return cls(shared_memory.SharedMemory(name=spec.name), spec, owner=False)
+
+    def arrays(self, index: int) -> Dict[str, np.ndarray]:
+        """Read-only arrays-format views of ticker `index` (no copy)."""
+        start, end = self.spec.offsets[index], self.spec.offsets[index + 1]
+        arrays = {df_datetime: self._datetimes[start:end].view("datetime64[ns]")}
+        for row, field in enumerate(PRICE_FIELDS):
+            arrays[field] = self._prices[row, start:end]
+        for values in arrays.values():
+            values.flags.writeable = False
+        return arrays
+
+    def last_close(self, index: int) -> float:
+        start, end = self.spec.offsets[index], self.spec.offsets[index + 1]
+        return float(self._prices[PRICE_FIELDS.index(df_close), end - 1]) if end > start else math.nan
+
+    def close(self):
+        """
+        Releases this process's mapping; the owner also frees the segment.
+        Views returned by arrays() must not outlive this call.
+        """
+        # Views must be dropped before the buffer can be released
+        self._prices = self._datetimes = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ---- Worker process state ----
+# Set once per worker by _init_worker so tasks only carry indices.
+_worker_bars: Optional[SharedBars] = None
+_worker_strategies: List[Strategy] = []
+
+def _init_worker(spec: SharedBarsSpec, strategy_classes: Sequence[Type[Strategy]], sample_rate: float = 0.0):
+    global _worker_bars, _worker_strategies
+    _worker_bars = SharedBars.attach(spec)
+    _worker_strategies = [strategy_class() for strategy_class in strategy_classes]
+    # A forked worker inherits the parent's series; start empty so only this worker's calls are sent back
+    metrics.reset()
+    metrics.configure(sample_rate)
+
+def _run_chunk(tasks: List[Tuple[int, int, float]]) -> Tuple[List[Tuple[Optional[float], Optional[Exception]]], Optional[Dict[str, Any]]]:
+    """Runs a chunk in a worker; returns its outputs and the metrics measured for them, if enabled."""
+    outputs = _run_tasks(_worker_bars, _worker_strategies, tasks)
+    return outputs, metrics.snapshot(reset=True) if metrics.enabled else None
+
+def _run_tasks(bars: SharedBars, strategies: List[Strategy], tasks) -> List[Tuple[Optional[float], Optional[Exception]]]:
+    results = []
+    arrays, arrays_index = None, None
+    for ticker_index, strategy_index, current_price in tasks:
+        # Tasks are ticker-major, so consecutive tasks reuse the same views
+        if ticker_index != arrays_index:
+            arrays, arrays_index = bars.arrays(ticker_index), ticker_index
+        try:
+            if metrics.enabled:
+                # run_strategy takes no ticker; tag its metrics with the ticker's bucket
+                with metrics.ticker_scope(bars.spec.tickers[ticker_index]):
+                    results.append((strategies[strategy_index].run_strategy(arrays, current_price), None))
+            else:
+                results.append((strategies[strategy_index].run_strategy(arrays, current_price), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+class EnsembleClient:
+    """
+    Runs every strategy agent on every ticker across a process pool.
+
+    The universe's bars are placed once in shared memory; the work is split into ticker-major chunks
+    of (ticker, strategy) tasks so each worker reuses a ticker's views for all of its strategies.
+    Results always come back in (ticker, strategy) input order, whatever the worker count.
+
+    With a StrategyResultCache, tasks whose inputs have not changed since an earlier run are answered
+    from the cache before the work is sharded, so only the misses reach the workers.
+    """
+
+    def __init__(
+        self,
+        strategy_classes: Sequence[Type[Strategy]],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        start_method: Optional[str] = None,
+        cache: Optional[StrategyResultCache] = None,
+        tick_increment: Optional[str] = None,
+    ):
+        """
+        Args:
+            strategy_classes: Strategy classes to run; every worker instantiates each once
+            max_workers (int): Worker processes; defaults to the CPU count. 1 runs in this process
+            chunk_size (int): (ticker, strategy) tasks per chunk; defaults to an even split into
+                CHUNKS_PER_WORKER chunks per worker
+            start_method (str): multiprocessing start method ('fork', 'spawn', ...); defaults to the platform's
+            cache (StrategyResultCache): Reuses scores across runs; None runs every task
+            tick_increment (str): Increment of the bars passed to run, for the cache keys; defaults to
+                each strategy's ideal period
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.strategy_classes = list(strategy_classes)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self.cache = cache
+        self.tick_increment = tick_increment
+
+    def run(self, historical_data: Dict[str, Any], current_prices: Optional[Dict[str, float]] = None) -> List[EnsembleResult]:
+        """
+        Args:
+            historical_data: ticker -> bars in any historical data output format
+            current_prices: ticker -> latest price; tickers without one use their last close
+        Returns:
+            List[EnsembleResult]: One result per (ticker, strategy), ticker-major in input order.
+        """
+        current_prices = current_prices or {}
+        if not historical_data or not self.strategy_classes:
+            return []
+
+        with SharedBars.create(historical_data) as bars:
+            tasks = []
+            for ticker_index, ticker in enumerate(bars.spec.tickers):
+                price = current_prices.get(ticker, bars.last_close(ticker_index))
+                tasks.extend((ticker_index, strategy_index, price) for strategy_index in range(len(self.strategy_classes)))
+
+            strategies = [strategy_class() for strategy_class in self.strategy_classes]
+            outputs = self._execute_cached(bars, strategies, tasks) if self.cache is not None else self._execute(bars, tasks)
+
+            names = [strategy.get_strategy_name() for strategy in strategies]
+            results = []
+            for (ticker_index, strategy_index, _), (score, error) in zip(tasks, outputs):
+                if error is not None:
+                    logging.error(f"EnsembleClient: {names[strategy_index]} failed for {bars.spec.tickers[ticker_index]}: {error}")
+                results.append(EnsembleResult(bars.spec.tickers[ticker_index], names[strategy_index], score, error))
+            return results
+
+    def _execute_cached(self, bars: SharedBars, strategies: List[Strategy], tasks: List[Tuple[int, int, float]]) -> List[Tuple[Optional[float], Optional[Exception]]]:
+        outputs: List[Optional[Tuple[Optional[float], Optional[Exception]]]] = [None] * len(tasks)
+        misses, keys = [], []
+        arrays, arrays_index = None, None
+        for position, (ticker_index, strategy_index, price) in enumerate(tasks):
+            if ticker_index != arrays_index:
+                arrays, arrays_index = bars.arrays(ticker_index), ticker_index
+            key = self.cache.make_key(strategies[strategy_index], bars.spec.tickers[ticker_index], arrays, price, self.tick_increment)
+            hit, score = self.cache.lookup(key)
+            if hit:
+                outputs[position] = (score, None)
+            else:
+                misses.append(position)
+                keys.append(key)
+
+        for position, key, output in zip(misses, keys, self._execute(bars, [tasks[position] for position in misses])):
+            outputs[position] = output
+            if output[1] is None:
+                self.cache.store(key, output[0])
+        return outputs
+
+    def _execute(self, bars: SharedBars, tasks: List[Tuple[int, int, float]]) -> List[Tuple[Optional[float], Optional[Exception]]]:
+        workers = min(self.max_workers, len(tasks))
+        if workers <= 1:
+            return _run_tasks(bars, [strategy_class() for strategy_class in self.strategy_classes], tasks)
+
+        chunk_size = self.chunk_size or max(1, math.ceil(len(tasks) / (workers * CHUNKS_PER_WORKER)))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        context = multiprocessing.get_context(self.start_method)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(bars.spec, self.strategy_classes, metrics.sample_rate),
+        ) as executor:
+            # map yields chunk results in submission order, which keeps the output deterministic
+            outputs = []
+            for chunk_outputs, chunk_metrics in executor.map(_run_chunk, chunks):
+                outputs.extend(chunk_outputs)
+                if chunk_metrics is not None:
+                    metrics.merge(chunk_metrics)
+            return outputs
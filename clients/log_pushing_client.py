@@ -0,0 +1,236 @@
+import copy
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from dbs.duck_db_client import DuckDBClient
+
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+# Above this fraction of the queue, records below keep_level are sampled
+DEFAULT_OVERLOAD_THRESHOLD = 0.8
+DEFAULT_OVERLOAD_SAMPLE_RATE = 0.1
+DEFAULT_KEEP_LEVEL = logging.WARNING
+
+class LogPushingClient:
+    """
+    Ships log records to the DB client in batches from a background writer thread.
+
+    Pushing a record merges its message with its args (and formats a traceback once) and appends the
+    snapshot to a bounded in-memory queue: no I/O or lock waits happen on the caller's thread, so
+    logging never adds latency to a trading cycle. The writer wakes when a batch's worth of records
+    is queued or flush_interval has passed and writes them with one DuckDBClient.insert_logs call
+    per batch.
+
+    Under overload the queue sheds load instead of growing or blocking: once it is overload_threshold
+    full, records below keep_level are sampled at overload_sample_rate, and once it is full every new
+    record is dropped. Both are counted in stats(). A failed batch write is counted and dropped, as is
+    a record that cannot be formatted.
+    """
+
+    def __init__(
+        self,
+        db_client: Optional[DuckDBClient] = None,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        overload_threshold: float = DEFAULT_OVERLOAD_THRESHOLD,
+        overload_sample_rate: float = DEFAULT_OVERLOAD_SAMPLE_RATE,
+        keep_level: int = DEFAULT_KEEP_LEVEL,
+    ):
+        """
+        Args:
+            db_client (DuckDBClient): Where batches are written; defaults to the local DuckDB store
+            max_queue (int): Records held in memory at most
+            batch_size (int): Records per write; reaching it wakes the writer early
+            flush_interval (float): Longest a record waits in the queue, in seconds
+            overload_threshold (float): Fraction of max_queue above which low-level records are sampled
+            overload_sample_rate (float): Fraction of low-level records kept while overloaded
+            keep_level (int): Records at or above this level are never sampled (only dropped when full)
+        """
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+        if not 0.0 < overload_sample_rate <= 1.0:
+            raise ValueError("overload_sample_rate must be in (0, 1]")
+        self.db_client = db_client or DuckDBClient()
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.keep_level = keep_level
+        self._high_watermark = max(1, int(max_queue * overload_threshold))
+        self._keep_every = max(1, round(1 / overload_sample_rate))
+        self._queue: deque = deque()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: List[Tuple[logging.Logger, logging.Handler]] = []
+        self._formatter = logging.Formatter()
+        # Counters are bumped without a lock from many threads; they are metrics, not accounting
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.batches = 0
+        self.failures = 0
+        self.malformed = 0
+        self._overloaded_seen = 0
+
+    def push(self, record: logging.LogRecord) -> bool:
+        """
+        Queue a record for shipping without blocking.
+        Returns:
+            bool: False when the record was sampled out or dropped.
+        """
+        depth = len(self._queue)
+        if depth >= self._high_watermark:
+            if depth >= self.max_queue:
+                self.dropped += 1
+                return False
+            if record.levelno < self.keep_level:
+                self._overloaded_seen += 1
+                if self._overloaded_seen % self._keep_every:
+                    self.sampled_out += 1
+                    return False
+        try:
+            record = self._prepare(record)
+        except Exception:
+            # e.g. a call whose arguments do not match its format string
+            self.malformed += 1
+            return False
+        self._queue.append(record)
+        self.enqueued += 1
+        if depth + 1 >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Snapshot of the record for the queue, as logging.handlers.QueueHandler.prepare makes: the message
+        is merged with its args now, before the caller can change them, and the traceback is formatted
+        once, so the queue holds no references to the args or to the exception's frames.
+        """
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        record = copy.copy(record)
+        record.msg = record.message = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def start(self) -> "LogPushingClient":
+        """Start the background writer (once)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="LogPushingClient", daemon=True)
+            self._thread.start()
+        return self
+
+    def install(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> logging.Handler:
+        """Attach a handler that pushes the logger's records (the root logger by default) and start the writer."""
+        logger = logger or logging.getLogger()
+        handler = LogPushingHandler(self, level)
+        logger.addHandler(handler)
+        self._handlers.append((logger, handler))
+        self.start()
+        return handler
+
+    def flush(self) -> int:
+        """Write every queued record now, on the calling thread. Returns the number written."""
+        return self._drain()
+
+    def close(self, timeout: Optional[float] = None):
+        """Detach the handlers, stop the writer and write what is left in the queue."""
+        for logger, handler in self._handlers:
+            logger.removeHandler(handler)
+        self._handlers.clear()
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._drain()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "batches": self.batches,
+            "failures": self.failures,
+            "malformed": self.malformed,
+        }
+
+    def is_writer_thread(self) -> bool:
+        thread = self._thread
+        return thread is not None and threading.get_ident() == thread.ident
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception as e:
+                # Keep the writer alive: a dead writer would leave the queue to fill up and drop everything
+                self.failures += 1
+                logging.getLogger(__name__).error(f"LogPushingClient writer error: {e}")
+
+    def _drain(self) -> int:
+        written = 0
+        with self._drain_lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                rows = []
+                for record in batch:
+                    try:
+                        rows.append(self._to_row(record))
+                    except Exception:
+                        # e.g. a call whose arguments do not match its format string
+                        self.malformed += 1
+                if not rows:
+                    continue
+                try:
+                    self.db_client.insert_logs(rows)
+                except Exception as e:
+                    self.failures += 1
+                    self.dropped += len(rows)
+                    # Not shipped: LogPushingHandler ignores records from the writer thread
+                    logging.getLogger(__name__).error(f"LogPushingClient failed to write {len(rows)} log records: {e}")
+                    continue
+                self.batches += 1
+                self.written += len(rows)
+                written += len(rows)
+        return written
+
+    def _to_row(self, record: logging.LogRecord) -> Tuple:
+        message = record.getMessage()
+        logged_at = datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None)
+        return (logged_at, record.levelname, record.levelno, record.name, message, record.module, record.lineno)
+
+class LogPushingHandler(logging.Handler):
+    """logging handler that hands records to a LogPushingClient; it never locks or blocks."""
+
+    def __init__(self, client: LogPushingClient, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.client = client
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skips logging.Handler's per-record lock: the client's queue is safe to append to from any thread
+        if not self.filter(record) or self.client.is_writer_thread():
+            return False
+        self.client.push(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.client.push(record)
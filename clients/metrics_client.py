@@ -0,0 +1,394 @@
+import bisect
+import functools
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Latency histogram upper bounds in seconds: powers of two from 1 microsecond to about 2 minutes
+LATENCY_BUCKETS: List[float] = [1e-6 * 2 ** k for k in range(28)]
+DEFAULT_TICKER_BUCKETS = 16
+NO_TICKER = "-"
+
+# Kinds of instrumented calls
+kind_historical_data = "historical_data"
+kind_current_price = "current_price"
+kind_tickers = "tickers"
+kind_market_status = "market_status"
+kind_strategy = "strategy"
+
+SeriesKey = Tuple[str, str, str]  # (kind, name, ticker bucket)
+# Snapshot label of each histogram slot; "inf" is slower than every bound
+_BUCKET_LABELS = [f"{bound:.6g}" for bound in LATENCY_BUCKETS] + ["inf"]
+_BUCKET_INDEX = {label: i for i, label in enumerate(_BUCKET_LABELS)}
+
+class _CallScope:
+    __slots__ = ("owner", "kind", "bytes", "error")
+
+    def __init__(self, owner: Any, kind: str):
+        self.owner = owner
+        self.kind = kind
+        self.bytes = 0
+        self.error = False
+
+_current_call: ContextVar[Optional[_CallScope]] = ContextVar("metrics_call", default=None)
+_current_ticker: ContextVar[Optional[str]] = ContextVar("metrics_ticker", default=None)
+
+class _Series:
+    __slots__ = ("calls", "errors", "rows", "bytes", "total", "min", "max", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot: slower than the largest bound
+
+    def add(self, seconds: float, rows: int, nbytes: int, error: bool):
+        self.calls += 1
+        self.errors += error
+        self.rows += rows
+        self.bytes += nbytes
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def merge(self, other: "_Series"):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.rows += other.rows
+        self.bytes += other.bytes
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "_Series":
+        """Inverse of to_dict, for series measured in another process."""
+        series = cls()
+        series.calls = entry["calls"]
+        series.errors = entry["errors"]
+        series.rows = entry["rows"]
+        series.bytes = entry["bytes"]
+        latency = entry["latency"]
+        series.total = latency["total"]
+        series.min = latency["min"] if series.calls else float("inf")
+        series.max = latency["max"]
+        for label, count in latency["buckets"].items():
+            series.histogram[_BUCKET_INDEX[label]] += count
+        return series
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding the q-quantile (the max for the overflow bucket)."""
+        target, seen = q * self.calls, 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(LATENCY_BUCKETS[i], self.max) if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "latency": {
+                "total": self.total,
+                "mean": self.total / self.calls if self.calls else 0.0,
+                "min": self.min if self.calls else 0.0,
+                "max": self.max,
+                "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9),
+                "p99": self.quantile(0.99),
+                # Upper bound -> count, for the non-empty buckets; "inf" is slower than every bound
+                "buckets": {_BUCKET_LABELS[i]: count for i, count in enumerate(self.histogram) if count},
+            },
+        }
+
+def count_rows(data: Any) -> int:
+    """Rows in a call's data: records, DataFrames and ticker lists by length, dicts of arrays by their first column, scalars as 1."""
+    if data is None:
+        return 0
+    if isinstance(data, dict):
+        first = next(iter(data.values()), None)
+        return len(first) if hasattr(first, "__len__") else len(data)
+    if hasattr(data, "__len__") and not isinstance(data, str):
+        return len(data)
+    return 1
+
+class MetricsClient:
+    """
+    Latency histograms and counters for the hot-path calls of every adapter and strategy.
+
+    The adapter and strategy base classes instrument their subclasses' get_historical_data,
+    get_current_price, fetch_tickers, get_market_status and run_strategy (see instrument), and the
+    historical data batch paths measure each ticker of a batch as a get_historical_data call (see call
+    and batch). Each
+    sampled call adds its latency, rows, bytes parsed and error flag to a series keyed by kind,
+    adapter/strategy name and ticker bucket, so cardinality stays bounded however large the universe.
+
+    Sampling is off by default (sample_rate 0); an instrumented call then costs one attribute check.
+    Bytes are the HTTP response bodies read during the call and errors are exceptions raised or failed
+    requests, including those an adapter logs and swallows. Series measured in other processes are
+    added with merge; EnsembleClient does this for the run_strategy calls of its workers.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, ticker_buckets: int = DEFAULT_TICKER_BUCKETS, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            sample_rate (float): Fraction of calls measured, 0 (off) to 1 (every call)
+            ticker_buckets (int): Number of hash buckets tickers are grouped into
+            clock (callable): Monotonic time source, in seconds
+        """
+        self.ticker_buckets = ticker_buckets
+        self.clock = clock
+        self._series: Dict[SeriesKey, _Series] = {}
+        self._lock = threading.Lock()
+        self._random = random.random
+        self.configure(sample_rate)
+
+    def configure(self, sample_rate: float):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.enabled = sample_rate > 0.0
+
+    def ticker_bucket(self, ticker: Optional[str]) -> str:
+        if not ticker or not isinstance(ticker, str):
+            return NO_TICKER
+        return f"b{zlib.crc32(ticker.encode()) % self.ticker_buckets:02d}"
+
+    def record(self, kind: str, name: str, ticker: Optional[str], seconds: float, rows: int = 0, nbytes: int = 0, error: bool = False):
+        """Add one call to its series."""
+        key = (kind, name, self.ticker_bucket(ticker))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.add(seconds, rows, nbytes, error)
+
+    def sampled(self) -> bool:
+        """Whether the next call should be measured."""
+        return self.enabled and (self.sample_rate >= 1.0 or self._random() < self.sample_rate)
+
+    def call(self, kind: str, owner: Any, ticker: Optional[str], func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) as one measured call of owner's kind for ticker. For work instrument()
+        cannot wrap, such as the per-ticker fetches of a batch; a call nested in an instrumented method of
+        the same owner and kind is not counted twice.
+        """
+        if not self.sampled():
+            return func(*args, **kwargs)
+        _, name_of, _, rows_of = INSTRUMENTED_METHODS[kind]
+        return self.measure(kind, name_of, lambda _args, _kwargs: ticker, rows_of,
+                            lambda _owner, *a, **kw: func(*a, **kw), owner, args, kwargs)
+
+    def batch(self, kind: str, owner: Any, tickers: List[str]) -> "_BatchScope":
+        """
+        Measure a multi-ticker request of owner's kind, such as one yf.download for a chunk of tickers.
+        The block times the shared work; each ticker is then recorded as one call charged an equal share
+        of it plus its own work run through the scope's call(). If the shared work raises, every ticker
+        is recorded as a failed call.
+        """
+        return _BatchScope(self, kind, owner, tickers)
+
+    def add_bytes(self, nbytes: int):
+        """Count bytes read (e.g. a response body) towards the call being measured, if any."""
+        scope = _current_call.get()
+        if scope is not None:
+            scope.bytes += nbytes
+
+    def record_error(self):
+        """Mark the call being measured, if any, as failed (for errors an adapter handles itself)."""
+        scope = _current_call.get()
+        if scope is not None:
+            scope.error = True
+
+    def measure(self, kind: str, name_of: Callable[[Any], str], ticker_of: Callable[[tuple, dict], Optional[str]],
+                rows_of: Callable[[tuple, Any], int], func: Callable, owner: Any, args: tuple, kwargs: dict) -> Any:
+        """Call func(owner, *args, **kwargs) and record it; calls nested in one of the same owner and kind are not counted twice."""
+        parent = _current_call.get()
+        if parent is not None and parent.owner is owner and parent.kind == kind:
+            return func(owner, *args, **kwargs)
+        scope = _CallScope(owner, kind)
+        token = _current_call.set(scope)
+        result = None
+        start = self.clock()
+        try:
+            result = func(owner, *args, **kwargs)
+            return result
+        except Exception:
+            scope.error = True
+            raise
+        finally:
+            elapsed = self.clock() - start
+            _current_call.reset(token)
+            if parent is not None:
+                parent.bytes += scope.bytes
+            ticker = ticker_of(args, kwargs) or _current_ticker.get()
+            self.record(kind, name_of(owner), ticker, elapsed, rows_of(args, result), scope.bytes, scope.error)
+
+    def ticker_scope(self, ticker: str):
+        """Tag the calls made in the block (e.g. run_strategy, which takes no ticker) with the ticker's bucket."""
+        return _TickerScope(ticker)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        All series as plain data: {"created", "sample_rate", "series": [{kind, name, ticker_bucket, calls, ...}]}.
+        With reset, the series are cleared in the same step, so nothing is reported twice.
+        """
+        with self._lock:
+            series = [
+                {"kind": kind, "name": name, "ticker_bucket": bucket, **entry.to_dict()}
+                for (kind, name, bucket), entry in sorted(self._series.items())
+            ]
+            if reset:
+                self._series.clear()
+        return {"created": datetime.now(timezone.utc).isoformat(), "sample_rate": self.sample_rate, "series": series}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add the series of a snapshot taken in another process (e.g. an EnsembleClient worker) to this client's."""
+        with self._lock:
+            for entry in snapshot["series"]:
+                key = (entry["kind"], entry["name"], entry["ticker_bucket"])
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series()
+                series.merge(_Series.from_dict(entry))
+
+    def export(self, target: str, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Export a snapshot. An http(s) URL receives it as a JSON POST; anything else is a file path the
+        snapshot is appended to as one JSON line, so periodic exports build up a history.
+        Returns:
+            Dict[str, Any]: The exported snapshot.
+        """
+        snapshot = self.snapshot()
+        if target.startswith(("http://", "https://")):
+            import requests
+            requests.post(target, json=snapshot, timeout=timeout).raise_for_status()
+        else:
+            directory = os.path.dirname(os.path.abspath(target))
+            os.makedirs(directory, exist_ok=True)
+            with open(target, "a") as file:
+                file.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+class _BatchScope:
+    def __init__(self, client: MetricsClient, kind: str, owner: Any, tickers: List[str]):
+        self.client = client
+        self.kind = kind
+        self.owner = owner
+        self.tickers = list(tickers)
+        self.measured = client.sampled()
+        self.share = 0.0
+
+    def __enter__(self):
+        if self.measured:
+            self._start = self.client.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.measured:
+            self.share = (self.client.clock() - self._start) / max(len(self.tickers), 1)
+            if exc_type is not None:
+                for ticker in self.tickers:
+                    self._record(ticker, self.share, (), None, True)
+
+    def call(self, ticker: str, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) as ticker's own part of the batch and record it with its share."""
+        if not self.measured:
+            return func(*args, **kwargs)
+        result, error = None, False
+        start = self.client.clock()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._record(ticker, self.share + self.client.clock() - start, args, result, error)
+
+    def _record(self, ticker: str, seconds: float, args: tuple, result: Any, error: bool):
+        _, name_of, _, rows_of = INSTRUMENTED_METHODS[self.kind]
+        self.client.record(self.kind, name_of(self.owner), ticker, seconds, rows_of(args, result), error=error)
+
+class _TickerScope:
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+    def __enter__(self):
+        self._token = _current_ticker.set(self.ticker)
+        return self
+
+    def __exit__(self, *exc):
+        _current_ticker.reset(self._token)
+
+def _first_argument(name: str) -> Callable[[tuple, dict], Optional[str]]:
+    def ticker_of(args: tuple, kwargs: dict) -> Optional[str]:
+        return args[0] if args else kwargs.get(name)
+    return ticker_of
+
+def _no_ticker(args: tuple, kwargs: dict) -> None:
+    return None
+
+def _result_rows(args: tuple, result: Any) -> int:
+    return count_rows(result)
+
+def _input_rows(args: tuple, result: Any) -> int:
+    # A strategy reports the bars it evaluated
+    return count_rows(args[0]) if args else 0
+
+def _class_name(owner: Any) -> str:
+    return type(owner).__name__
+
+def _strategy_name(owner: Any) -> str:
+    return owner.get_strategy_name()
+
+# kind -> (method, name_of, ticker_of, rows_of)
+INSTRUMENTED_METHODS: Dict[str, Tuple[str, Callable, Callable, Callable]] = {
+    kind_historical_data: ("get_historical_data", _class_name, _first_argument("ticker"), _result_rows),
+    kind_current_price: ("get_current_price", _class_name, _first_argument("ticker"), _result_rows),
+    kind_tickers: ("fetch_tickers", _class_name, _no_ticker, _result_rows),
+    kind_market_status: ("get_market_status", _class_name, _no_ticker, _result_rows),
+    kind_strategy: ("run_strategy", _strategy_name, _no_ticker, _input_rows),
+}
+
+# Shared by every adapter and strategy in the process; off until metrics.configure(sample_rate) is called
+metrics = MetricsClient()
+
+def instrument(cls: type, kind: str):
+    """
+    Wrap the kind's method where cls defines it, so every call through it is measured by `metrics`.
+    Called from the base classes' __init_subclass__; abstract methods and already wrapped ones are left alone.
+    """
+    method_name, name_of, ticker_of, rows_of = INSTRUMENTED_METHODS[kind]
+    func = cls.__dict__.get(method_name)
+    if func is None or getattr(func, "__isabstractmethod__", False) or getattr(func, "_metrics_kind", None):
+        return
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        client = metrics
+        if not client.enabled or (client.sample_rate < 1.0 and client._random() >= client.sample_rate):
+            return func(self, *args, **kwargs)
+        return client.measure(kind, name_of, ticker_of, rows_of, func, self, args, kwargs)
+
+    wrapper._metrics_kind = kind
+    setattr(cls, method_name, wrapper)
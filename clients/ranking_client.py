@@ -0,0 +1,188 @@
+import math
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Sequence, Tuple, Union
+import numpy as np
+from registries.standards.adapter_standards import daily
+from registries.standards.client_standards import PERIODS_PER_YEAR, DEFAULT_RANKING_WINDOW, DEFAULT_TEMPERATURE
+
+class RankingClient:
+    """
+    Ranks agents by their performance over a sliding window of recent returns.
+
+    Per-agent statistics are kept online: the mean and variance of the window's returns are slid with
+    Welford-style add/remove updates, wins are counted as returns enter and leave the window, and the
+    drawdown from the window's equity peak uses a monotonic deque per agent. Each new bar therefore
+    costs O(agents) regardless of the window length. recompute() rebuilds every statistic from the
+    stored window when an exact refresh is wanted (e.g. to shed accumulated floating point error).
+
+    Coefficients are a softmax of the agents' rolling Sharpe ratios, so better performing agents get
+    more weight in the ensemble and every coefficient stays positive.
+    """
+
+    def __init__(
+        self,
+        agents: Sequence[str],
+        window: int = DEFAULT_RANKING_WINDOW,
+        periods_per_year: int = PERIODS_PER_YEAR[daily],
+        temperature: float = DEFAULT_TEMPERATURE,
+    ):
+        """
+        Args:
+            agents (list): Agent (strategy) names
+            window (int): Number of most recent bars the statistics cover
+            periods_per_year (int): Bars per year, used to annualize the Sharpe ratio
+            temperature (float): Softmax temperature for the coefficients; lower is more selective
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        self.agents = list(agents)
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.temperature = temperature
+        self._index = {agent: i for i, agent in enumerate(self.agents)}
+        self.reset()
+
+    def reset(self):
+        n = len(self.agents)
+        self._returns = np.zeros((n, self.window))  # ring buffer, slot step % window
+        self.count = 0   # returns currently in the window
+        self.steps = 0   # returns seen since the start
+        self._mean = np.zeros(n)
+        self._m2 = np.zeros(n)
+        self._wins = np.zeros(n)
+        self._active = np.zeros(n)
+        self._log_equity = np.zeros(n)
+        # (step, log equity) candidates for the window's peak; equity before the first bar is a level too
+        self._peaks: List[Deque[Tuple[int, float]]] = [deque([(0, 0.0)]) for _ in range(n)]
+
+    def update(self, returns: Union[Mapping[str, float], Sequence[float], np.ndarray]):
+        """
+        Adds one bar of returns: a dict agent -> return (missing agents count as 0) or a sequence in agent order.
+        """
+        x = self._as_array(returns)
+        slot = self.steps % self.window
+        if self.window == 1:
+            # A single return has no spread; skip the slide so no rounding residue builds up
+            self.count = 1
+            self._mean, self._m2 = x.copy(), np.zeros_like(x)
+            self._wins = np.zeros_like(x)
+            self._active = np.zeros_like(x)
+        elif self.count < self.window:
+            self.count += 1
+            delta = x - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._returns[:, slot]
+            old_mean = self._mean.copy()
+            self._mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+            self._wins -= old > 0
+            self._active -= old != 0
+        self._returns[:, slot] = x
+        self._wins += x > 0
+        self._active += x != 0
+        self.steps += 1
+
+        self._log_equity += np.log1p(np.maximum(x, -1 + 1e-12))
+        oldest = self.steps - self.window
+        for peaks, level in zip(self._peaks, self._log_equity.tolist()):
+            while peaks and peaks[-1][1] <= level:
+                peaks.pop()
+            peaks.append((self.steps, level))
+            while peaks[0][0] < oldest:
+                peaks.popleft()
+
+    def warm_up(self, returns: np.ndarray):
+        """Feeds a history of returns shaped (agents, time), e.g. BacktestResult.portfolio_returns."""
+        returns = np.asarray(returns, dtype=np.float64)
+        for t in range(returns.shape[1]):
+            self.update(returns[:, t])
+
+    def recompute(self):
+        """Recomputes every statistic exactly from the returns in the window."""
+        window = self.window_returns()
+        self.count = window.shape[1]
+        self._mean = window.mean(axis=1) if self.count else np.zeros(len(self.agents))
+        self._m2 = ((window - self._mean[:, None]) ** 2).sum(axis=1)
+        self._wins = (window > 0).sum(axis=1).astype(np.float64)
+        self._active = (window != 0).sum(axis=1).astype(np.float64)
+
+        # Equity levels inside the window, walking back from the current level
+        log_returns = np.log1p(np.maximum(window, -1 + 1e-12))
+        levels = self._log_equity[:, None] - np.concatenate(
+            [np.cumsum(log_returns[:, ::-1], axis=1)[:, ::-1], np.zeros((len(self.agents), 1))], axis=1
+        )
+        first_step = self.steps - self.count
+        for i in range(len(self.agents)):
+            peaks = deque()
+            for offset, level in enumerate(levels[i].tolist()):
+                while peaks and peaks[-1][1] <= level:
+                    peaks.pop()
+                peaks.append((first_step + offset, level))
+            self._peaks[i] = peaks
+
+    def window_returns(self) -> np.ndarray:
+        """The returns currently in the window, oldest first, shaped (agents, count)."""
+        slots = [(self.steps - self.count + k) % self.window for k in range(self.count)]
+        return self._returns[:, slots]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling statistics per agent over the current window."""
+        volatility, sharpe, hit_rate, drawdown = self._statistics()
+        return {
+            agent: {
+                "mean_return": float(self._mean[i]),
+                "volatility": float(volatility[i]),
+                "sharpe": float(sharpe[i]),
+                "hit_rate": float(hit_rate[i]),
+                "drawdown": float(drawdown[i]),
+                "count": self.count,
+            }
+            for i, agent in enumerate(self.agents)
+        }
+
+    def coefficients(self) -> Dict[str, float]:
+        """Softmax of the rolling Sharpe ratios; equal weights until there is any history."""
+        if not self.agents:
+            return {}
+        _, sharpe, _, _ = self._statistics()
+        scaled = sharpe / self.temperature
+        weights = np.exp(scaled - scaled.max())
+        weights /= weights.sum()
+        return dict(zip(self.agents, weights.tolist()))
+
+    def ranking(self) -> List[str]:
+        """Agents from best to worst rolling Sharpe ratio (ties keep the agent order)."""
+        _, sharpe, _, _ = self._statistics()
+        return [self.agents[i] for i in np.argsort(-sharpe, kind="stable")]
+
+    def _statistics(self):
+        n = len(self.agents)
+        if self.count == 0:
+            return np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+        # Sliding updates leave rounding residue in m2: clamp at 0 and treat a std that is negligible
+        # next to the mean (e.g. a constant window) as no variation at all
+        std = np.sqrt(np.maximum(self._m2, 0.0) / self.count)
+        std = np.where(std > 1e-7 * np.abs(self._mean) + 1e-15, std, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(std > 0, self._mean / std * math.sqrt(self.periods_per_year), 0.0)
+            hit_rate = np.where(self._active > 0, self._wins / self._active, 0.0)
+        peaks = np.array([peaks[0][1] for peaks in self._peaks])
+        drawdown = np.expm1(self._log_equity - peaks)
+        return std * math.sqrt(self.periods_per_year), sharpe, hit_rate, drawdown
+
+    def _as_array(self, returns) -> np.ndarray:
+        if isinstance(returns, Mapping):
+            x = np.zeros(len(self.agents))
+            for agent, value in returns.items():
+                if agent not in self._index:
+                    raise ValueError(f"Unknown agent '{agent}'")
+                x[self._index[agent]] = value
+        else:
+            x = np.asarray(returns, dtype=np.float64)
+            if x.shape != (len(self.agents),):
+                raise ValueError(f"Expected {len(self.agents)} returns, got shape {x.shape}")
+        return np.nan_to_num(x, nan=0.0)
@@ -0,0 +1,117 @@
+import math
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from strategies.cross_sectional_engine import BarMatrix
+from registries.standards.adapter_standards import daily
+from registries.standards.client_standards import PERIODS_PER_YEAR
+
+DEFAULT_COST_BPS = 5.0
+
+class BacktestResult(NamedTuple):
+    """
+    Backtest of every agent over the same universe and timeline.
+
+    Returns are per bar: entry t is the return from the close of bar t to the close of bar t + 1.
+    """
+    agents: List[str]
+    tickers: List[str]
+    datetimes: np.ndarray               # close of the bar each return ends on, shape (time - 1,)
+    portfolio_returns: np.ndarray       # (agents, time - 1) equal-weighted across listed tickers, net of costs
+    ticker_returns: np.ndarray          # (agents, tickers) compounded return of each agent's sleeve per ticker
+    metrics: Dict[str, Dict[str, float]]
+
+class TestingClient:
+    """
+    Vectorized backtester for strategy agents.
+
+    Each agent's sentiment matrix (tickers x time, as produced by CrossSectionalIndicatorEngine) is a
+    target position: the sentiment at a bar's close is held until the next close, so no future bar is
+    ever used. Long-only mode keeps the bullish side of the sentiment, matching the system's
+    growth-oriented trading. Every ticker is an equal-weighted sleeve, and trading costs are charged on
+    the change in position. All agents, tickers and bars are computed at once with array operations.
+    """
+    __test__ = False  # not a pytest test class despite the name
+
+    def __init__(self, cost_bps: float = DEFAULT_COST_BPS, long_only: bool = True):
+        """
+        Args:
+            cost_bps (float): Cost of trading a full position, in basis points
+            long_only (bool): Ignore bearish sentiment (no short positions)
+        """
+        self.cost_bps = cost_bps
+        self.long_only = long_only
+
+    def run(self, bars: BarMatrix, sentiments: Dict[str, np.ndarray], tick_increment: str = daily) -> BacktestResult:
+        """
+        Args:
+            bars (BarMatrix): Aligned bars of the universe
+            sentiments (dict): agent name -> sentiment matrix aligned with bars (NaN = no position)
+            tick_increment (str): Increment of the bars, used to annualize the metrics
+        """
+        if tick_increment not in PERIODS_PER_YEAR:
+            raise ValueError(f"Invalid tick_increment '{tick_increment}'. Must be one of {sorted(PERIODS_PER_YEAR)}.")
+        agents = list(sentiments)
+        for name in agents:
+            if sentiments[name].shape != bars.shape:
+                raise ValueError(f"Sentiment matrix of {name} has shape {sentiments[name].shape}, expected {bars.shape}")
+
+        n_tickers, n_bars = bars.shape
+        if not agents or n_tickers == 0 or n_bars < 2:
+            empty = np.empty((len(agents), 0))
+            return BacktestResult(agents, list(bars.tickers), bars.datetimes[1:], empty,
+                                  np.zeros((len(agents), n_tickers)), {name: _metrics(np.empty(0), 0.0, 0.0, 1) for name in agents})
+
+        # (agents, tickers, time) target positions
+        positions = np.nan_to_num(np.stack([sentiments[name] for name in agents]), nan=0.0)
+        np.clip(positions, 0.0 if self.long_only else -1.0, 1.0, out=positions)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            asset_returns = np.diff(bars.close, axis=1) / bars.close[:, :-1]
+        asset_returns = np.nan_to_num(asset_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+        held = positions[:, :, :-1]
+        trades = np.abs(np.diff(positions, axis=2, prepend=0.0))[:, :, :-1]
+        sleeve_returns = held * asset_returns - (self.cost_bps / 10_000) * trades
+
+        # Equal weight across the tickers listed over each bar; bars before a ticker's first are NaN
+        listed = ~np.isnan(bars.close[:, :-1]) & ~np.isnan(bars.close[:, 1:])
+        n_listed = listed.sum(axis=0)
+        portfolio_returns = sleeve_returns.sum(axis=1) / np.maximum(n_listed, 1)
+        ticker_returns = np.expm1(np.log1p(np.maximum(sleeve_returns, -1.0)).sum(axis=2))
+        turnover = trades.sum(axis=(1, 2)) / max(listed.sum(), 1)
+        exposure = held.sum(axis=(1, 2)) / max(listed.sum(), 1)
+
+        periods_per_year = PERIODS_PER_YEAR[tick_increment]
+        metrics = {
+            name: _metrics(portfolio_returns[i], turnover[i], exposure[i], periods_per_year)
+            for i, name in enumerate(agents)
+        }
+        return BacktestResult(agents, list(bars.tickers), bars.datetimes[1:], portfolio_returns, ticker_returns, metrics)
+
+    @staticmethod
+    def rank(result: BacktestResult, metric: str = "sharpe") -> List[str]:
+        """Agent names from best to worst by a metric (ties keep the input order)."""
+        return sorted(result.agents, key=lambda name: -result.metrics[name][metric])
+
+def _metrics(returns: np.ndarray, turnover: float, exposure: float, periods_per_year: int) -> Dict[str, float]:
+    if returns.size == 0:
+        return {"total_return": 0.0, "annualized_return": 0.0, "volatility": 0.0, "sharpe": 0.0,
+                "max_drawdown": 0.0, "hit_rate": 0.0, "turnover": 0.0, "exposure": 0.0}
+    equity = np.cumprod(1.0 + returns)
+    total_return = equity[-1] - 1.0
+    years = returns.size / periods_per_year
+    annualized = equity[-1] ** (1.0 / years) - 1.0 if equity[-1] > 0 else -1.0
+    volatility = returns.std() * math.sqrt(periods_per_year)
+    sharpe = returns.mean() / returns.std() * math.sqrt(periods_per_year) if returns.std() > 0 else 0.0
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1.0
+    active = returns != 0
+    return {
+        "total_return": float(total_return),
+        "annualized_return": float(annualized),
+        "volatility": float(volatility),
+        "sharpe": float(sharpe),
+        "max_drawdown": float(drawdown.min()),
+        "hit_rate": float((returns[active] > 0).mean()) if active.any() else 0.0,
+        "turnover": float(turnover),
+        "exposure": float(exposure),
+    }
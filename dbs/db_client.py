@@ -0,0 +1,114 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import pandas as pd
+from registries.standards.adapter_standards import daily
+
+class SentimentRecord(NamedTuple):
+    """One agent output: a strategy's sentiment in [-1, 1] for a ticker at a bar time (naive UTC)."""
+    ticker: str
+    strategy: str
+    timestamp: datetime
+    sentiment: float
+
+SENTIMENT_COLUMNS = list(SentimentRecord._fields)
+# Agent sentiments and coefficients are kept per (universe, tick_increment); this is the universe
+# they are stored under when the caller does not name one
+DEFAULT_UNIVERSE = "default"
+
+def sentiment_records(results: Iterable, timestamp: datetime) -> List[SentimentRecord]:
+    """
+    Turn a cycle's EnsembleResult list (ticker, strategy, score, error) into SentimentRecords at timestamp.
+    Agents that failed or returned no score are left out.
+    """
+    return [
+        SentimentRecord(result.ticker, result.strategy, timestamp, float(result.score))
+        for result in results
+        if result.error is None and result.score is not None
+    ]
+
+class DBClient(ABC):
+    """
+    Persistence for the ensemble's agent outputs: sentiment scores per (ticker, strategy, timestamp)
+    and the ranking's agent coefficients per timestamp. Writes are upserts, so re-running a cycle
+    replaces its rows instead of duplicating them.
+
+    Every row belongs to a (universe, tick_increment) scope and every read stays within one scope, so
+    the outputs of an hourly run never mix with a daily run's, nor one universe's with another's.
+    """
+
+    @abstractmethod
+    def save_sentiments(
+        self,
+        records: Iterable[SentimentRecord],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        """
+        Upsert sentiment scores.
+        Args:
+            records: SentimentRecords (or tuples in the same order)
+            universe (str): Universe the sentiments were computed over
+            tick_increment (str): Bar increment of the sentiments
+        Returns:
+            int: Number of records written.
+        """
+        pass
+
+    @abstractmethod
+    def get_sentiments(
+        self,
+        ticker: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> pd.DataFrame:
+        """
+        Return the scope's stored sentiments (SENTIMENT_COLUMNS) ordered by timestamp, optionally
+        filtered by ticker, strategy and an inclusive time range.
+        """
+        pass
+
+    @abstractmethod
+    def get_latest_sentiments(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Return every agent's sentiment per ticker at the scope's latest timestamp at or before as_of
+        (strategy -> ticker -> sentiment, as CrossSectionalIndicatorEngine.latest_scores).
+        """
+        pass
+
+    @abstractmethod
+    def save_coefficients(
+        self,
+        timestamp: datetime,
+        coefficients: Dict[str, float],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        """
+        Upsert the agents' ensemble coefficients for the scope at timestamp.
+        Returns:
+            int: Number of coefficients written.
+        """
+        pass
+
+    @abstractmethod
+    def get_coefficients(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, float]:
+        """Return the scope's coefficients saved at the latest timestamp at or before as_of ({} when there are none)."""
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
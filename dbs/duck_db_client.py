@@ -0,0 +1,710 @@
+import math
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import duckdb
+import numpy as np
+import pandas as pd
+from dbs.db_client import DBClient, SentimentRecord, SENTIMENT_COLUMNS, DEFAULT_UNIVERSE
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime, daily
+from registries.standards.client_standards import PERIODS_PER_YEAR, DEFAULT_RANKING_WINDOW, DEFAULT_TEMPERATURE
+
+# Default on-disk location of the local DuckDB database (kept out of version control)
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "hyper.duckdb")
+
+BAR_COLUMNS = [df_datetime, df_open, df_high, df_low, df_close, df_volume]
+LOG_COLUMNS = ["logged_at", "level", "level_no", "logger", "message", "module", "line"]
+AGENT_RETURN_COLUMNS = ["strategy", "timestamp", "return"]
+RANKING_COLUMNS = ["strategy", "count", "mean_return", "volatility", "sharpe", "hit_rate", "drawdown", "coefficient"]
+
+def _naive_utc(datetimes) -> np.ndarray:
+    """datetime64[ns] values in naive UTC, as the tables store them."""
+    index = pd.DatetimeIndex(datetimes)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.values.astype("datetime64[ns]")
+
+def _naive_utc_datetime(timestamp: Any) -> datetime:
+    """One timestamp as a naive UTC datetime, for binding as a query parameter."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.to_pydatetime()
+
+class DuckDBClient(DBClient):
+    """
+    Local DuckDB store for OHLCV bars keyed by (ticker, tick_increment, DateTime), for dated
+    snapshots of ticker universes, for shipped log records and for the ensemble's agent sentiments,
+    agent returns and coefficients.
+
+    Alongside the bars it records which calendar-day ranges have already been fetched for each
+    (ticker, tick_increment). Days with no bars (weekends, holidays) cannot be told apart from days
+    that were never downloaded by looking at the bars alone, so callers use the coverage ranges
+    to work out which gaps still have to be requested.
+
+    The agent tables are columnar and the ranking runs inside DuckDB: rolling returns, the ranking
+    statistics and the weighted ensemble scores are window-function queries whose results come back
+    as NumPy arrays (fetchnumpy) instead of being converted row by row in Python. Every agent row is
+    scoped by (universe, tick_increment), and every query reads a single scope, so an hourly run
+    never feeds a daily ranking.
+
+    DateTime values are stored as naive UTC timestamps. The connection is opened lazily on first use
+    and shared between threads behind a lock.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._connection = None
+        self._lock = threading.RLock()
+
+    def _get_connection(self) -> duckdb.DuckDBPyConnection:
+        if self._connection is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._connection = duckdb.connect(self.db_path)
+            self._create_tables(self._connection)
+        return self._connection
+
+    def _create_tables(self, connection: duckdb.DuckDBPyConnection):
+        connection.execute(f"""
+            CREATE TABLE IF NOT EXISTS bars (
+                ticker VARCHAR NOT NULL,
+                tick_increment VARCHAR NOT NULL,
+                "{df_datetime}" TIMESTAMP NOT NULL,
+                {df_open} DOUBLE,
+                {df_high} DOUBLE,
+                {df_low} DOUBLE,
+                {df_close} DOUBLE,
+                {df_volume} BIGINT,
+                PRIMARY KEY (ticker, tick_increment, "{df_datetime}")
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS bar_coverage (
+                ticker VARCHAR NOT NULL,
+                tick_increment VARCHAR NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS ticker_snapshots (
+                universe VARCHAR NOT NULL,
+                snapshot_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (universe, snapshot_at)
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS ticker_snapshot_members (
+                universe VARCHAR NOT NULL,
+                snapshot_at TIMESTAMP NOT NULL,
+                position INTEGER NOT NULL,
+                ticker VARCHAR NOT NULL
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS logs (
+                logged_at TIMESTAMP NOT NULL,
+                level VARCHAR NOT NULL,
+                level_no INTEGER NOT NULL,
+                logger VARCHAR,
+                message VARCHAR,
+                module VARCHAR,
+                line INTEGER
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS sentiments (
+                universe VARCHAR NOT NULL,
+                tick_increment VARCHAR NOT NULL,
+                ticker VARCHAR NOT NULL,
+                strategy VARCHAR NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                sentiment DOUBLE NOT NULL,
+                PRIMARY KEY (universe, tick_increment, ticker, strategy, timestamp)
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS agent_returns (
+                universe VARCHAR NOT NULL,
+                tick_increment VARCHAR NOT NULL,
+                strategy VARCHAR NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                "return" DOUBLE NOT NULL,
+                PRIMARY KEY (universe, tick_increment, strategy, timestamp)
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS coefficients (
+                universe VARCHAR NOT NULL,
+                tick_increment VARCHAR NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                strategy VARCHAR NOT NULL,
+                coefficient DOUBLE NOT NULL,
+                PRIMARY KEY (universe, tick_increment, timestamp, strategy)
+            )
+        """)
+
+    def upsert_bars(self, ticker: str, tick_increment: str, bars: Union[List[Dict[str, Any]], pd.DataFrame]) -> int:
+        """
+        Insert bars for a ticker, replacing any stored bar with the same DateTime.
+        Args:
+            ticker (str): The symbol the bars belong to.
+            tick_increment (str): The granularity of the bars.
+            bars (list of dicts or pd.DataFrame): Bars in the historical data standard format.
+        Returns:
+            int: Number of bars written.
+        """
+        frame = pd.DataFrame(bars)
+        if frame.empty:
+            return 0
+        missing_columns = set(BAR_COLUMNS) - set(frame.columns)
+        if missing_columns:
+            raise ValueError(f"Bars for {ticker} are missing columns: {sorted(missing_columns)}")
+
+        frame = frame[BAR_COLUMNS].copy()
+        frame[df_datetime] = pd.to_datetime(frame[df_datetime], utc=True).dt.tz_localize(None)
+        # A provider can repeat a timestamp; keep the last value like a replace would
+        frame = frame.drop_duplicates(subset=df_datetime, keep="last")
+
+        with self._lock:
+            connection = self._get_connection()
+            connection.register("incoming_bars", frame)
+            try:
+                connection.execute(f"""
+                    INSERT OR REPLACE INTO bars
+                    SELECT ?, ?, "{df_datetime}", {df_open}, {df_high}, {df_low}, {df_close}, {df_volume}
+                    FROM incoming_bars
+                """, [ticker, tick_increment])
+            finally:
+                connection.unregister("incoming_bars")
+        return len(frame)
+
+    def get_bars(
+        self,
+        ticker: str,
+        tick_increment: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """
+        Return stored bars ordered by DateTime, optionally restricted to the calendar days
+        start_date through end_date (both inclusive).
+        """
+        query = f"""
+            SELECT "{df_datetime}", {df_open}, {df_high}, {df_low}, {df_close}, {df_volume}
+            FROM bars
+            WHERE ticker = ? AND tick_increment = ?
+        """
+        params: List[Any] = [ticker, tick_increment]
+        if start_date is not None:
+            query += f' AND "{df_datetime}" >= ?'
+            params.append(pd.Timestamp(start_date))
+        if end_date is not None:
+            query += f' AND "{df_datetime}" < ?'
+            params.append(pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        query += f' ORDER BY "{df_datetime}"'
+
+        with self._lock:
+            return self._get_connection().execute(query, params).df()
+
+    def get_covered_ranges(self, ticker: str, tick_increment: str) -> List[Tuple[date, date]]:
+        """Return the merged, sorted (start_date, end_date) day ranges already fetched for a ticker."""
+        with self._lock:
+            rows = self._get_connection().execute("""
+                SELECT start_date, end_date FROM bar_coverage
+                WHERE ticker = ? AND tick_increment = ?
+                ORDER BY start_date
+            """, [ticker, tick_increment]).fetchall()
+        return [(start, end) for start, end in rows]
+
+    def add_covered_range(self, ticker: str, tick_increment: str, start_date: date, end_date: date):
+        """Record that the days start_date through end_date (inclusive) have been fetched."""
+        if end_date < start_date:
+            return
+        with self._lock:
+            ranges = self.get_covered_ranges(ticker, tick_increment) + [(start_date, end_date)]
+            merged = merge_date_ranges(ranges)
+            connection = self._get_connection()
+            connection.execute("BEGIN TRANSACTION")
+            try:
+                connection.execute(
+                    "DELETE FROM bar_coverage WHERE ticker = ? AND tick_increment = ?",
+                    [ticker, tick_increment],
+                )
+                connection.executemany(
+                    "INSERT INTO bar_coverage VALUES (?, ?, ?, ?)",
+                    [[ticker, tick_increment, start, end] for start, end in merged],
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def save_ticker_snapshot(self, universe: str, snapshot_at: datetime, tickers: List[str]):
+        """
+        Store a universe's tickers as of snapshot_at (naive UTC), keeping their order.
+        Saving a snapshot at an existing time replaces it.
+        """
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("BEGIN TRANSACTION")
+            try:
+                for table in ("ticker_snapshots", "ticker_snapshot_members"):
+                    connection.execute(f"DELETE FROM {table} WHERE universe = ? AND snapshot_at = ?", [universe, snapshot_at])
+                connection.execute("INSERT INTO ticker_snapshots VALUES (?, ?)", [universe, snapshot_at])
+                if tickers:
+                    connection.executemany(
+                        "INSERT INTO ticker_snapshot_members VALUES (?, ?, ?, ?)",
+                        [[universe, snapshot_at, position, ticker] for position, ticker in enumerate(tickers)],
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def get_ticker_snapshot(self, universe: str, as_of: Optional[datetime] = None) -> Optional[Tuple[datetime, List[str]]]:
+        """
+        Return (snapshot_at, tickers) of the latest snapshot taken at or before as_of (the latest
+        overall when None), or None when there is no such snapshot.
+        """
+        query = "SELECT max(snapshot_at) FROM ticker_snapshots WHERE universe = ?"
+        params: List[Any] = [universe]
+        if as_of is not None:
+            query += " AND snapshot_at <= ?"
+            params.append(as_of)
+        with self._lock:
+            connection = self._get_connection()
+            snapshot_at = connection.execute(query, params).fetchone()[0]
+            if snapshot_at is None:
+                return None
+            rows = connection.execute(
+                "SELECT ticker FROM ticker_snapshot_members WHERE universe = ? AND snapshot_at = ? ORDER BY position",
+                [universe, snapshot_at],
+            ).fetchall()
+        return snapshot_at, [ticker for (ticker,) in rows]
+
+    def get_ticker_snapshot_times(self, universe: str) -> List[datetime]:
+        """Return the times of every stored snapshot of a universe, oldest first."""
+        with self._lock:
+            rows = self._get_connection().execute(
+                "SELECT snapshot_at FROM ticker_snapshots WHERE universe = ? ORDER BY snapshot_at", [universe]
+            ).fetchall()
+        return [snapshot_at for (snapshot_at,) in rows]
+
+    def insert_logs(self, records: List[Tuple]) -> int:
+        """
+        Append log records in one batch.
+        Args:
+            records (list of tuples): Rows in LOG_COLUMNS order, logged_at as naive UTC.
+        Returns:
+            int: Number of records written.
+        """
+        if not records:
+            return 0
+        frame = pd.DataFrame.from_records(records, columns=LOG_COLUMNS)
+        with self._lock:
+            connection = self._get_connection()
+            connection.register("incoming_logs", frame)
+            try:
+                connection.execute(f"INSERT INTO logs SELECT {', '.join(LOG_COLUMNS)} FROM incoming_logs")
+            finally:
+                connection.unregister("incoming_logs")
+        return len(frame)
+
+    def get_logs(
+        self,
+        since: Optional[datetime] = None,
+        min_level: int = 0,
+        logger: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Return stored log records (LOG_COLUMNS) at or above min_level, oldest first, optionally since a time (naive UTC) and for one logger."""
+        query = f"SELECT {', '.join(LOG_COLUMNS)} FROM logs WHERE level_no >= ?"
+        params: List[Any] = [min_level]
+        if since is not None:
+            query += " AND logged_at >= ?"
+            params.append(since)
+        if logger is not None:
+            query += " AND logger = ?"
+            params.append(logger)
+        query += " ORDER BY logged_at"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            return self._get_connection().execute(query, params).df()
+
+    def _upsert_frame(self, table: str, frame: pd.DataFrame, key: List[str], scope: Tuple[str, str], replace: bool = False) -> int:
+        """Upsert frame's rows into table under scope (universe, tick_increment); replace first drops the scope's rows."""
+        # INSERT OR REPLACE rejects a key repeated within one statement; keep the last value
+        frame = frame.drop_duplicates(subset=key, keep="last")
+        if frame.empty and not replace:
+            return 0
+        columns = ", ".join(f'"{column}"' for column in frame.columns)
+        with self._lock:
+            connection = self._get_connection()
+            connection.register(f"incoming_{table}", frame)
+            connection.execute("BEGIN TRANSACTION")
+            try:
+                if replace:
+                    connection.execute(f"DELETE FROM {table} WHERE universe = ? AND tick_increment = ?", list(scope))
+                connection.execute(f"""
+                    INSERT OR REPLACE INTO {table} (universe, tick_increment, {columns})
+                    SELECT ?, ?, {columns} FROM incoming_{table}
+                """, list(scope))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            finally:
+                connection.unregister(f"incoming_{table}")
+        return len(frame)
+
+    @staticmethod
+    def _scope_filter(universe: str, tick_increment: str, as_of: Optional[datetime], params: List[Any]) -> str:
+        params.extend([universe, tick_increment])
+        if as_of is None:
+            return "universe = ? AND tick_increment = ?"
+        params.append(_naive_utc_datetime(as_of))
+        return "universe = ? AND tick_increment = ? AND timestamp <= ?"
+
+    def save_sentiments(
+        self,
+        records: Iterable[SentimentRecord],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        frame = pd.DataFrame.from_records(list(records), columns=SENTIMENT_COLUMNS)
+        if frame.empty:
+            return 0
+        frame["timestamp"] = _naive_utc(frame["timestamp"])
+        frame["sentiment"] = frame["sentiment"].astype(np.float64)
+        return self._upsert_frame("sentiments", frame, ["ticker", "strategy", "timestamp"], (universe, tick_increment))
+
+    def save_sentiment_matrices(
+        self,
+        tickers: Sequence[str],
+        datetimes,
+        sentiments: Mapping[str, np.ndarray],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        """
+        Upsert whole sentiment histories column-wise, without building a record per score.
+        Args:
+            tickers (list): Row labels of the matrices
+            datetimes: Column labels of the matrices
+            sentiments (dict): strategy -> float matrix shaped (len(tickers), len(datetimes)), as
+                CrossSectionalIndicatorEngine.sentiments returns; NaN (warm-up) entries are skipped
+            universe (str): Universe the sentiments were computed over
+            tick_increment (str): Bar increment of the sentiments
+        Returns:
+            int: Number of scores written.
+        """
+        n_times = len(datetimes)
+        ticker_column = np.repeat(np.asarray(tickers, dtype=object), n_times)
+        time_column = np.tile(_naive_utc(datetimes), len(tickers))
+        frames = []
+        for strategy, matrix in sentiments.items():
+            values = np.asarray(matrix, dtype=np.float64).ravel()
+            if values.shape != ticker_column.shape:
+                raise ValueError(f"Sentiments for {strategy} have shape {np.shape(matrix)}, expected {(len(tickers), n_times)}")
+            present = ~np.isnan(values)
+            frames.append(pd.DataFrame({
+                "ticker": ticker_column[present],
+                "strategy": strategy,
+                "timestamp": time_column[present],
+                "sentiment": values[present],
+            }))
+        if not frames:
+            return 0
+        return self._upsert_frame(
+            "sentiments", pd.concat(frames, ignore_index=True), ["ticker", "strategy", "timestamp"], (universe, tick_increment)
+        )
+
+    def get_sentiments(
+        self,
+        ticker: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> pd.DataFrame:
+        params: List[Any] = []
+        query = f"SELECT {', '.join(SENTIMENT_COLUMNS)} FROM sentiments WHERE {self._scope_filter(universe, tick_increment, end, params)}"
+        for column, operator, value in (("ticker", "=", ticker), ("strategy", "=", strategy), ("timestamp", ">=", start)):
+            if value is not None:
+                query += f" AND {column} {operator} ?"
+                params.append(_naive_utc_datetime(value) if column == "timestamp" else value)
+        query += " ORDER BY timestamp, ticker, strategy"
+        with self._lock:
+            return self._get_connection().execute(query, params).df()
+
+    def get_latest_sentiments(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, Dict[str, float]]:
+        params: List[Any] = [universe, tick_increment]
+        where = self._scope_filter(universe, tick_increment, as_of, params)
+        with self._lock:
+            rows = self._get_connection().execute(f"""
+                SELECT strategy, ticker, sentiment FROM sentiments
+                WHERE universe = ? AND tick_increment = ?
+                  AND timestamp = (SELECT max(timestamp) FROM sentiments WHERE {where})
+            """, params).fetchall()
+        latest: Dict[str, Dict[str, float]] = {}
+        for strategy, ticker, sentiment in rows:
+            latest.setdefault(strategy, {})[ticker] = sentiment
+        return latest
+
+    def save_coefficients(
+        self,
+        timestamp: datetime,
+        coefficients: Dict[str, float],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        if not coefficients:
+            return 0
+        frame = pd.DataFrame({
+            "timestamp": _naive_utc([timestamp] * len(coefficients)),
+            "strategy": list(coefficients),
+            "coefficient": np.fromiter(coefficients.values(), dtype=np.float64, count=len(coefficients)),
+        })
+        return self._upsert_frame("coefficients", frame, ["timestamp", "strategy"], (universe, tick_increment))
+
+    def get_coefficients(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, float]:
+        params: List[Any] = [universe, tick_increment]
+        where = self._scope_filter(universe, tick_increment, as_of, params)
+        with self._lock:
+            rows = self._get_connection().execute(f"""
+                SELECT strategy, coefficient FROM coefficients
+                WHERE universe = ? AND tick_increment = ?
+                  AND timestamp = (SELECT max(timestamp) FROM coefficients WHERE {where})
+            """, params).fetchall()
+        return dict(rows)
+
+    def save_agent_returns(
+        self,
+        agents: Sequence[str],
+        datetimes,
+        returns: np.ndarray,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+        replace: bool = False,
+    ) -> int:
+        """
+        Upsert the agents' per-bar portfolio returns column-wise.
+        Args:
+            agents (list): Agent (strategy) names, one per row of returns
+            datetimes: Bar times, one per column of returns
+            returns (np.ndarray): Shaped (agents, time), e.g. BacktestResult.portfolio_returns; NaN counts as 0
+            universe (str): Universe the agents were backtested over
+            tick_increment (str): Bar increment of the returns
+            replace (bool): Drop the universe's stored returns at this increment first, so only this
+                run's agents and bars remain, instead of merging into them
+        Returns:
+            int: Number of returns written.
+        """
+        returns = np.nan_to_num(np.asarray(returns, dtype=np.float64), nan=0.0)
+        if returns.shape != (len(agents), len(datetimes)):
+            raise ValueError(f"Expected returns shaped {(len(agents), len(datetimes))}, got {returns.shape}")
+        frame = pd.DataFrame({
+            "strategy": np.repeat(np.asarray(agents, dtype=object), len(datetimes)),
+            "timestamp": np.tile(_naive_utc(datetimes), len(agents)),
+            "return": returns.ravel(),
+        })
+        return self._upsert_frame("agent_returns", frame, ["strategy", "timestamp"], (universe, tick_increment), replace=replace)
+
+    def _fetch_numpy(self, query: str, params: List[Any]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return self._get_connection().execute(query, params).fetchnumpy()
+
+    def rolling_agent_returns(
+        self,
+        window: int = DEFAULT_RANKING_WINDOW,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compounded return of each agent over the trailing window bars ending at every stored bar
+        (fewer at the start of its history).
+        Returns:
+            dict: Column arrays strategy, timestamp, rolling_return, ordered by strategy then timestamp.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        params: List[Any] = []
+        where = self._scope_filter(universe, tick_increment, as_of, params)
+        return self._fetch_numpy(f"""
+            SELECT strategy, timestamp,
+                   exp(sum(ln(1 + greatest("return", -1 + 1e-12))) OVER (
+                       PARTITION BY strategy ORDER BY timestamp ROWS BETWEEN {int(window) - 1} PRECEDING AND CURRENT ROW
+                   )) - 1 AS rolling_return
+            FROM agent_returns
+            WHERE {where}
+            ORDER BY strategy, timestamp
+        """, params)
+
+    def rank_agents(
+        self,
+        window: int = DEFAULT_RANKING_WINDOW,
+        periods_per_year: int = PERIODS_PER_YEAR[daily],
+        temperature: float = DEFAULT_TEMPERATURE,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Ranks the agents on their last window stored returns (at or before as_of), with the same
+        statistics RankingClient keeps online: mean return, annualized volatility and Sharpe ratio,
+        hit rate, drawdown from the window's equity peak, and coefficients as a softmax of the
+        Sharpe ratios.
+        Returns:
+            dict: Column arrays named as RANKING_COLUMNS, one entry per agent from best to worst Sharpe ratio.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        params: List[Any] = []
+        where = self._scope_filter(universe, tick_increment, as_of, params)
+        annualize = math.sqrt(periods_per_year)
+        return self._fetch_numpy(f"""
+            WITH recent AS (
+                SELECT strategy, timestamp, "return" AS r,
+                       row_number() OVER (PARTITION BY strategy ORDER BY timestamp DESC) AS age
+                FROM agent_returns
+                WHERE {where}
+            ), levels AS (
+                SELECT strategy, timestamp, r,
+                       sum(ln(1 + greatest(r, -1 + 1e-12))) OVER (PARTITION BY strategy ORDER BY timestamp ROWS UNBOUNDED PRECEDING) AS level
+                FROM recent
+                WHERE age <= {int(window)}
+            ), windowed AS (
+                -- levels are relative to the equity before the window, which counts as a peak candidate
+                SELECT strategy, count(*) AS count, avg(r) AS mean_return, stddev_pop(r) AS std,
+                       count(*) FILTER (WHERE r > 0) AS wins, count(*) FILTER (WHERE r <> 0) AS active,
+                       arg_max(level, timestamp) AS current_level, greatest(max(level), 0) AS peak
+                FROM levels
+                GROUP BY strategy
+            ), stats AS (
+                -- a std negligible next to the mean (e.g. a constant window) is no variation at all
+                SELECT strategy, count, mean_return, wins, active, current_level, peak,
+                       CASE WHEN std > 1e-7 * abs(mean_return) + 1e-15 THEN std ELSE 0 END AS std
+                FROM windowed
+            ), scored AS (
+                SELECT strategy, count, mean_return, std * {annualize!r} AS volatility,
+                       CASE WHEN std > 0 THEN mean_return / std * {annualize!r} ELSE 0 END AS sharpe,
+                       CASE WHEN active > 0 THEN wins / active ELSE 0 END AS hit_rate,
+                       exp(current_level - peak) - 1 AS drawdown
+                FROM stats
+            ), weighted AS (
+                SELECT *, exp(sharpe / {float(temperature)!r} - max(sharpe / {float(temperature)!r}) OVER ()) AS weight
+                FROM scored
+            )
+            SELECT strategy, count, mean_return, volatility, sharpe, hit_rate, drawdown,
+                   weight / sum(weight) OVER () AS coefficient
+            FROM weighted
+            ORDER BY sharpe DESC, strategy
+        """, params)
+
+    def ensemble_scores(
+        self,
+        as_of: Optional[datetime] = None,
+        k: Optional[int] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Weighted ensemble score per ticker: the agents' sentiments at the latest timestamp at or before
+        as_of, averaged with the latest coefficients at or before as_of as weights, both from the same
+        universe and increment. Agents without a coefficient get no weight; a ticker only some agents
+        scored is averaged over those agents.
+        Args:
+            as_of (datetime): Point in time (naive UTC); the latest data when None
+            k (int): Keep only the k best scored tickers
+            universe (str): Universe of the sentiments and coefficients
+            tick_increment (str): Bar increment of the sentiments and coefficients
+        Returns:
+            dict: Column arrays ticker, score, agents (number of agents scored), best score first.
+        """
+        params: List[Any] = [universe, tick_increment]
+        sentiment_where = self._scope_filter(universe, tick_increment, as_of, params)
+        params.extend([universe, tick_increment])
+        coefficient_where = self._scope_filter(universe, tick_increment, as_of, params)
+        limit = "" if k is None else f"LIMIT {int(k)}"
+        return self._fetch_numpy(f"""
+            WITH latest_sentiments AS (
+                SELECT ticker, strategy, sentiment FROM sentiments
+                WHERE universe = ? AND tick_increment = ?
+                  AND timestamp = (SELECT max(timestamp) FROM sentiments WHERE {sentiment_where})
+            ), latest_coefficients AS (
+                SELECT strategy, coefficient FROM coefficients
+                WHERE universe = ? AND tick_increment = ?
+                  AND timestamp = (SELECT max(timestamp) FROM coefficients WHERE {coefficient_where})
+            )
+            SELECT s.ticker,
+                   sum(c.coefficient * s.sentiment) / sum(c.coefficient) AS score,
+                   count(*) AS agents
+            FROM latest_sentiments s
+            JOIN latest_coefficients c USING (strategy)
+            GROUP BY s.ticker
+            HAVING sum(c.coefficient) > 0
+            ORDER BY score DESC, s.ticker
+            {limit}
+        """, params)
+
+    def top_tickers(
+        self,
+        k: int,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> np.ndarray:
+        """The k tickers with the highest weighted ensemble score (see ensemble_scores), best first."""
+        return self.ensemble_scores(as_of, k=k, universe=universe, tick_increment=tick_increment)["ticker"]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+def merge_date_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Merge overlapping or adjacent inclusive day ranges."""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def subtract_date_ranges(start_date: date, end_date: date, covered: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Return the inclusive day ranges within start_date..end_date that no covered range includes."""
+    missing: List[Tuple[date, date]] = []
+    cursor = start_date
+    for covered_start, covered_end in merge_date_ranges(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end_date:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = covered_end + timedelta(days=1)
+        if cursor > end_date:
+            return missing
+    if cursor <= end_date:
+        missing.append((cursor, end_date))
+    return missing
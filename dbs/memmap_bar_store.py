@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+import numpy as np
+import pandas as pd
+from adapters.historical_data_adapters.historical_data_formats import standardize_bar_frame, bar_frame_to_arrays
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+# Default on-disk location of the bar files (kept out of version control, next to the DuckDB database)
+DEFAULT_BAR_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "bars")
+
+# File layout: a HEADER_SIZE-byte header (MAGIC, then the row count as little-endian int64) followed by
+# each column stored contiguously in this order. DateTime is int64 nanoseconds since the epoch (UTC).
+MAGIC = b"HYPBAR01"
+HEADER_SIZE = 64
+COLUMNS: List[Tuple[str, np.dtype]] = [
+    (df_datetime, np.dtype("<i8")),
+    (df_open, np.dtype("<f8")),
+    (df_high, np.dtype("<f8")),
+    (df_low, np.dtype("<f8")),
+    (df_close, np.dtype("<f8")),
+    (df_volume, np.dtype("<i8")),
+]
+FILE_SUFFIX = ".bars"
+# Next to each bar file, the calendar-day ranges its bars were fetched for, as a JSON list of [start, end] ISO dates
+COVERAGE_SUFFIX = ".coverage"
+
+class MemmapBarStore:
+    """
+    On-disk bar cache with one fixed-layout binary file per (ticker, tick_increment).
+
+    Files are opened with numpy.memmap and read as zero-copy, read-only views in the arrays output
+    format (datetime64[ns] DateTime, float64 prices, int64 volume), so strategies work straight off
+    the OS page cache and every process that opens the same file shares its pages instead of holding
+    its own copy.
+
+    Writes go to a temporary file that atomically replaces the old one. Views handed out earlier keep
+    the previous version mapped until they are dropped, so readers never see a half-written file.
+
+    The day ranges a file covers can be kept beside it (set_covered_ranges), so a reader can tell
+    whether a request is fully cached from the files alone, without opening the DuckDB store whose
+    file lock a writing process holds.
+    """
+
+    def __init__(self, root: str = DEFAULT_BAR_STORE_PATH):
+        self.root = root
+        self._maps: Dict[str, Tuple[Tuple[int, int, int], np.memmap]] = {}
+        self._lock = threading.Lock()
+
+    def write_bars(self, ticker: str, tick_increment: str, bars: Any) -> int:
+        """
+        Replace the stored bars of a ticker.
+        Args:
+            ticker (str): The symbol the bars belong to.
+            tick_increment (str): The granularity of the bars.
+            bars: Bars in any historical data output format.
+        Returns:
+            int: Number of bars stored.
+        """
+        columns = self._sorted_unique(self._to_columns(bars))
+        self._write(self._path(ticker, tick_increment), columns)
+        return len(columns[df_datetime])
+
+    def append_bars(self, ticker: str, tick_increment: str, bars: Any) -> int:
+        """
+        Merge bars into the stored ones; a new bar replaces a stored bar with the same DateTime.
+        Returns the number of bars stored after the merge.
+        """
+        new = self._to_columns(bars)
+        path = self._path(ticker, tick_increment)
+        current = self._open(path)
+        if current is None:
+            return self.write_bars(ticker, tick_increment, bars)
+        merged = self._sorted_unique({name: np.concatenate([current[name], new[name]]) for name, _ in COLUMNS})
+        self._write(path, merged)
+        return len(merged[df_datetime])
+
+    def open_bars(
+        self,
+        ticker: str,
+        tick_increment: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Return read-only, zero-copy arrays-format views of the stored bars, optionally restricted to
+        the calendar days start_date through end_date (both inclusive, UTC), or None when the ticker
+        has no file.
+        """
+        columns = self._open(self._path(ticker, tick_increment))
+        if columns is None:
+            return None
+        times = columns[df_datetime]
+        start = 0 if start_date is None else int(np.searchsorted(times, pd.Timestamp(start_date).value, side="left"))
+        end = len(times) if end_date is None else int(
+            np.searchsorted(times, (pd.Timestamp(end_date) + pd.Timedelta(days=1)).value, side="left")
+        )
+        arrays = {name: values[start:end] for name, values in columns.items()}
+        arrays[df_datetime] = arrays[df_datetime].view("datetime64[ns]")
+        return arrays
+
+    def has_bars(self, ticker: str, tick_increment: str) -> bool:
+        return os.path.exists(self._path(ticker, tick_increment))
+
+    def get_tickers(self, tick_increment: str) -> List[str]:
+        """Tickers with a stored file for the increment, sorted."""
+        directory = os.path.join(self.root, tick_increment)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(unquote(name[:-len(FILE_SUFFIX)]) for name in os.listdir(directory) if name.endswith(FILE_SUFFIX))
+
+    def get_covered_ranges(self, ticker: str, tick_increment: str) -> List[Tuple[date, date]]:
+        """Calendar-day ranges recorded for the ticker's file, or [] when none were recorded."""
+        try:
+            with open(self._path(ticker, tick_increment) + COVERAGE_SUFFIX) as file:
+                ranges = json.load(file)
+        except FileNotFoundError:
+            return []
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in ranges]
+
+    def set_covered_ranges(self, ticker: str, tick_increment: str, ranges: List[Tuple[date, date]]):
+        """
+        Replace the recorded ranges. Record them after writing the bars they describe, so a reader
+        that sees the new ranges also sees the new bars.
+        """
+        path = self._path(ticker, tick_increment) + COVERAGE_SUFFIX
+        payload = json.dumps([[start.isoformat(), end.isoformat()] for start, end in ranges]).encode()
+        self._replace(path, [payload])
+
+    def delete(self, ticker: str, tick_increment: str):
+        path = self._path(ticker, tick_increment)
+        with self._lock:
+            self._maps.pop(path, None)
+        for stale in (path + COVERAGE_SUFFIX, path):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    def _path(self, ticker: str, tick_increment: str) -> str:
+        return os.path.join(self.root, tick_increment, quote(ticker, safe="") + FILE_SUFFIX)
+
+    def _open(self, path: str) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is None or cached[0] != version:
+                mapped = np.memmap(path, dtype=np.uint8, mode="r")
+                if bytes(mapped[:len(MAGIC)]) != MAGIC:
+                    raise ValueError(f"{path} is not a bar file")
+                cached = (version, mapped)
+                self._maps[path] = cached
+        mapped = cached[1]
+        rows = int(mapped[len(MAGIC):len(MAGIC) + 8].view("<i8")[0])
+        columns, offset = {}, HEADER_SIZE
+        for name, dtype in COLUMNS:
+            size = rows * dtype.itemsize
+            columns[name] = mapped[offset:offset + size].view(dtype)
+            offset += size
+        return columns
+
+    def _write(self, path: str, columns: Dict[str, np.ndarray]):
+        rows = len(columns[df_datetime])
+        header = np.zeros(HEADER_SIZE, dtype=np.uint8)
+        header[:len(MAGIC)] = np.frombuffer(MAGIC, dtype=np.uint8)
+        header[len(MAGIC):len(MAGIC) + 8] = np.array([rows], dtype="<i8").view(np.uint8)
+        self._replace(path, [header.tobytes()] + [np.ascontiguousarray(columns[name], dtype=dtype).tobytes() for name, dtype in COLUMNS])
+
+    @staticmethod
+    def _replace(path: str, chunks: List[bytes]):
+        """Write chunks to a temporary file that atomically replaces path."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    @staticmethod
+    def _to_columns(bars: Any) -> Dict[str, np.ndarray]:
+        """Convert any historical data output format into the file's column dtypes."""
+        if isinstance(bars, dict) and np.asarray(bars.get(df_datetime, [])).dtype.kind == "M":
+            arrays = bars
+        else:
+            frame = bars if isinstance(bars, pd.DataFrame) else pd.DataFrame(bars)
+            if frame.empty:
+                return {name: np.array([], dtype=dtype) for name, dtype in COLUMNS}
+            arrays = bar_frame_to_arrays(standardize_bar_frame(frame))
+        columns = {name: np.asarray(arrays[name]).astype(dtype, copy=False) for name, dtype in COLUMNS if name != df_datetime}
+        columns[df_datetime] = np.asarray(arrays[df_datetime]).astype("datetime64[ns]").view("<i8")
+        return columns
+
+    @staticmethod
+    def _sorted_unique(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Sort by DateTime, keeping the last given bar for a repeated DateTime."""
+        times = columns[df_datetime]
+        if len(times) > 1 and not (np.diff(times) > 0).all():
+            order = np.argsort(times, kind="stable")
+            sorted_times = times[order]
+            keep = np.append(sorted_times[1:] != sorted_times[:-1], True)
+            order = order[keep]
+            columns = {name: values[order] for name, values in columns.items()}
+        return columns
@@ -0,0 +1,217 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from pymongo.write_concern import WriteConcern
+from dbs.db_client import DBClient, SentimentRecord, SENTIMENT_COLUMNS, DEFAULT_UNIVERSE
+from registries.standards.adapter_standards import daily
+
+DEFAULT_MONGO_URI = "mongodb://localhost:27017"
+DEFAULT_DATABASE = "hyper_system"
+DEFAULT_MAX_POOL_SIZE = 50
+# Operations per bulk_write call; keeps each request well under MongoDB's message size limit
+DEFAULT_BULK_BATCH_SIZE = 5000
+
+# Sentiments are recomputed every cycle, so a lost write only costs one cycle's history:
+# acknowledge on the primary without waiting for the journal. Coefficients drive trading, so they
+# wait for a journaled majority.
+SENTIMENT_WRITE_CONCERN = WriteConcern(w=1, j=False)
+COEFFICIENT_WRITE_CONCERN = WriteConcern(w="majority", j=True)
+
+SENTIMENTS_COLLECTION = "sentiments"
+COEFFICIENTS_COLLECTION = "coefficients"
+
+# Every document belongs to a (universe, tick_increment) scope, which leads each index
+SCOPE_KEYS = [("universe", ASCENDING), ("tick_increment", ASCENDING)]
+# Compound indexes matching the ranking queries; the first of each collection is the upsert key
+SENTIMENT_INDEXES = [
+    (SCOPE_KEYS + [("ticker", ASCENDING), ("strategy", ASCENDING), ("timestamp", ASCENDING)], {"unique": True}),  # ticker history
+    (SCOPE_KEYS + [("strategy", ASCENDING), ("timestamp", DESCENDING)], {}),  # one agent's outputs over time
+    (SCOPE_KEYS + [("timestamp", DESCENDING), ("ticker", ASCENDING)], {}),    # a cycle's cross-section
+]
+COEFFICIENT_INDEXES = [
+    (SCOPE_KEYS + [("timestamp", DESCENDING), ("strategy", ASCENDING)], {"unique": True}),
+    (SCOPE_KEYS + [("strategy", ASCENDING), ("timestamp", DESCENDING)], {}),
+]
+
+def _to_utc_datetime(timestamp: Any) -> datetime:
+    """Naive UTC datetime, as MongoDB stores dates."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.to_pydatetime()
+
+class MongoDBClient(DBClient):
+    """
+    MongoDB store for agent sentiments and coefficients, built for writing a whole cycle at once.
+
+    One pooled MongoClient is shared by every thread. Writes go out as unordered bulk_write upserts in
+    batches of bulk_batch_size, so a cycle of tens of thousands of agent outputs is a handful of round
+    trips instead of one per document, and the server can apply each batch's operations in parallel.
+    Sentiments use a relaxed write concern, coefficients a durable one (see the constants above).
+    Documents carry their universe and tick_increment, which lead the upsert keys and every index.
+    The connection and indexes are created lazily on first use.
+    """
+
+    def __init__(
+        self,
+        uri: str = DEFAULT_MONGO_URI,
+        database: str = DEFAULT_DATABASE,
+        max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+        bulk_batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+        sentiment_write_concern: WriteConcern = SENTIMENT_WRITE_CONCERN,
+        coefficient_write_concern: WriteConcern = COEFFICIENT_WRITE_CONCERN,
+        client: Optional[MongoClient] = None,
+    ):
+        """
+        Args:
+            uri (str): MongoDB connection string
+            database (str): Database name
+            max_pool_size (int): Connections kept in the client's pool
+            bulk_batch_size (int): Operations per bulk_write call
+            sentiment_write_concern (WriteConcern): For sentiment upserts
+            coefficient_write_concern (WriteConcern): For coefficient upserts
+            client: An existing MongoClient (or compatible stand-in such as mongomock) to use instead of connecting to uri
+        """
+        if bulk_batch_size < 1:
+            raise ValueError("bulk_batch_size must be at least 1")
+        self.uri = uri
+        self.database_name = database
+        self.max_pool_size = max_pool_size
+        self.bulk_batch_size = bulk_batch_size
+        self.sentiment_write_concern = sentiment_write_concern
+        self.coefficient_write_concern = coefficient_write_concern
+        self._client = client
+        self._owns_client = client is None
+        self._database = None
+        self._lock = threading.Lock()
+
+    def _get_database(self):
+        if self._database is None:
+            with self._lock:
+                if self._database is None:
+                    if self._client is None:
+                        self._client = MongoClient(self.uri, maxPoolSize=self.max_pool_size, retryWrites=True)
+                    database = self._client[self.database_name]
+                    for name, indexes in ((SENTIMENTS_COLLECTION, SENTIMENT_INDEXES), (COEFFICIENTS_COLLECTION, COEFFICIENT_INDEXES)):
+                        for keys, options in indexes:
+                            database[name].create_index(keys, **options)
+                    self._database = database
+        return self._database
+
+    def _sentiments(self, write_concern: Optional[WriteConcern] = None):
+        collection = self._get_database()[SENTIMENTS_COLLECTION]
+        return collection.with_options(write_concern=write_concern) if write_concern is not None else collection
+
+    def _coefficients(self, write_concern: Optional[WriteConcern] = None):
+        collection = self._get_database()[COEFFICIENTS_COLLECTION]
+        return collection.with_options(write_concern=write_concern) if write_concern is not None else collection
+
+    def _bulk_upsert(self, collection, operations: List[UpdateOne]) -> int:
+        for start in range(0, len(operations), self.bulk_batch_size):
+            collection.bulk_write(operations[start:start + self.bulk_batch_size], ordered=False)
+        return len(operations)
+
+    def save_sentiments(
+        self,
+        records: Iterable[SentimentRecord],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        operations = []
+        last_timestamp, last_converted = None, None
+        for ticker, strategy, timestamp, sentiment in records:
+            # A cycle's records share one timestamp; convert it once
+            if timestamp is not last_timestamp:
+                last_timestamp, last_converted = timestamp, _to_utc_datetime(timestamp)
+            operations.append(UpdateOne(
+                {"universe": universe, "tick_increment": tick_increment, "ticker": ticker, "strategy": strategy, "timestamp": last_converted},
+                {"$set": {"sentiment": float(sentiment)}},
+                upsert=True,
+            ))
+        return self._bulk_upsert(self._sentiments(self.sentiment_write_concern), operations) if operations else 0
+
+    def get_sentiments(
+        self,
+        ticker: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> pd.DataFrame:
+        query: Dict[str, Any] = {"universe": universe, "tick_increment": tick_increment}
+        if ticker is not None:
+            query["ticker"] = ticker
+        if strategy is not None:
+            query["strategy"] = strategy
+        if start is not None or end is not None:
+            query["timestamp"] = {}
+            if start is not None:
+                query["timestamp"]["$gte"] = _to_utc_datetime(start)
+            if end is not None:
+                query["timestamp"]["$lte"] = _to_utc_datetime(end)
+        projection = {"_id": False, **{column: True for column in SENTIMENT_COLUMNS}}
+        documents = list(self._sentiments().find(query, projection).sort("timestamp", ASCENDING))
+        return pd.DataFrame(documents, columns=SENTIMENT_COLUMNS)
+
+    def get_latest_sentiments(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, Dict[str, float]]:
+        collection = self._sentiments()
+        scope = {"universe": universe, "tick_increment": tick_increment}
+        timestamp = self._latest_timestamp(collection, scope, as_of)
+        if timestamp is None:
+            return {}
+        latest: Dict[str, Dict[str, float]] = {}
+        for document in collection.find({**scope, "timestamp": timestamp}, {"_id": False, "ticker": True, "strategy": True, "sentiment": True}):
+            latest.setdefault(document["strategy"], {})[document["ticker"]] = document["sentiment"]
+        return latest
+
+    def save_coefficients(
+        self,
+        timestamp: datetime,
+        coefficients: Dict[str, float],
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> int:
+        timestamp = _to_utc_datetime(timestamp)
+        scope = {"universe": universe, "tick_increment": tick_increment}
+        operations = [
+            UpdateOne({**scope, "timestamp": timestamp, "strategy": strategy}, {"$set": {"coefficient": float(coefficient)}}, upsert=True)
+            for strategy, coefficient in coefficients.items()
+        ]
+        return self._bulk_upsert(self._coefficients(self.coefficient_write_concern), operations) if operations else 0
+
+    def get_coefficients(
+        self,
+        as_of: Optional[datetime] = None,
+        universe: str = DEFAULT_UNIVERSE,
+        tick_increment: str = daily,
+    ) -> Dict[str, float]:
+        collection = self._coefficients()
+        scope = {"universe": universe, "tick_increment": tick_increment}
+        timestamp = self._latest_timestamp(collection, scope, as_of)
+        if timestamp is None:
+            return {}
+        return {
+            document["strategy"]: document["coefficient"]
+            for document in collection.find({**scope, "timestamp": timestamp}, {"_id": False, "strategy": True, "coefficient": True})
+        }
+
+    @staticmethod
+    def _latest_timestamp(collection, scope: Dict[str, str], as_of: Optional[datetime]) -> Optional[datetime]:
+        query = dict(scope) if as_of is None else {**scope, "timestamp": {"$lte": _to_utc_datetime(as_of)}}
+        document = collection.find_one(query, {"_id": False, "timestamp": True}, sort=[("timestamp", DESCENDING)])
+        return None if document is None else document["timestamp"]
+
+    def close(self):
+        with self._lock:
+            if self._client is not None and self._owns_client:
+                self._client.close()
+                self._client = None
+            self._database = None
@@ -0,0 +1,29 @@
+import logging
+from typing import Optional
+from clients.log_pushing_client import LogPushingClient
+from dbs.duck_db_client import DuckDBClient
+
+def run_log_pushing_pipeline(
+    db_client: Optional[DuckDBClient] = None,
+    level: int = logging.INFO,
+    logger: Optional[logging.Logger] = None,
+    **client_kwargs,
+) -> LogPushingClient:
+    """
+    Starts shipping log records to the DB in the background.
+
+    A LogPushingClient handler is attached to the logger (the root logger by default), so every
+    record at or above level is queued in memory and written in batches by the client's writer
+    thread; the code doing the logging never waits on the DB. Call close() on the returned client
+    at shutdown to write what is still queued.
+
+    Args:
+        db_client (DuckDBClient): Where the records are written; defaults to the local DuckDB store
+        level (int): Lowest level shipped
+        logger (logging.Logger): Logger to ship from; defaults to the root logger
+        **client_kwargs: Forwarded to LogPushingClient (max_queue, batch_size, flush_interval, ...)
+    """
+    client = LogPushingClient(db_client, **client_kwargs)
+    client.install(logger, level)
+    logging.info(f"Log pushing pipeline: shipping records at level {logging.getLevelName(level)} and above")
+    return client
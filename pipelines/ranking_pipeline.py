@@ -0,0 +1,55 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from clients.ranking_client import RankingClient
+from dbs.duck_db_client import DuckDBClient, DEFAULT_UNIVERSE
+from pipelines.testing_pipeline import run_testing_pipeline
+from registries.standards.adapter_standards import daily
+from registries.standards.client_standards import PERIODS_PER_YEAR, DEFAULT_RANKING_WINDOW
+
+def run_ranking_pipeline(
+    start_date: datetime,
+    end_date: datetime,
+    window: int = DEFAULT_RANKING_WINDOW,
+    tick_increment: str = daily,
+    db_client: Optional[DuckDBClient] = None,
+    universe: str = DEFAULT_UNIVERSE,
+    **testing_kwargs,
+) -> RankingClient:
+    """
+    Builds the agent ranking from recent performance.
+
+    The agents are backtested over the period once (see run_testing_pipeline). Their portfolio
+    returns replace the universe's stored returns at this increment in DuckDB, where the ranking and
+    coefficients are computed in one window-function query (DuckDBClient.rank_agents); the
+    coefficients are saved at the last bar under the same universe and increment.
+    The returned RankingClient is seeded with the last window of returns, so the caller keeps the
+    ranking current by passing each new bar's returns to RankingClient.update, which is O(agents),
+    instead of re-running this pipeline.
+
+    Args:
+        start_date (datetime): First day of history (include indicator warm-up before the window)
+        end_date (datetime): Last day of history
+        window (int): Number of most recent bars the ranking covers
+        tick_increment (str): Bar increment
+        db_client (DuckDBClient): Where returns and coefficients are stored; defaults to the local DuckDB store
+        universe (str): Name the returns and coefficients are stored under
+        **testing_kwargs: Forwarded to run_testing_pipeline (tickers, indicators, cost_bps, ...)
+    """
+    result = run_testing_pipeline(start_date, end_date, tick_increment=tick_increment, **testing_kwargs)
+    periods_per_year = PERIODS_PER_YEAR[tick_increment]
+    db_client = db_client if db_client is not None else DuckDBClient()
+    scope = {"universe": universe, "tick_increment": tick_increment}
+    db_client.save_agent_returns(result.agents, result.datetimes, result.portfolio_returns, replace=True, **scope)
+
+    as_of = result.datetimes[-1] if len(result.datetimes) else None
+    ranking = db_client.rank_agents(window=window, periods_per_year=periods_per_year, as_of=as_of, **scope)
+    if as_of is not None and len(ranking["strategy"]):
+        db_client.save_coefficients(as_of, dict(zip(ranking["strategy"].tolist(), ranking["coefficient"].tolist())), **scope)
+    for agent, sharpe, coefficient in zip(ranking["strategy"], ranking["sharpe"], ranking["coefficient"]):
+        logging.info(f"Ranking pipeline: {agent} sharpe={sharpe:.2f} coefficient={coefficient:.4f}")
+
+    # The window's statistics only depend on the returns inside it
+    ranking_client = RankingClient(result.agents, window=window, periods_per_year=periods_per_year)
+    ranking_client.warm_up(result.portfolio_returns[:, -window:])
+    return ranking_client
@@ -0,0 +1,58 @@
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from clients.testing_client import TestingClient, BacktestResult, DEFAULT_COST_BPS
+from strategies.cross_sectional_engine import BarMatrix, CrossSectionalIndicatorEngine
+from registries.standards.adapter_standards import daily, output_dataframe
+
+def run_testing_pipeline(
+    start_date: datetime,
+    end_date: datetime,
+    tickers: Optional[List[str]] = None,
+    indicators: Optional[Iterable[str]] = None,
+    tick_increment: str = daily,
+    cost_bps: float = DEFAULT_COST_BPS,
+    long_only: bool = True,
+    historical_data_adapter: Optional[HistoricalDataAdapter] = None,
+) -> BacktestResult:
+    """
+    Backtests strategy agents over the universe from the historical store.
+
+    Bars for every ticker are loaded in one batch, aligned into a BarMatrix, every agent's full
+    sentiment history is computed in one cross-sectional pass, and the testing client turns the
+    sentiments into positions and returns.
+
+    Args:
+        start_date (datetime): First day of the backtest (include enough history for indicator warm-up)
+        end_date (datetime): Last day of the backtest
+        tickers (list): Universe; defaults to the registered tickers adapter
+        indicators (iterable): Agents to test; defaults to every indicator the engine supports
+        tick_increment (str): Bar increment
+        cost_bps (float): Cost of trading a full position, in basis points
+        long_only (bool): Ignore bearish sentiment
+        historical_data_adapter: Source of bars; defaults to the registered (cached) adapter
+    """
+    if historical_data_adapter is None or tickers is None:
+        from registries import adapter_registries
+        historical_data_adapter = historical_data_adapter or adapter_registries.historical_data_adapter
+        tickers = tickers if tickers is not None else adapter_registries.tickers_adapter.fetch_tickers()
+
+    historical_data = {}
+    for ticker, data, error in historical_data_adapter.get_historical_data_batch(
+        tickers, start_date, end_date, tick_increment, output_format=output_dataframe
+    ):
+        if error is not None:
+            logging.error(f"Testing pipeline: skipping {ticker}: {error}")
+            continue
+        historical_data[ticker] = data
+
+    # Batches complete in any order; keep the universe order so results are reproducible
+    bars = BarMatrix.from_historical_data({ticker: historical_data[ticker] for ticker in tickers if ticker in historical_data})
+    sentiments = CrossSectionalIndicatorEngine(indicators).run(bars)
+    result = TestingClient(cost_bps=cost_bps, long_only=long_only).run(bars, sentiments, tick_increment)
+
+    for name in TestingClient.rank(result):
+        metrics = result.metrics[name]
+        logging.info(f"Testing pipeline: {name} sharpe={metrics['sharpe']:.2f} total_return={metrics['total_return']:.2%}")
+    return result
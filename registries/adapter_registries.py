@@ -1,17 +1,50 @@
-from adapters.current_price_adapters.yfinance_current_price_adapter import YFinanceCurrentPriceAdapter
-from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
-from adapters.tickers_adapters.wiki_SPY_500_ticker_adapter import WikiSPY500TickerAdapter
-from adapters.market_status_adapters.finnhub_market_status_adapter import FinnhubMarketStatusAdapter
-
-# We can import different adapters but the left side of the variable must remain the same.
-
-current_price_adapter = YFinanceCurrentPriceAdapter()
-historical_data_adapter = TiingoHistoricalDataAdapter()
-tickers_adapter = WikiSPY500TickerAdapter()
-market_status_adapter = FinnhubMarketStatusAdapter()
-
-
-
-
-
-
+from registries.lazy_registry import LazyRegistry
+
+# We can swap the adapters built below but the registered names must remain the same.
+# Adapters are imported and constructed on first use (registries.adapter_registries.<name>), so
+# importing this module does not pull in yfinance, finnhub, requests or config.
+
+adapters = LazyRegistry(entry_point_group="hyper_system.adapters", instantiate=True)
+
+def _market_status_adapter():
+    from adapters.market_status_adapters.calendar_market_status_adapter import CalendarMarketStatusAdapter
+    from adapters.market_status_adapters.finnhub_market_status_adapter import FinnhubMarketStatusAdapter
+    # Market status comes from the local NYSE calendar; Finnhub is only polled in the background to catch unscheduled closures.
+    return CalendarMarketStatusAdapter(reconcile_adapter=FinnhubMarketStatusAdapter())
+
+def _current_price_adapter():
+    from adapters.current_price_adapters.yfinance_current_price_adapter import YFinanceCurrentPriceAdapter
+    from adapters.current_price_adapters.cached_current_price_adapter import CachedCurrentPriceAdapter
+    # Prices are reused for a few seconds while the market is open and until it reopens once it is closed.
+    return CachedCurrentPriceAdapter(YFinanceCurrentPriceAdapter(), adapters.get("market_status_adapter"))
+
+def _historical_data_adapter():
+    from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
+    from adapters.historical_data_adapters.cached_historical_data_adapter import CachedHistoricalDataAdapter
+    from adapters.historical_data_adapters.resampling_historical_data_adapter import ResamplingHistoricalDataAdapter
+    from dbs.memmap_bar_store import MemmapBarStore
+    # Historical bars are served from the local DuckDB store; only missing days go to the wrapped adapter.
+    # Only 1min and daily bars are downloaded; every other timeframe is resampled from them locally.
+    # Array-format requests read memory-mapped bar files, shared through the OS page cache across processes.
+    return ResamplingHistoricalDataAdapter(CachedHistoricalDataAdapter(TiingoHistoricalDataAdapter(), bar_store=MemmapBarStore()))
+
+def _tickers_adapter():
+    from adapters.tickers_adapters.wiki_SPY_500_ticker_adapter import WikiSPY500TickerAdapter
+    from adapters.tickers_adapters.cached_ticker_adapter import CachedTickerAdapter
+    # The universe is scraped at most once a day; dated snapshots are kept in DuckDB for constituent diffs.
+    return CachedTickerAdapter(WikiSPY500TickerAdapter())
+
+adapters.register("market_status_adapter", _market_status_adapter)
+adapters.register("current_price_adapter", _current_price_adapter)
+adapters.register("historical_data_adapter", _historical_data_adapter)
+adapters.register("tickers_adapter", _tickers_adapter)
+
+def __getattr__(name):
+    # Module attribute access (and `from registries.adapter_registries import x`) resolves the adapter
+    try:
+        return adapters.get(name)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+def __dir__():
+    return sorted(set(globals()) | set(adapters.names()))
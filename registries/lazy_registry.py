@@ -0,0 +1,88 @@
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional, Union
+
+def load_target(target: str) -> Any:
+    """Import a 'package.module:attribute' reference (the entry point syntax)."""
+    module_name, _, attribute = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in filter(None, attribute.split(".")):
+        obj = getattr(obj, part)
+    return obj
+
+class LazyRegistry:
+    """
+    Name -> object registry that imports and builds each entry on first use.
+
+    A target is a 'package.module:attribute' reference, imported on first get(), or an object
+    (typically a factory function) registered directly. With instantiate=True the resolved target
+    is called with no arguments and the result is kept, so a registry of adapters only imports and
+    constructs the adapters that are actually used. Results are cached; factories may get() other
+    entries they depend on.
+
+    Installed packages can add entries through the entry_point_group: every entry point in that
+    group is registered under its name (built-in registrations take precedence).
+    """
+
+    def __init__(self, entry_point_group: Optional[str] = None, instantiate: bool = False):
+        self.entry_point_group = entry_point_group
+        self.instantiate = instantiate
+        self._targets: Dict[str, Union[str, Any]] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+
+    def register(self, name: str, target: Union[str, Callable[..., Any], Any]):
+        """Register (or replace) an entry; a resolved object of the same name is dropped."""
+        with self._lock:
+            self._targets[name] = target
+            self._resolved.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Resolve an entry, importing and building it on first use. Raises KeyError for unknown names."""
+        resolved = self._resolved.get(name)
+        if resolved is not None:
+            return resolved
+        with self._lock:
+            if name in self._resolved:
+                return self._resolved[name]
+            self._load_entry_points()
+            if name not in self._targets:
+                raise KeyError(f"Nothing registered under '{name}'. Registered: {sorted(self._targets)}")
+            target = self._targets[name]
+            resolved = load_target(target) if isinstance(target, str) else target
+            if self.instantiate:
+                resolved = resolved()
+            self._resolved[name] = resolved
+            return resolved
+
+    def names(self) -> List[str]:
+        """Registered names, in registration order, without resolving anything."""
+        with self._lock:
+            self._load_entry_points()
+            return list(self._targets)
+
+    def values(self) -> List[Any]:
+        """Every entry resolved, in registration order."""
+        return [self.get(name) for name in self.names()]
+
+    def is_resolved(self, name: str) -> bool:
+        return name in self._resolved
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names()
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        try:
+            discovered = entry_points(group=self.entry_point_group)
+        except Exception as e:
+            logging.error(f"LazyRegistry failed to read entry points for {self.entry_point_group}: {e}")
+            return
+        for entry_point in discovered:
+            # Entry points resolve lazily too; only their module:attribute reference is kept
+            self._targets.setdefault(entry_point.name, entry_point.value)
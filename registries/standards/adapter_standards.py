@@ -19,8 +19,23 @@ df_close = "close"
 df_volume = "volume"
 df_datetime = "DateTime"
 
+# historical data output formats:
+output_records = "records"      # list of dicts (default)
+output_dataframe = "dataframe"  # pandas DataFrame, one column per field
+output_arrays = "arrays"        # dict of contiguous NumPy arrays, one per field
+
 market_open = "open"
 market_closed = "closed"
 market_pre_market = "pre-market"
 
+# API providers, one request scheduler bucket each (per API key)
+provider_tiingo = "tiingo"
+provider_fmp = "fmp"
+provider_finnhub = "finnhub"
+provider_yfinance = "yfinance"
+provider_arkfunds = "arkfunds"
 
+# request priorities, most urgent first
+priority_trading = "trading"
+priority_ranking = "ranking"
+priority_backfill = "backfill"
@@ -0,0 +1,22 @@
+# what functions to be called for each client's pipeline?
+from registries.standards.adapter_standards import (
+    daily, weekly, monthly, annually,
+    intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
+)
+
+# Bars per year for each tick increment (US equities: 252 sessions of 6.5 hours)
+PERIODS_PER_YEAR = {
+    intraday_1min: 252 * 390,
+    intraday_5min: 252 * 78,
+    intraday_10min: 252 * 39,
+    intraday_30min: 252 * 13,
+    intraday_1hour: 252 * 7,
+    daily: 252,
+    weekly: 52,
+    monthly: 12,
+    annually: 1,
+}
+
+# agent ranking: a quarter of daily bars, softmax temperature of the coefficients
+DEFAULT_RANKING_WINDOW = 63
+DEFAULT_TEMPERATURE = 1.0
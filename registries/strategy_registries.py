@@ -1,3 +1,4 @@
+from registries.lazy_registry import LazyRegistry
 from registries.standards.adapter_standards import (
     daily, weekly, monthly, annually,
     intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
@@ -104,6 +105,7 @@ strategy_ideal_number_dataframes = {
     "CDL3BLACKCROWS": 1,
     "CDL3INSIDE": 1,
     "CDL3LINESTRIKE": 1,
+    "CDL3OUTSIDE": 1,
     "CDL3STARSINSOUTH": 1,
     "CDL3WHITESOLDIERS": 1,
     "CDLABANDONEDBABY": 1,
@@ -267,6 +269,7 @@ strategy_ideal_periods = {
     "CDL3BLACKCROWS": daily,
     "CDL3INSIDE": daily,
     "CDL3LINESTRIKE": daily,
+    "CDL3OUTSIDE": daily,
     "CDL3STARSINSOUTH": daily,
     "CDL3WHITESOLDIERS": daily,
     "CDLABANDONEDBABY": daily,
@@ -325,8 +328,13 @@ strategy_ideal_periods = {
     "CDLXSIDEGAP3METHODS": daily,
 }
 
+# populate with the strategy classes we want as agents to run, as 'module:Class' references so they
+# (and TA-Lib/pandas) are only imported when the agents are used. registries.strategy_registries.strategies
+# is the list of classes.
+strategy_classes = LazyRegistry(entry_point_group="hyper_system.strategies")
+strategy_classes.register("chaikin_ad_line", "strategies.talib_strategy:AD_Strategy")
 
-from strategies.talib_strategy import AD_Strategy
-
-# populate with classes of strategies that we want as agents to run
-strategies = [AD_Strategy]
+def __getattr__(name):
+    if name == "strategies":
+        return strategy_classes.values()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
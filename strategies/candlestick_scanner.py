@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import talib
+from strategies.cross_sectional_engine import BarMatrix
+
+# Every TA-Lib candlestick pattern, in TA-Lib's order
+CANDLESTICK_PATTERNS: List[str] = list(talib.get_function_groups()["Pattern Recognition"])
+
+class PatternScan:
+    """
+    Candlestick pattern signals for a universe: an int8 tensor of shape (tickers, bars, patterns).
+
+    A signal is TA-Lib's pattern output divided by 100: 1 bullish, -1 bearish, 0 no pattern, and
+    +-2 for the patterns that report a confirmed signal (CDLHIKKAKE, CDLHIKKAKEMOD).
+    """
+
+    def __init__(self, tickers: List[str], datetimes: np.ndarray, patterns: List[str], signals: np.ndarray):
+        self.tickers = tickers
+        self.datetimes = datetimes
+        self.patterns = patterns
+        self.signals = signals
+        self._pattern_index = {pattern: i for i, pattern in enumerate(patterns)}
+
+    def pattern(self, name: str) -> np.ndarray:
+        """Signals of one pattern, shaped (tickers, bars)."""
+        return self.signals[:, :, self._pattern_index[name]]
+
+    def sentiments(self, patterns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Sentiment matrices (tickers, bars) in [-1, 1] per pattern, in the same form as
+        CrossSectionalIndicatorEngine.run, so pattern agents can be backtested and ranked alongside the indicators.
+        """
+        names = self.patterns if patterns is None else list(patterns)
+        return {name: np.clip(self.pattern(name), -1, 1).astype(np.float64) for name in names}
+
+    def latest_scores(self, patterns: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Each pattern agent's sentiment per ticker on the latest bar."""
+        names = self.patterns if patterns is None else list(patterns)
+        if not self.signals.shape[1]:
+            return {name: dict.fromkeys(self.tickers, 0.0) for name in names}
+        latest = np.clip(self.signals[:, -1, :], -1, 1)
+        return {name: dict(zip(self.tickers, latest[:, self._pattern_index[name]].astype(float).tolist())) for name in names}
+
+    def packbits(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The signals as two bitsets, bullish and bearish, each uint8 of shape (tickers, bars, ceil(patterns / 8)).
+        Bit p (big-endian within each byte, as numpy.packbits) is set when pattern p fired in that direction.
+        """
+        return np.packbits(self.signals > 0, axis=2), np.packbits(self.signals < 0, axis=2)
+
+class CandlestickScanner:
+    """
+    Evaluates every candlestick pattern for every ticker in one pass over aligned OHLC matrices.
+
+    Each ticker's open/high/low/close rows are handed to TA-Lib once per pattern while they are hot
+    in cache, instead of one agent call per (pattern, ticker) re-reading and re-converting the same bars.
+    """
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None):
+        patterns = CANDLESTICK_PATTERNS if patterns is None else list(patterns)
+        unknown = [pattern for pattern in patterns if pattern not in CANDLESTICK_PATTERNS]
+        if unknown:
+            raise ValueError(f"Unknown candlestick patterns: {unknown}")
+        self.patterns = patterns
+        self._functions = [getattr(talib, pattern) for pattern in patterns]
+
+    def scan(self, bars: BarMatrix) -> PatternScan:
+        tickers, length = bars.shape
+        signals = np.empty((tickers, length, len(self.patterns)), dtype=np.int8)
+        # One contiguous row per pattern, transposed into the ticker's (bars, patterns) slab at the end
+        ticker_signals = np.empty((len(self.patterns), length), dtype=np.int8)
+        for i in range(tickers):
+            ohlc = [np.ascontiguousarray(field[i], dtype=np.float64) for field in (bars.open, bars.high, bars.low, bars.close)]
+            for p, function in enumerate(self._functions):
+                np.floor_divide(function(*ohlc), 100, out=ticker_signals[p], casting="unsafe")
+            signals[i] = ticker_signals.T
+        return PatternScan(bars.tickers, bars.datetimes, self.patterns, signals)
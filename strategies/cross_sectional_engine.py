@@ -0,0 +1,163 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from adapters.historical_data_adapters.historical_data_formats import standardize_bar_frame
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+from strategies.indicator_graph import IndicatorGraph, INDICATOR_NODES, Node
+
+class BarMatrix:
+    """
+    OHLCV bars for a universe of tickers aligned on a shared timeline.
+
+    Every field is a float64 matrix of shape (len(tickers), len(datetimes)); row i holds tickers[i].
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        datetimes: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.tickers = list(tickers)
+        self.datetimes = datetimes
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def first_bars(self) -> np.ndarray:
+        """Index of each ticker's first bar on the timeline (0 unless its history starts later)."""
+        return np.argmax(~np.isnan(self.close), axis=1) if self.close.size else np.zeros(len(self.tickers), dtype=np.intp)
+
+    def select(self, rows: np.ndarray, start: int = 0) -> "BarMatrix":
+        """The bars of the tickers at rows, from timeline index start on."""
+        return BarMatrix(
+            [self.tickers[i] for i in rows],
+            self.datetimes[start:],
+            *(field[rows, start:] for field in (self.open, self.high, self.low, self.close, self.volume)),
+        )
+
+    @classmethod
+    def from_historical_data(cls, historical_data: Dict[str, Any]) -> "BarMatrix":
+        """
+        Align per-ticker historical data (any historical data output format) into matrices.
+
+        The timeline is the union of all tickers' DateTimes. A ticker's bars before its first one (a
+        recent listing, say) are NaN, so a short history does not cut the others'; a ticker missing a
+        bar after its first gets a flat bar at its previous close with zero volume. Tickers without
+        any data are left out.
+        """
+        frames = {}
+        for ticker, data in historical_data.items():
+            frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+            if frame.empty:
+                logging.warning(f"BarMatrix: no historical data for {ticker}, leaving it out")
+                continue
+            frame = standardize_bar_frame(frame).drop_duplicates(subset=df_datetime, keep="last")
+            if frame.empty:
+                logging.warning(f"BarMatrix: no valid bars for {ticker}, leaving it out")
+                continue
+            frames[ticker] = frame.set_index(df_datetime)
+
+        if not frames:
+            empty = np.empty((0, 0))
+            return cls([], np.array([], dtype="datetime64[ns]"), empty, empty, empty, empty, empty)
+
+        timeline = pd.DatetimeIndex(sorted(set().union(*(frame.index for frame in frames.values()))))
+
+        fields = {col: np.empty((len(frames), len(timeline))) for col in (df_open, df_high, df_low, df_close, df_volume)}
+        for i, frame in enumerate(frames.values()):
+            frame = frame.reindex(timeline)
+            close = frame[df_close].ffill()
+            fields[df_close][i] = close.to_numpy()
+            for col in (df_open, df_high, df_low):
+                fields[col][i] = frame[col].fillna(close).to_numpy()
+            fields[df_volume][i] = frame[df_volume].fillna(0).where(close.notna()).to_numpy()
+
+        return cls(
+            list(frames),
+            timeline.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]"),
+            fields[df_open],
+            fields[df_high],
+            fields[df_low],
+            fields[df_close],
+            fields[df_volume],
+        )
+
+# Indicators the engine can evaluate, keyed by their strategy registry name
+INDICATORS: Dict[str, Node] = INDICATOR_NODES
+
+class CrossSectionalIndicatorEngine:
+    """
+    Evaluates a set of indicators for every ticker in one pass over aligned OHLCV matrices.
+
+    Instead of one strategy call per (indicator, ticker), each indicator runs once over the whole
+    universe and returns a sentiment matrix of shape (tickers, time) with values in [-1, 1] and NaN
+    while the indicator is still warming up.
+    """
+
+    def __init__(self, indicators: Optional[Iterable[str]] = None):
+        indicators = list(INDICATORS) if indicators is None else list(indicators)
+        # Raises ValueError for unknown indicators
+        self.graph = IndicatorGraph.compile(indicators)
+        self.indicators = indicators
+
+    @classmethod
+    def for_strategies(cls, strategies: Iterable[Any]) -> "CrossSectionalIndicatorEngine":
+        """
+        Build an engine for the indicators behind a list of strategy agents (e.g. strategy_registries.strategies).
+        Agents keep their own outputs keyed by get_strategy_name(); indicators the graph does not implement are skipped.
+        """
+        names = []
+        for strategy in strategies:
+            name = (strategy() if isinstance(strategy, type) else strategy).get_strategy_name()
+            if name not in INDICATORS:
+                logging.warning(f"CrossSectionalIndicatorEngine: no vectorized indicator for strategy {name}, skipping")
+            elif name not in names:
+                names.append(name)
+        return cls(names)
+
+    def run(self, bars: BarMatrix) -> Dict[str, np.ndarray]:
+        """
+        Compute the sentiment matrix of every configured indicator.
+        Intermediates shared by several indicators (true range, moving averages, ...) are computed once.
+        Returns:
+            Dict[str, np.ndarray]: indicator name -> sentiment matrix aligned with bars.tickers and bars.datetimes.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            starts = bars.first_bars()
+            if not starts.any():
+                outputs = self.graph.evaluate(bars)
+                return {name: np.clip(outputs[name], -1, 1) for name in self.indicators}
+
+            # Tickers whose history starts later are evaluated from their first bar, grouped by that bar,
+            # so their warm-up starts there; before it their sentiments are NaN
+            sentiments = {name: np.full(bars.shape, np.nan) for name in self.indicators}
+            for start in np.unique(starts):
+                rows = np.flatnonzero(starts == start)
+                outputs = self.graph.evaluate(bars.select(rows, start))
+                for name in self.indicators:
+                    sentiments[name][rows, start:] = np.clip(outputs[name], -1, 1)
+            return sentiments
+
+    @staticmethod
+    def latest_scores(bars: BarMatrix, sentiments: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """
+        Reduce sentiment matrices to each ticker's score on the latest bar, like run_strategy would return.
+        Scores that are undefined (not enough history) are reported as 0, the neutral sentiment.
+        """
+        scores = {}
+        for name, matrix in sentiments.items():
+            latest = np.nan_to_num(matrix[:, -1]) if matrix.shape[1] else np.zeros(len(bars.tickers))
+            scores[name] = dict(zip(bars.tickers, latest.tolist()))
+        return scores
@@ -0,0 +1,232 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Dict
+import numpy as np
+import pandas as pd
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume
+
+# Streaming indicator state.
+# Each indicator consumes one bar at a time in O(1) and reproduces the TA-Lib function of the same
+# name with its default parameters: update() returns the value TA-Lib would report for that bar,
+# or NaN while the indicator is still warming up.
+
+class IncrementalIndicator(ABC):
+    """
+    Rolling state for one indicator on one price series.
+    """
+
+    value: float = math.nan
+
+    @abstractmethod
+    def update(self, bar: Dict[str, float]) -> float:
+        """
+        Adds one bar and returns the indicator value for it.
+
+        Args:
+            bar (dict): One bar with the standard open/high/low/close/volume keys
+        """
+        pass
+
+    def warm_up(self, historical_data) -> float:
+        """
+        Feeds every bar of a history (any historical data output format) in order.
+        Returns the value for the last bar.
+        """
+        if isinstance(historical_data, list):
+            historical_data = pd.DataFrame(historical_data)
+        columns = [col for col in (df_open, df_high, df_low, df_close, df_volume) if col in historical_data]
+        arrays = [np.asarray(historical_data[col], dtype=np.float64) for col in columns]
+        for values in zip(*arrays):
+            self.update(dict(zip(columns, values)))
+        return self.value
+
+class IncrementalAverage:
+    """
+    Recursive average on a plain value stream: seeded with the mean of the first timeperiod values
+    after skipping `skip` values, then smoothed with alpha (EMA: 2 / (n + 1), Wilder: 1 / n).
+    """
+
+    def __init__(self, timeperiod: int, alpha: float, skip: int = 0):
+        self.timeperiod = timeperiod
+        self.alpha = alpha
+        self.skip = skip
+        self.value = math.nan
+        self._seed_total = 0.0
+        self._seen = 0
+
+    def update(self, x: float) -> float:
+        if self._seen < self.skip:
+            self._seen += 1
+            return math.nan
+        if self._seen < self.skip + self.timeperiod:
+            self._seen += 1
+            self._seed_total += x
+            if self._seen == self.skip + self.timeperiod:
+                self.value = self._seed_total / self.timeperiod
+            return self.value
+        self.value += self.alpha * (x - self.value)
+        return self.value
+
+class IncrementalAD(IncrementalIndicator):
+    """Chaikin Accumulation/Distribution line."""
+
+    def __init__(self):
+        self.value = math.nan
+        self._total = 0.0
+
+    def update(self, bar):
+        high, low, close = bar[df_high], bar[df_low], bar[df_close]
+        if high > low:
+            self._total += ((close - low) - (high - close)) / (high - low) * bar[df_volume]
+        self.value = self._total
+        return self.value
+
+class IncrementalOBV(IncrementalIndicator):
+    """On-Balance Volume."""
+
+    def __init__(self):
+        self.value = math.nan
+        self._previous_close = math.nan
+
+    def update(self, bar):
+        close, volume = bar[df_close], bar[df_volume]
+        if math.isnan(self.value):
+            self.value = volume
+        elif close > self._previous_close:
+            self.value += volume
+        elif close < self._previous_close:
+            self.value -= volume
+        self._previous_close = close
+        return self.value
+
+class IncrementalEMA(IncrementalIndicator):
+    """Exponential moving average of the close."""
+
+    def __init__(self, timeperiod: int = 30):
+        self._average = IncrementalAverage(timeperiod, 2.0 / (timeperiod + 1))
+        self.value = math.nan
+
+    def update(self, bar):
+        self.value = self._average.update(bar[df_close])
+        return self.value
+
+class IncrementalRSI(IncrementalIndicator):
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, timeperiod: int = 14):
+        self._gain = IncrementalAverage(timeperiod, 1.0 / timeperiod)
+        self._loss = IncrementalAverage(timeperiod, 1.0 / timeperiod)
+        self._previous_close = math.nan
+        self.value = math.nan
+
+    def update(self, bar):
+        close = bar[df_close]
+        if not math.isnan(self._previous_close):
+            change = close - self._previous_close
+            gain = self._gain.update(max(change, 0.0))
+            loss = self._loss.update(max(-change, 0.0))
+            if not math.isnan(gain):
+                self.value = 100 * gain / (gain + loss) if gain + loss else 0.0
+        self._previous_close = close
+        return self.value
+
+class IncrementalATR(IncrementalIndicator):
+    """Average True Range with Wilder smoothing."""
+
+    def __init__(self, timeperiod: int = 14):
+        self._average = IncrementalAverage(timeperiod, 1.0 / timeperiod)
+        self._previous_close = math.nan
+        self.value = math.nan
+
+    def update(self, bar):
+        high, low, close = bar[df_high], bar[df_low], bar[df_close]
+        if not math.isnan(self._previous_close):
+            true_range = max(high - low, abs(high - self._previous_close), abs(low - self._previous_close))
+            self.value = self._average.update(true_range)
+        self._previous_close = close
+        return self.value
+
+class IncrementalMACD(IncrementalIndicator):
+    """
+    MACD line, signal and histogram. update() returns the MACD line; signal and histogram are attributes.
+    Like TA-Lib, the fast EMA starts late so both EMAs begin on the same bar, and nothing is reported
+    until the signal line is defined.
+    """
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        self._fast = IncrementalAverage(fastperiod, 2.0 / (fastperiod + 1), skip=slowperiod - fastperiod)
+        self._slow = IncrementalAverage(slowperiod, 2.0 / (slowperiod + 1))
+        self._signal = IncrementalAverage(signalperiod, 2.0 / (signalperiod + 1))
+        self.value = self.signal = self.histogram = math.nan
+
+    def update(self, bar):
+        close = bar[df_close]
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if math.isnan(slow):
+            return self.value
+        line = fast - slow
+        signal = self._signal.update(line)
+        if not math.isnan(signal):
+            self.value, self.signal, self.histogram = line, signal, line - signal
+        return self.value
+
+class IncrementalSAR(IncrementalIndicator):
+    """
+    Parabolic SAR, following TA-Lib's algorithm: the initial direction comes from the -DM of the first
+    two bars, and the SAR never moves inside the current or previous bar's range.
+    """
+
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        self.acceleration = acceleration
+        self.maximum = maximum
+        self.value = math.nan
+        self._af = min(acceleration, maximum)
+        self._is_long = True
+        self._sar = self._ep = math.nan
+        self._high = self._low = math.nan
+        self._bars = 0
+
+    def update(self, bar):
+        high, low = bar[df_high], bar[df_low]
+        self._bars += 1
+        if self._bars == 1:
+            self._high, self._low = high, low
+            return self.value
+        if self._bars == 2:
+            down, up = self._low - low, high - self._high
+            self._is_long = not (down > 0 and up < down)
+            self._sar, self._ep = (self._low, high) if self._is_long else (self._high, low)
+            self._high, self._low = high, low
+
+        previous_high, previous_low = self._high, self._low
+        self._high, self._low = high, low
+        if self._is_long:
+            if low <= self._sar:
+                # Reverse to short: the SAR jumps to the extreme point
+                self._is_long = False
+                self.value = max(self._ep, previous_high, high)
+                self._af = self.acceleration
+                self._ep = low
+                self._sar = max(self.value + self._af * (self._ep - self.value), previous_high, high)
+            else:
+                self.value = self._sar
+                if high > self._ep:
+                    self._ep = high
+                    self._af = min(self._af + self.acceleration, self.maximum)
+                self._sar = min(self._sar + self._af * (self._ep - self._sar), previous_low, low)
+        else:
+            if high >= self._sar:
+                # Reverse to long
+                self._is_long = True
+                self.value = min(self._ep, previous_low, low)
+                self._af = self.acceleration
+                self._ep = high
+                self._sar = min(self.value + self._af * (self._ep - self.value), previous_low, low)
+            else:
+                self.value = self._sar
+                if low < self._ep:
+                    self._ep = low
+                    self._af = min(self._af + self.acceleration, self.maximum)
+                self._sar = max(self._sar + self._af * (self._ep - self._sar), previous_high, high)
+        return self.value
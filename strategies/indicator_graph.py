@@ -0,0 +1,249 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+import numpy as np
+from strategies import indicator_kernels as kernels
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume
+
+@dataclass(frozen=True)
+class Node:
+    """
+    One step of the indicator graph: an operation, its parameters and its input nodes.
+
+    Nodes compare and hash by value, so two indicators that build the same sub-expression
+    (for example the 14-period true range) end up referencing one node that is computed once.
+    """
+    op: str
+    params: Tuple[Any, ...] = ()
+    inputs: Tuple["Node", ...] = ()
+
+# op name -> function(bars, *input values, *params) returning a (tickers, time) matrix
+OPS: Dict[str, Callable[..., np.ndarray]] = {
+    "field": lambda bars, name: getattr(bars, name),
+    "shift": kernels.shift,
+    "running_total": kernels.running_total,
+    "running_gaps": kernels.running_gaps,
+    "window_mean": kernels.window_mean,
+    "ema": kernels.ema,
+    "ema_alpha": lambda values, timeperiod, alpha, start: kernels.recursive_average(values, timeperiod, alpha, start),
+    "wilder": kernels.wilder,
+    "wilder_sum": kernels.wilder_sum,
+    "rolling_max": kernels.rolling_max,
+    "rolling_min": kernels.rolling_min,
+    "rolling_std": kernels.rolling_std,
+    "true_range": kernels.true_range,
+    "plus_dm": kernels.plus_dm,
+    "minus_dm": kernels.minus_dm,
+    "ad": kernels.ad,
+    "obv": kernels.obv,
+    "gain": lambda values: np.where(values > 0, values, 0.0),
+    "loss": lambda values: np.where(values < 0, -values, 0.0),
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+    "div": kernels.safe_divide,
+    "abs": np.abs,
+    "sign": np.sign,
+    "mean": lambda left, right: (left + right) / 2,
+    "affine": lambda values, scale, offset: values * scale + offset,
+    "pct_change": kernels.pct_change,
+    "mask_before": lambda values, periods: np.concatenate([np.full_like(values[:, :periods], np.nan), values[:, periods:]], axis=1),
+}
+
+# ---- Node builders ----
+# Field ops receive the bars object itself, every other op receives its evaluated inputs.
+
+def _field(name: str) -> Node:
+    return Node("field", (name,))
+
+OPEN, HIGH, LOW, CLOSE, VOLUME = (_field(name) for name in (df_open, df_high, df_low, df_close, df_volume))
+
+def _op(op: str, *inputs: Node, params: Tuple[Any, ...] = ()) -> Node:
+    return Node(op, params, inputs)
+
+def _sub(left: Node, right: Node) -> Node:
+    return _op("sub", left, right)
+
+def _div(numerator: Node, denominator: Node) -> Node:
+    return _op("div", numerator, denominator)
+
+def _affine(values: Node, scale: float, offset: float = 0.0) -> Node:
+    return _op("affine", values, params=(scale, offset))
+
+def _sma(values: Node, timeperiod: int) -> Node:
+    # Every window length over the same series reads one pair of running totals
+    return _op("window_mean", _op("running_total", values), _op("running_gaps", values), params=(timeperiod,))
+
+def _ema(values: Node, timeperiod: int, start: int = 0) -> Node:
+    return _op("ema", values, params=(timeperiod, start))
+
+def _shift(values: Node, periods: int) -> Node:
+    return _op("shift", values, params=(periods,))
+
+def _distance_from(average: Node) -> Node:
+    """Close above (bullish) or below (bearish) an average, relative to the average."""
+    return _div(_sub(CLOSE, average), average)
+
+def _falling(values: Node) -> Node:
+    """Bullish when the series falls: negative relative change."""
+    return _affine(_op("pct_change", values), -1.0)
+
+def _trima(values: Node, timeperiod: int) -> Node:
+    # TA-Lib's triangular average is an SMA of an SMA
+    if timeperiod % 2 == 0:
+        return _sma(_sma(values, timeperiod // 2), timeperiod // 2 + 1)
+    return _sma(_sma(values, (timeperiod + 1) // 2), (timeperiod + 1) // 2)
+
+def _macd_histogram(fast: Node, slow: Node, signal_average: Callable[[Node], Node]) -> Node:
+    line = _sub(fast, slow)
+    return _sub(line, signal_average(line))
+
+# Shared intermediates
+TRUE_RANGE = _op("true_range", HIGH, LOW, CLOSE)
+ATR_14 = _op("wilder", TRUE_RANGE, params=(14, 1))
+CLOSE_CHANGE = _sub(CLOSE, _shift(CLOSE, 1))
+MOMENTUM_10 = _div(_sub(CLOSE, _shift(CLOSE, 10)), _shift(CLOSE, 10))
+
+AVERAGE_GAIN_14 = _op("wilder", _op("gain", CLOSE_CHANGE), params=(14, 1))
+AVERAGE_LOSS_14 = _op("wilder", _op("loss", CLOSE_CHANGE), params=(14, 1))
+RSI_14 = _affine(_div(AVERAGE_GAIN_14, _op("add", AVERAGE_GAIN_14, AVERAGE_LOSS_14)), 100.0)
+
+HIGHEST_HIGH_14 = _op("rolling_max", HIGH, params=(14,))
+LOWEST_LOW_14 = _op("rolling_min", LOW, params=(14,))
+WILLR_14 = _affine(_div(_sub(HIGHEST_HIGH_14, CLOSE), _sub(HIGHEST_HIGH_14, LOWEST_LOW_14)), -100.0)
+
+SUM_TRUE_RANGE_14 = _op("wilder_sum", TRUE_RANGE, params=(14, 1))
+PLUS_DI_14 = _op("mask_before", _affine(_div(_op("wilder_sum", _op("plus_dm", HIGH, LOW), params=(14, 1)), SUM_TRUE_RANGE_14), 100.0), params=(14,))
+MINUS_DI_14 = _op("mask_before", _affine(_div(_op("wilder_sum", _op("minus_dm", HIGH, LOW), params=(14, 1)), SUM_TRUE_RANGE_14), 100.0), params=(14,))
+DI_SPREAD_14 = _sub(PLUS_DI_14, MINUS_DI_14)
+DI_DIRECTION_14 = _op("sign", DI_SPREAD_14)
+DX_14 = _affine(_div(_op("abs", DI_SPREAD_14), _op("add", PLUS_DI_14, MINUS_DI_14)), 100.0)
+ADX_14 = _op("wilder", DX_14, params=(14, 14))
+ADXR_14 = _op("mean", ADX_14, _shift(ADX_14, 13))
+
+CLOSE_TOTAL = _op("running_total", CLOSE)
+SMA_20 = _sma(CLOSE, 20)
+SMA_30 = _sma(CLOSE, 30)
+
+# Indicators the graph can compute, keyed by their strategy registry name.
+# Each output node is the indicator's sentiment; the engine clips it to [-1, 1].
+INDICATOR_NODES: Dict[str, Node] = {
+    # Volume: relative change of the line (chaikin_ad_line matches AD_Strategy)
+    "chaikin_ad_line": _op("pct_change", _op("ad", HIGH, LOW, CLOSE, VOLUME)),
+    "OBV": _op("pct_change", _op("obv", CLOSE, VOLUME)),
+
+    # Trend & directional: +DI bullish, -DI bearish, DX/ADX/ADXR signed by the dominant direction
+    "PLUS_DI": _affine(PLUS_DI_14, 0.01),
+    "MINUS_DI": _affine(MINUS_DI_14, -0.01),
+    "DX": _affine(_op("mul", DI_DIRECTION_14, DX_14), 0.01),
+    "ADX": _affine(_op("mul", DI_DIRECTION_14, ADX_14), 0.01),
+    "ADXR": _affine(_op("mul", DI_DIRECTION_14, ADXR_14), 0.01),
+
+    # Oscillators / momentum: momentum is trend-following, bounded oscillators are mean-reverting
+    "BOP": _div(_sub(CLOSE, OPEN), _sub(HIGH, LOW)),
+    "MOM": MOMENTUM_10,
+    "ROC": MOMENTUM_10,
+    "RSI": _affine(RSI_14, -1 / 50, 1.0),
+    "WILLR": _affine(WILLR_14, -1 / 50, -1.0),
+
+    # Volatility: falling volatility is bullish; BBANDS is mean reversion between the bands
+    "ATR": _falling(ATR_14),
+    "NATR": _falling(_div(ATR_14, CLOSE)),
+    "TRANGE": _falling(TRUE_RANGE),
+    "BBANDS": _div(_sub(SMA_20, CLOSE), _affine(_op("rolling_std", CLOSE, params=(20,)), 2.0)),
+
+    # Moving averages: distance of the close from the average
+    "SMA": _distance_from(SMA_30),
+    "MA": _distance_from(SMA_30),
+    "EMA": _distance_from(_ema(CLOSE, 30)),
+    "TRIMA": _distance_from(_trima(CLOSE, 30)),
+
+    # MACD family: histogram relative to the close. TA-Lib starts the fast EMA late so both
+    # lines begin on the same bar; MACDFIX uses fixed 0.15 / 0.075 smoothing; MACDEXT defaults to SMAs.
+    "MACD": _div(_macd_histogram(
+        _ema(CLOSE, 12, start=14), _ema(CLOSE, 26), lambda line: _ema(line, 9, start=25)
+    ), CLOSE),
+    "MACDFIX": _div(_macd_histogram(
+        _op("ema_alpha", CLOSE, params=(12, 0.15, 14)), _op("ema_alpha", CLOSE, params=(26, 0.075, 0)),
+        lambda line: _ema(line, 9, start=25)
+    ), CLOSE),
+    "MACDEXT": _div(_macd_histogram(_sma(CLOSE, 12), _sma(CLOSE, 26), lambda line: _sma(line, 9)), CLOSE),
+}
+
+class IndicatorGraph:
+    """
+    A compiled dependency graph for a set of indicators.
+
+    Compiling collects every node the requested indicators depend on, removes duplicates and orders
+    them so each node runs after its inputs. Evaluating runs every node exactly once per BarMatrix,
+    fans shared intermediates out to all indicators that use them and frees each intermediate as
+    soon as its last consumer has run.
+    """
+
+    def __init__(self, outputs: Dict[str, Node]):
+        self.outputs = dict(outputs)
+        self.order: List[Node] = []
+        self._consumers: Dict[Node, int] = {}
+        visited = set()
+        for node in self.outputs.values():
+            self._visit(node, visited)
+
+    @classmethod
+    def compile(cls, indicators: Iterable[str]) -> "IndicatorGraph":
+        indicators = list(indicators)
+        unknown = [name for name in indicators if name not in INDICATOR_NODES]
+        if unknown:
+            raise ValueError(f"Unsupported indicators {unknown}. Must be among {sorted(INDICATOR_NODES)}.")
+        return cls({name: INDICATOR_NODES[name] for name in indicators})
+
+    def _visit(self, node: Node, visited: set):
+        # Iterative post-order DFS so every node lands after all of its inputs
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                self.order.append(current)
+                continue
+            if current in visited:
+                continue
+            visited.add(current)
+            stack.append((current, True))
+            for child in current.inputs:
+                self._consumers[child] = self._consumers.get(child, 0) + 1
+                stack.append((child, False))
+
+    def shared_nodes(self) -> Dict[Node, List[str]]:
+        """Intermediates used by more than one indicator, with the indicators that use them."""
+        users: Dict[Node, List[str]] = {}
+        for name, output in self.outputs.items():
+            for node in self._ancestors(output):
+                users.setdefault(node, []).append(name)
+        return {node: names for node, names in users.items() if len(names) > 1 and node.op != "field"}
+
+    def _ancestors(self, node: Node) -> set:
+        seen, stack = set(), [node]
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(current.inputs)
+        return seen
+
+    def evaluate(self, bars) -> Dict[str, np.ndarray]:
+        """
+        Compute every output for the given BarMatrix.
+        Returns:
+            Dict[str, np.ndarray]: indicator name -> unclipped sentiment matrix.
+        """
+        output_nodes = set(self.outputs.values())
+        remaining = dict(self._consumers)
+        values: Dict[Node, np.ndarray] = {}
+        for node in self.order:
+            if node.op == "field":
+                values[node] = OPS["field"](bars, *node.params)
+            else:
+                values[node] = OPS[node.op](*(values[child] for child in node.inputs), *node.params)
+            for child in node.inputs:
+                remaining[child] -= 1
+                if remaining[child] == 0 and child not in output_nodes:
+                    del values[child]
+        return {name: values[node] for name, node in self.outputs.items()}
@@ -0,0 +1,127 @@
+import numpy as np
+
+# Vectorized indicator kernels.
+# Every kernel takes float64 matrices of shape (tickers, time), works along the time axis for all
+# tickers at once and marks undefined (warm-up) values as NaN. With TA-Lib's default parameters the
+# composed kernels reproduce the TA-Lib functions of the same name.
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.full_like(values, np.nan)
+    if periods < values.shape[1]:
+        shifted[:, periods:] = values[:, :values.shape[1] - periods]
+    return shifted
+
+def running_total(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum along time with NaNs counted as 0; any window's sum is a difference of two totals."""
+    return np.cumsum(np.where(np.isnan(values), 0.0, values), axis=1)
+
+def running_gaps(values: np.ndarray) -> np.ndarray:
+    """Cumulative count of NaNs along time, so windows that include a NaN can be told apart."""
+    return np.cumsum(np.isnan(values), axis=1)
+
+def window_mean(totals: np.ndarray, gaps: np.ndarray, timeperiod: int) -> np.ndarray:
+    """Trailing mean read off running_total / running_gaps; windows that include a NaN are NaN."""
+    out = np.full(totals.shape, np.nan)
+    if totals.shape[1] < timeperiod:
+        return out
+    window_totals = totals[:, timeperiod - 1:].copy()
+    window_totals[:, 1:] -= totals[:, :-timeperiod]
+    window_gaps = gaps[:, timeperiod - 1:].copy()
+    window_gaps[:, 1:] -= gaps[:, :-timeperiod]
+    out[:, timeperiod - 1:] = np.where(window_gaps == 0, window_totals / timeperiod, np.nan)
+    return out
+
+def sma(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    """Simple moving average; windows that include a NaN are NaN."""
+    return window_mean(running_total(values), running_gaps(values), timeperiod)
+
+def recursive_average(values: np.ndarray, timeperiod: int, alpha: float, start: int = 0) -> np.ndarray:
+    """EMA-style smoothing seeded with the simple mean of the first timeperiod values from start."""
+    out = np.full_like(values, np.nan)
+    seed = start + timeperiod - 1
+    if values.shape[1] <= seed:
+        return out
+    out[:, seed] = values[:, start:seed + 1].mean(axis=1)
+    for t in range(seed + 1, values.shape[1]):
+        out[:, t] = out[:, t - 1] + alpha * (values[:, t] - out[:, t - 1])
+    return out
+
+def ema(values: np.ndarray, timeperiod: int, start: int = 0) -> np.ndarray:
+    return recursive_average(values, timeperiod, 2.0 / (timeperiod + 1), start)
+
+def wilder(values: np.ndarray, timeperiod: int, start: int = 0) -> np.ndarray:
+    """Wilder's smoothed average (RSI, ATR, ADX)."""
+    return recursive_average(values, timeperiod, 1.0 / timeperiod, start)
+
+def wilder_sum(values: np.ndarray, timeperiod: int, start: int = 0) -> np.ndarray:
+    """Wilder's smoothed running sum seeded with timeperiod - 1 values (directional movement)."""
+    out = np.full_like(values, np.nan)
+    seed = start + timeperiod - 2
+    if values.shape[1] <= seed:
+        return out
+    out[:, seed] = values[:, start:seed + 1].sum(axis=1)
+    for t in range(seed + 1, values.shape[1]):
+        out[:, t] = out[:, t - 1] - out[:, t - 1] / timeperiod + values[:, t]
+    return out
+
+def rolling_max(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    out = np.full_like(values, np.nan)
+    if values.shape[1] >= timeperiod:
+        windows = np.lib.stride_tricks.sliding_window_view(values, timeperiod, axis=1)
+        out[:, timeperiod - 1:] = windows.max(axis=2)
+    return out
+
+def rolling_min(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    out = np.full_like(values, np.nan)
+    if values.shape[1] >= timeperiod:
+        windows = np.lib.stride_tricks.sliding_window_view(values, timeperiod, axis=1)
+        out[:, timeperiod - 1:] = windows.min(axis=2)
+    return out
+
+def rolling_std(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    """Population standard deviation over the trailing window, as TA-Lib STDDEV and BBANDS use."""
+    out = np.full_like(values, np.nan)
+    if values.shape[1] >= timeperiod:
+        windows = np.lib.stride_tricks.sliding_window_view(values, timeperiod, axis=1)
+        out[:, timeperiod - 1:] = windows.std(axis=2)
+    return out
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator with 0 wherever the denominator is 0 (NaN stays NaN)."""
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return np.where(np.isnan(numerator) | np.isnan(denominator), np.nan, out)
+
+def pct_change(values: np.ndarray) -> np.ndarray:
+    """Change from the previous value relative to its magnitude, as AD_Strategy scores the A/D line."""
+    previous = shift(values, 1)
+    return safe_divide(values - previous, np.abs(previous))
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    previous_close = shift(close, 1)
+    out = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    out[:, :1] = np.nan
+    return out
+
+def plus_dm(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Single-bar +DM: the up move when it exceeds the down move and is positive."""
+    up = high - shift(high, 1)
+    down = shift(low, 1) - low
+    return np.where(np.isnan(up), np.nan, np.where((up > down) & (up > 0), up, 0.0))
+
+def minus_dm(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Single-bar -DM: the down move when it exceeds the up move and is positive."""
+    up = high - shift(high, 1)
+    down = shift(low, 1) - low
+    return np.where(np.isnan(down), np.nan, np.where((down > up) & (down > 0), down, 0.0))
+
+def ad(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Chaikin Accumulation/Distribution line."""
+    clv = safe_divide((close - low) - (high - close), high - low)
+    return np.cumsum(clv * volume, axis=1)
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-Balance Volume."""
+    direction = np.sign(np.diff(close, axis=1))
+    steps = np.concatenate([volume[:, :1], direction * volume[:, 1:]], axis=1)
+    return np.cumsum(steps, axis=1)
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
-from typing import Union, Literal
+from typing import Dict, Union, Literal
+from clients.metrics_client import instrument, kind_strategy
 from registries.standards.adapter_standards import (
     daily, weekly, monthly, annually,
     intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour,
@@ -16,6 +18,10 @@ class Strategy(ABC):
     2. run_strategy: Takes historical data and current price, returns sentiment score
     3. get_ideal_period: Returns the ideal timeframe for the strategy
     """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument(cls, kind_strategy)
     
     @abstractmethod
     def get_strategy_name(self) -> str:
@@ -95,19 +101,72 @@ class Strategy(ABC):
             return False
         return True
     
-    def validate_historical_data(self, data: pd.DataFrame) -> bool:
+    def validate_historical_data(self, data: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> bool:
         """
         Validates that the historical data contains all required columns.
         
         Args:
-            data (pd.DataFrame): Historical data to validate
+            data (pd.DataFrame or dict of arrays): Historical data to validate
             
         Raises:
             ValueError: If required columns are missing
         """
         required_columns = {df_datetime, df_open, df_high, df_low, df_close, df_volume}
-        missing_columns = required_columns - set(data.columns)
+        columns = data.keys() if isinstance(data, dict) else data.columns
+        missing_columns = required_columns - set(columns)
         if missing_columns:
             return False
         return True
 
+    def get_price_arrays(self, historical_data) -> Dict[str, np.ndarray]:
+        """
+        Returns the open, high, low, close and volume columns as float64 NumPy arrays, ready for TA-Lib.
+        
+        Accepts every historical data output format: a list of dicts, a DataFrame or a dict of arrays.
+        Columns that are already float64 (the columnar formats' prices) are returned without copying,
+        and the input is never modified.
+        
+        Args:
+            historical_data: Historical price data in any historical data output format
+            
+        Returns:
+            Dict[str, np.ndarray]: One float64 array per OHLCV column
+        """
+        if isinstance(historical_data, list):
+            historical_data = pd.DataFrame(historical_data)
+        return {
+            col: np.asarray(historical_data[col], dtype=np.float64)
+            for col in (df_open, df_high, df_low, df_close, df_volume)
+        }
+
+
+class IncrementalStrategy(Strategy):
+    """
+    A strategy that can keep rolling indicator state instead of recomputing its full history.
+
+    warm_up seeds the state for a ticker once from its history; every following bar is fed to update,
+    which costs O(1). Both return the same sentiment run_strategy would return for the same bars.
+    State is kept per ticker, so one agent instance can stream the whole universe.
+    """
+
+    @abstractmethod
+    def warm_up(self, historical_data, ticker: str = None) -> float:
+        """
+        Resets the ticker's state from its historical data and returns the sentiment for the last bar.
+        
+        Args:
+            historical_data: Historical price data in any historical data output format
+            ticker (str): Ticker the state belongs to (None for single-series use)
+        """
+        pass
+
+    @abstractmethod
+    def update(self, bar: Dict[str, float], ticker: str = None) -> float:
+        """
+        Adds one new bar to the ticker's state and returns the updated sentiment.
+        
+        Args:
+            bar (dict): One bar with the standard DateTime/open/high/low/close/volume keys
+            ticker (str): Ticker the bar belongs to (None for single-series use)
+        """
+        pass
@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from strategies.strategy import Strategy
+from registries.standards.adapter_standards import df_close, df_datetime
+from registries.standards.adapter_standards import intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
+from registries.standards.adapter_standards import daily, weekly, monthly, annually
+
+DEFAULT_MAX_SIZE = 50_000
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_PRICE_BUCKET = 0.01
+# Tick increments from finest to coarsest, to tell when a strategy's ideal period is coarser than its bars
+INCREMENT_ORDER = [intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour, daily, weekly, monthly, annually]
+
+class StrategyResultCache:
+    """
+    LRU + TTL memoization of Strategy.run_strategy results.
+
+    A result is keyed by a fingerprint of everything that can change it: the strategy name and
+    parameters, the ticker and tick increment, and the last bar (timestamp and close), the number of bars
+    and the current price rounded to a bucket. While the market is closed, or when a daily strategy
+    is re-run on an intraday cycle, the fingerprint does not change and the stored score is returned
+    without touching the strategy. Exceptions raised by a strategy are never cached.
+
+    A strategy whose ideal period is coarser than the bars' tick increment (a daily agent on an
+    intraday cycle) is keyed on coarse_price_bucket instead; by default its current price is ignored,
+    so intraday ticks alone do not make it recompute.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        price_bucket: Optional[float] = DEFAULT_PRICE_BUCKET,
+        coarse_price_bucket: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size (int): Number of results kept before the least recently used is evicted
+            ttl_seconds (float): Age after which a result is recomputed even if its key matches
+            price_bucket (float): Width of the current price buckets; None ignores the current price
+            coarse_price_bucket (float): The same for strategies whose ideal period is coarser than the bars
+            clock (callable): Monotonic time source, in seconds
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.price_bucket = price_bucket
+        self.coarse_price_bucket = coarse_price_bucket
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def run_strategy(
+        self,
+        strategy: Strategy,
+        ticker: str,
+        historical_data: Any,
+        current_price: float,
+        tick_increment: Optional[str] = None,
+    ) -> float:
+        """
+        Returns strategy.run_strategy(historical_data, current_price), reusing a cached score when the inputs match.
+
+        Args:
+            strategy (Strategy): Strategy agent to run
+            ticker (str): Ticker the historical data belongs to
+            historical_data: Bars in any historical data output format
+            current_price (float): Latest available price for the asset
+            tick_increment (str): Increment of the bars; defaults to the strategy's ideal period
+        """
+        key = self.make_key(strategy, ticker, historical_data, current_price, tick_increment)
+        hit, score = self.lookup(key)
+        if hit:
+            return score
+        score = strategy.run_strategy(historical_data, current_price)
+        self.store(key, score)
+        return score
+
+    def lookup(self, key: Tuple) -> Tuple[bool, Optional[float]]:
+        """
+        Returns (True, score) when an unexpired score is stored under key, else (False, None).
+        Counts a hit or a miss; for callers that run the strategy themselves, such as EnsembleClient.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+        return False, None
+
+    def store(self, key: Tuple, score: float):
+        """Stores a score computed after a missed lookup."""
+        with self._lock:
+            self._entries[key] = (score, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def make_key(
+        self,
+        strategy: Strategy,
+        ticker: str,
+        historical_data: Any,
+        current_price: float,
+        tick_increment: Optional[str] = None,
+    ) -> Tuple:
+        ideal_period = strategy.get_ideal_period()
+        if tick_increment is None:
+            tick_increment = ideal_period
+        bucket = self.coarse_price_bucket if _is_coarser(ideal_period, tick_increment) else self.price_bucket
+        bar_count, last_datetime, last_close = _fingerprint(historical_data)
+        return (
+            strategy.get_strategy_name(),
+            _strategy_parameters(strategy),
+            ticker,
+            tick_increment,
+            last_datetime,
+            last_close,
+            bar_count,
+            _price_bucket(current_price, bucket),
+        )
+
+    def purge_expired(self) -> int:
+        """Drops every expired result. Returns the number of results dropped."""
+        now = self.clock()
+        with self._lock:
+            expired = [key for key, (_, stored) in self._entries.items() if now - stored >= self.ttl_seconds]
+            for key in expired:
+                del self._entries[key]
+            self.evictions += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def _price_bucket(current_price: Optional[float], bucket: Optional[float]) -> Optional[int]:
+    if bucket is None or current_price is None or not math.isfinite(current_price):
+        return None
+    return math.floor(current_price / bucket)
+
+def _is_coarser(period: str, tick_increment: str) -> bool:
+    if period not in INCREMENT_ORDER or tick_increment not in INCREMENT_ORDER:
+        return False
+    return INCREMENT_ORDER.index(period) > INCREMENT_ORDER.index(tick_increment)
+
+def _strategy_parameters(strategy: Strategy) -> Tuple:
+    """
+    The strategy's public instance attributes as a hashable, order-independent tuple.
+    Public attributes count as parameters, so strategies should keep mutable run state in underscore attributes.
+    """
+    params = []
+    for name, value in sorted(vars(strategy).items()):
+        if name.startswith("_"):
+            continue
+        params.append((name, value if isinstance(value, Hashable) else repr(value)))
+    return tuple(params)
+
+def _fingerprint(historical_data: Any) -> Tuple[int, Any, Any]:
+    """(bar count, last DateTime, last close) for any historical data output format."""
+    if historical_data is None or len(historical_data) == 0:
+        return 0, None, None
+    if isinstance(historical_data, pd.DataFrame):
+        if historical_data.empty:
+            return 0, None, None
+        last = historical_data.iloc[-1]
+        return len(historical_data), _scalar(last.get(df_datetime)), _scalar(last.get(df_close))
+    if isinstance(historical_data, dict):
+        closes = historical_data.get(df_close)
+        datetimes = historical_data.get(df_datetime)
+        count = len(closes) if closes is not None else 0
+        if count == 0:
+            return 0, None, None
+        return count, _scalar(datetimes[-1]) if datetimes is not None else None, _scalar(closes[-1])
+    last = historical_data[-1]
+    return len(historical_data), _scalar(last.get(df_datetime)), _scalar(last.get(df_close))
+
+def _scalar(value: Any) -> Any:
+    # Keep keys as plain Python values: timestamps as UTC nanoseconds, NumPy scalars unwrapped
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).value
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -1,11 +1,19 @@
+import logging
+import math
 import talib
 import pandas as pd
 import numpy as np
 from registries.strategy_registries import strategy_ideal_periods, strategy_ideal_number_dataframes
-from strategies.strategy import Strategy
+from strategies.strategy import IncrementalStrategy
+from strategies.incremental_indicators import IncrementalAD
 from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
 
-class AD_Strategy(Strategy):
+class AD_Strategy(IncrementalStrategy):
+    def __init__(self):
+        # Streaming state per ticker: A/D line and its value on the previous bar
+        self._ad_lines = {}
+        self._previous_ad = {}
+
     def get_strategy_name(self):
         return "chaikin_ad_line"
     
@@ -25,21 +33,48 @@ class AD_Strategy(Strategy):
             logging.error(f"Historical data is invalid for strategy {self.get_strategy_name()}")
             return 0
         
-        # Convert data types to float64 for TA-Lib
-        for col in [df_high, df_low, df_close, df_volume]:
-            historical_data[col] = historical_data[col].astype(np.float64)
+        # float64 arrays for TA-Lib (no copy for the columnar output formats)
+        prices = self.get_price_arrays(historical_data)
         
         # Calculate Chaikin A/D Line
-        ad_line = talib.AD(historical_data[df_high].values, historical_data[df_low].values, 
-                          historical_data[df_close].values, historical_data[df_volume].values)
+        ad_line = talib.AD(prices[df_high], prices[df_low], prices[df_close], prices[df_volume])
         
         # Get the last two values to determine trend
         if len(ad_line) < 2:
             raise ValueError("Not enough data points to calculate trend (need at least 2)")
             
-        last_ad = ad_line[-1]
-        prev_ad = ad_line[-2]
-        
+        return self._score(ad_line[-1], ad_line[-2])
+
+    def warm_up(self, historical_data, ticker=None):
+        if isinstance(historical_data, list):
+            historical_data = pd.DataFrame(historical_data)
+        if not self.validate_historical_data(historical_data):
+            logging.error(f"Historical data is invalid for strategy {self.get_strategy_name()}")
+            return 0
+
+        self._ad_lines[ticker] = IncrementalAD()
+        self._previous_ad[ticker] = math.nan
+        prices = self.get_price_arrays(historical_data)
+        for high, low, close, volume in zip(prices[df_high], prices[df_low], prices[df_close], prices[df_volume]):
+            self._advance(ticker, {df_high: high, df_low: low, df_close: close, df_volume: volume})
+        return self._latest_score(ticker)
+
+    def update(self, bar, ticker=None):
+        self._advance(ticker, bar)
+        return self._latest_score(ticker)
+
+    def _advance(self, ticker, bar):
+        ad_line = self._ad_lines.setdefault(ticker, IncrementalAD())
+        self._previous_ad[ticker] = ad_line.value
+        ad_line.update(bar)
+
+    def _latest_score(self, ticker):
+        prev_ad = self._previous_ad.get(ticker, math.nan)
+        if math.isnan(prev_ad):
+            raise ValueError("Not enough data points to calculate trend (need at least 2)")
+        return self._score(self._ad_lines[ticker].value, prev_ad)
+
+    def _score(self, last_ad, prev_ad):
         # Calculate percentage change in A/D line
         ad_change = (last_ad - prev_ad) / abs(prev_ad) if prev_ad != 0 else 0
         
@@ -51,4 +86,4 @@ class AD_Strategy(Strategy):
             logging.error(f"Sentiment score {sentiment_score} is outside valid range [-1, 1]")
             return 0
         
-        return float(sentiment_score)
\ No newline at end of file
+        return float(sentiment_score)
@@ -0,0 +1,332 @@
+"""
+Offline benchmarks of the system's hot paths on seeded synthetic bars.
+
+Nothing here touches the network: the adapters are served canned payloads built from the synthetic
+bars by a ReplayTransport, through an unthrottled request scheduler. Results are written as JSON so runs can
+be compared against a saved baseline:
+
+    python tests/benchmarks/run_benchmarks.py --tickers 500 --bars 2520 --output bench.json
+    python tests/benchmarks/run_benchmarks.py --tickers 500 --bars 2520 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# The API adapters read their keys from config at import; benchmarks never reach the real APIs
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType("config")
+    config.Tiingo_API_KEY = "benchmark-tiingo-key"
+    config.FMP_API_KEY = "benchmark-fmp-key"
+    config.FINNHUB_API_KEY = "benchmark-finnhub-key"
+    sys.modules["config"] = config
+
+import numpy as np
+import pandas as pd
+
+from tests.benchmarks.synthetic_data import BARS_PER_YEAR, generate_ohlcv
+from registries.standards.adapter_standards import daily, output_records, output_dataframe, output_arrays
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+SCHEMA_VERSION = 1
+DEFAULT_TICKERS = 100
+DEFAULT_BARS = 504
+DEFAULT_REPEAT = 5
+DEFAULT_SEED = 0
+# Adapter parsing is timed on a slice of the universe; per-item times are per payload
+DEFAULT_PARSE_TICKERS = 20
+# Simulated round trip of the replayed API for the fetch concurrency benchmarks, in seconds
+DEFAULT_REPLAY_LATENCY = 0.02
+FETCH_WORKERS = (1, 8)
+# Calls per run of the metrics overhead benchmarks
+METRICS_CALLS = 50_000
+# A benchmark regresses when its median is this much slower than the baseline's
+DEFAULT_TOLERANCE = 0.25
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    items: int   # units of work per call (tickers, payloads, bars, ...), for per-item times
+
+def tiingo_payload(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """A Tiingo daily prices response for the bars, as returned by response.json()."""
+    dates = frame[df_datetime].dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return [
+        {"date": date, "open": o, "high": h, "low": l, "close": c, "volume": int(v),
+         "adjOpen": o, "adjHigh": h, "adjLow": l, "adjClose": c, "adjVolume": int(v), "divCash": 0.0, "splitFactor": 1.0}
+        for date, o, h, l, c, v in zip(
+            dates, frame[df_open].tolist(), frame[df_high].tolist(), frame[df_low].tolist(),
+            frame[df_close].tolist(), frame[df_volume].tolist(),
+        )
+    ]
+
+def yfinance_history(frame: pd.DataFrame) -> pd.DataFrame:
+    """A yfinance Ticker.history frame for the bars: indexed by Date, capitalized columns."""
+    hist = frame.rename(columns={df_datetime: "Date", df_open: "Open", df_high: "High", df_low: "Low", df_close: "Close", df_volume: "Volume"})
+    hist["Dividends"] = 0.0
+    hist["Stock Splits"] = 0.0
+    return hist.set_index("Date")
+
+def build_cases(historical_data: Dict[str, pd.DataFrame], tick_increment: str = daily,
+                parse_tickers: int = DEFAULT_PARSE_TICKERS, workers: Optional[int] = None,
+                replay_latency: float = DEFAULT_REPLAY_LATENCY) -> List[BenchmarkCase]:
+    from adapters.http_transport import DATE_PARAMS, Cassette, ReplayTransport
+    from adapters.request_scheduler import request_scheduler
+    from adapters.tickers_adapters.ticker_adapter import TickerAdapter
+    from clients.metrics_client import metrics
+    from adapters.historical_data_adapters import tiingo_historical_data_adapter as tiingo_module
+    from adapters.historical_data_adapters.yfinance_historical_data_adapter import YFinanceHistoricalDataAdapter
+    from clients.ensemble_client import EnsembleClient
+    from clients.ranking_client import RankingClient
+    from clients.testing_client import TestingClient
+    from registries.standards.client_standards import PERIODS_PER_YEAR
+    from dbs.duck_db_client import DuckDBClient
+    from registries import strategy_registries
+    from strategies.candlestick_scanner import CandlestickScanner
+    from strategies.cross_sectional_engine import BarMatrix, CrossSectionalIndicatorEngine
+
+    tickers = list(historical_data)
+    last_closes = {ticker: float(frame[df_close].iloc[-1]) for ticker, frame in historical_data.items()}
+    cases = []
+
+    # Strategy agents, one run_strategy call per ticker as the trading pipeline makes them
+    for strategy_class in strategy_registries.strategies:
+        strategy = strategy_class()
+        def run_strategy(strategy=strategy):
+            for ticker, frame in historical_data.items():
+                strategy.run_strategy(frame, last_closes[ticker])
+        cases.append(BenchmarkCase(f"strategy.run_strategy.{strategy.get_strategy_name()}", run_strategy, len(tickers)))
+
+    # Adapter parsing of canned payloads (JSON decoding included); the shared scheduler is unthrottled
+    # and replays the payloads only while a case runs, so only parsing is timed
+    parse_slice = tickers[:parse_tickers]
+    start, end = historical_data[tickers[0]][df_datetime].iloc[[0, -1]].dt.to_pydatetime()
+    cassette = Cassette()
+    for ticker in parse_slice:
+        url = f"{tiingo_module.TiingoHistoricalDataAdapter.DAILY_URL.format(ticker=ticker)}?resampleFreq={daily}"
+        cassette.add("GET", url, 200, "application/json", json.dumps(tiingo_payload(historical_data[ticker])).encode())
+    replay = ReplayTransport(cassette, ignore_params=DATE_PARAMS)
+    tiingo = tiingo_module.TiingoHistoricalDataAdapter()
+    yfinance = YFinanceHistoricalDataAdapter()
+    histories = [yfinance_history(historical_data[ticker]) for ticker in parse_slice]
+    for output_format in (output_records, output_dataframe, output_arrays):
+        def parse_tiingo(output_format=output_format):
+            with request_scheduler.use_limits({}), request_scheduler.use_transport(replay):
+                for ticker in parse_slice:
+                    tiingo.get_historical_data(ticker, start, end, daily, output_format)
+        def parse_yfinance(output_format=output_format):
+            for hist in histories:
+                yfinance._standardize(hist, output_format)
+        cases.append(BenchmarkCase(f"adapter.tiingo_parse.{output_format}", parse_tiingo, len(parse_slice)))
+        cases.append(BenchmarkCase(f"adapter.yfinance_parse.{output_format}", parse_yfinance, len(parse_slice)))
+
+    # Batch fetches against the replayed API with a fixed round trip, sequential and concurrent
+    latent = ReplayTransport(cassette, latency=replay_latency, ignore_params=DATE_PARAMS)
+    for max_workers in FETCH_WORKERS:
+        def fetch_batch(max_workers=max_workers):
+            with request_scheduler.use_limits({}), request_scheduler.use_transport(latent):
+                for result in tiingo.get_historical_data_batch(parse_slice, start, end, daily, max_workers, output_arrays):
+                    assert result.error is None, result.error
+        cases.append(BenchmarkCase(f"adapter.tiingo_fetch.{max_workers}_workers", fetch_batch, len(parse_slice)))
+
+    # Cross-sectional evaluation over the aligned universe
+    bars = BarMatrix.from_historical_data(historical_data)
+    engine = CrossSectionalIndicatorEngine()
+    sentiments = engine.run(bars)
+    scanner = CandlestickScanner()
+    cases.append(BenchmarkCase("engine.bar_matrix", lambda: BarMatrix.from_historical_data(historical_data), len(tickers)))
+    cases.append(BenchmarkCase("engine.indicators", lambda: engine.run(bars), len(tickers)))
+    cases.append(BenchmarkCase("engine.candlestick_scan", lambda: scanner.scan(bars), len(tickers)))
+
+    # Ensemble: every agent on every ticker, then scores weighted by the ranking coefficients
+    ensemble = EnsembleClient(strategy_registries.strategies, max_workers=1)
+    cases.append(BenchmarkCase("ensemble.run", lambda: ensemble.run(historical_data, last_closes), len(tickers)))
+    if workers and workers > 1:
+        pool = EnsembleClient(strategy_registries.strategies, max_workers=workers)
+        cases.append(BenchmarkCase(f"ensemble.run.{workers}_workers", lambda: pool.run(historical_data, last_closes), len(tickers)))
+
+    testing_client = TestingClient()
+    backtest = testing_client.run(bars, sentiments, tick_increment)
+    ranking_client = RankingClient(backtest.agents, periods_per_year=PERIODS_PER_YEAR.get(tick_increment, BARS_PER_YEAR[tick_increment]))
+    ranking_client.warm_up(backtest.portfolio_returns)
+    coefficients = ranking_client.coefficients()
+    n_returns = backtest.portfolio_returns.shape[1]
+
+    def aggregate():
+        scores = CrossSectionalIndicatorEngine.latest_scores(bars, sentiments)
+        return {
+            ticker: sum(coefficients[agent] * scores[agent][ticker] for agent in backtest.agents)
+            for ticker in bars.tickers
+        }
+    cases.append(BenchmarkCase("ensemble.aggregate", aggregate, len(tickers)))
+
+    # Ranking: the full backtest, the warm-up from its returns, per-bar online updates and the same
+    # ranking as a DuckDB window query over the stored returns
+    def update_ranking():
+        ranking = RankingClient(backtest.agents)
+        for returns in backtest.portfolio_returns.T:
+            ranking.update(returns)
+        return ranking.coefficients()
+    cases.append(BenchmarkCase("ranking.backtest", lambda: testing_client.run(bars, sentiments, tick_increment), len(tickers)))
+    cases.append(BenchmarkCase("ranking.warm_up", lambda: RankingClient(backtest.agents).warm_up(backtest.portfolio_returns), n_returns))
+    cases.append(BenchmarkCase("ranking.update", update_ranking, n_returns))
+    ranking_db = DuckDBClient(":memory:")
+    ranking_db.save_agent_returns(backtest.agents, backtest.datetimes, backtest.portfolio_returns)
+    cases.append(BenchmarkCase("ranking.duckdb_rank", ranking_db.rank_agents, n_returns))
+
+    # Instrumentation overhead with metrics off: an instrumented call against the bare method it wraps
+    class StaticTickerAdapter(TickerAdapter):
+        def fetch_tickers(self):
+            return tickers
+
+    static_adapter = StaticTickerAdapter()
+    for label, fetch in (("disabled_call", StaticTickerAdapter.fetch_tickers),
+                         ("raw_call", StaticTickerAdapter.fetch_tickers.__wrapped__)):
+        def call_adapter(fetch=fetch):
+            assert not metrics.enabled
+            for _ in range(METRICS_CALLS):
+                fetch(static_adapter)
+        cases.append(BenchmarkCase(f"metrics.{label}", call_adapter, METRICS_CALLS))
+    return cases
+
+def time_case(case: BenchmarkCase, repeat: int = DEFAULT_REPEAT, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        case.func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.func()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "items": case.items,
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "per_item_us": median / case.items * 1e6 if case.items else None,
+    }
+
+def time_registry_import(repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Import time of the registries in fresh interpreters (what every entry point pays at startup)."""
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import registries.adapter_registries, registries.strategy_registries\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    timings = [
+        float(subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    median = statistics.median(timings)
+    return {"items": 1, "repeat": repeat, "min_s": min(timings), "median_s": median,
+            "mean_s": statistics.fmean(timings), "per_item_us": median * 1e6}
+
+def run_benchmarks(
+    n_tickers: int = DEFAULT_TICKERS,
+    n_bars: int = DEFAULT_BARS,
+    tick_increment: str = daily,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    workers: Optional[int] = None,
+    only: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run every benchmark on one synthetic universe.
+
+    Args:
+        only (str): Run just the benchmarks whose names start with this prefix
+    Returns:
+        Dict[str, Any]: {"schema", "meta", "results"}; results maps benchmark name -> timings
+    """
+    historical_data = generate_ohlcv(n_tickers, n_bars, tick_increment, seed)
+    results = {}
+    for case in build_cases(historical_data, tick_increment, workers=workers):
+        if only is None or case.name.startswith(only):
+            results[case.name] = time_case(case, repeat)
+    if only is None or "startup.registry_import".startswith(only):
+        results["startup.registry_import"] = time_registry_import(repeat)
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "tickers": n_tickers,
+            "bars": n_bars,
+            "tick_increment": tick_increment,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Median times of the benchmarks present in both runs.
+    Returns:
+        List[Dict[str, Any]]: name, baseline and current medians, ratio and whether it regressed beyond tolerance.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        rows.append({
+            "name": name,
+            "baseline_s": before["median_s"],
+            "current_s": result["median_s"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + tolerance,
+        })
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=DEFAULT_TICKERS)
+    parser.add_argument("--bars", type=int, default=DEFAULT_BARS)
+    parser.add_argument("--increment", default=daily, help="Bar frequency (daily, weekly, monthly, 1min, 5min, ...)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--workers", type=int, default=None, help="Also time EnsembleClient with this many processes")
+    parser.add_argument("--only", default=None, help="Only run benchmarks whose names start with this prefix")
+    parser.add_argument("--output", default=None, help="Write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous JSON result; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.tickers, args.bars, args.increment, args.seed, args.repeat, args.workers, args.only)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        rows = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for row in rows:
+            flag = "REGRESSED" if row["regressed"] else ""
+            print(f"{row['name']:<45} {row['baseline_s'] * 1e3:>10.2f}ms {row['current_s'] * 1e3:>10.2f}ms {row['ratio']:>6.2f}x {flag}", file=sys.stderr)
+        return int(any(row["regressed"] for row in rows))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from adapters.historical_data_adapters.historical_data_formats import standardize_bar_frame
+from registries.standards.adapter_standards import daily, weekly, monthly, intraday_1min, intraday_5min, intraday_10min, intraday_30min, intraday_1hour
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume, df_datetime
+
+INTRADAY_MINUTES = {intraday_1min: 1, intraday_5min: 5, intraday_10min: 10, intraday_30min: 30, intraday_1hour: 60}
+BARS_PER_YEAR = {daily: 252, weekly: 52, monthly: 12, **{inc: 252 * 390 // minutes for inc, minutes in INTRADAY_MINUTES.items()}}
+
+DEFAULT_END = pd.Timestamp("2024-12-31")
+
+def synthetic_timestamps(n_bars: int, tick_increment: str = daily, end: pd.Timestamp = DEFAULT_END) -> pd.DatetimeIndex:
+    """The last n_bars bar times (UTC) up to end: business days, week/month ends or regular-session minutes."""
+    if tick_increment == daily:
+        return pd.bdate_range(end=end, periods=n_bars, tz="UTC")
+    if tick_increment == weekly:
+        return pd.date_range(end=end, periods=n_bars, freq="W-FRI", tz="UTC")
+    if tick_increment == monthly:
+        return pd.date_range(end=end, periods=n_bars, freq="BME", tz="UTC")
+    if tick_increment not in INTRADAY_MINUTES:
+        raise ValueError(f"Unsupported tick_increment '{tick_increment}'")
+    minutes = INTRADAY_MINUTES[tick_increment]
+    per_day = 390 // minutes
+    days = pd.bdate_range(end=end, periods=-(-n_bars // per_day))
+    opens = (days + pd.Timedelta(hours=9, minutes=30)).tz_localize("America/New_York").tz_convert("UTC").tz_localize(None)
+    offsets = np.arange(per_day) * np.timedelta64(minutes, "m")
+    stamps = (opens.to_numpy()[:, None] + offsets[None, :]).ravel()
+    return pd.DatetimeIndex(stamps[-n_bars:]).tz_localize("UTC")
+
+def generate_ohlcv(
+    n_tickers: int = 100,
+    n_bars: int = 252,
+    tick_increment: str = daily,
+    seed: int = 0,
+    tickers: Optional[List[str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Seeded synthetic bars for a universe, as standardized DataFrames (see standardize_bar_frame).
+
+    Closes follow a geometric random walk with per-ticker drift and volatility scaled to the bar
+    frequency; opens gap from the previous close, highs/lows wrap the open and close, and volume is
+    log-normal. The same arguments always give the same bars.
+    """
+    rng = np.random.default_rng(seed)
+    tickers = tickers or [f"SYN{i:04d}" for i in range(n_tickers)]
+    periods = BARS_PER_YEAR[tick_increment]
+    timestamps = synthetic_timestamps(n_bars, tick_increment)
+
+    shape = (len(tickers), n_bars)
+    drift = rng.normal(0.08, 0.1, (len(tickers), 1)) / periods
+    volatility = rng.uniform(0.15, 0.6, (len(tickers), 1)) / np.sqrt(periods)
+    log_close = np.log(rng.uniform(20, 500, (len(tickers), 1))) + np.cumsum(drift + volatility * rng.standard_normal(shape), axis=1)
+    close = np.exp(log_close)
+    previous = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    open_ = previous * np.exp(0.3 * volatility * rng.standard_normal(shape))
+    high = np.maximum(open_, close) * (1 + np.abs(0.5 * volatility * rng.standard_normal(shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(0.5 * volatility * rng.standard_normal(shape)))
+    volume = rng.lognormal(13, 0.6, shape)
+
+    return {
+        ticker: standardize_bar_frame(pd.DataFrame({
+            df_datetime: timestamps,
+            df_open: open_[i], df_high: high[i], df_low: low[i], df_close: close[i], df_volume: volume[i],
+        }))
+        for i, ticker in enumerate(tickers)
+    }
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+
+from run_benchmarks import compare, main, run_benchmarks
+from synthetic_data import generate_ohlcv
+
+
+def test_synthetic_bars_are_seeded_and_valid():
+    first = generate_ohlcv(3, 50, "5min", seed=7)
+    second = generate_ohlcv(3, 50, "5min", seed=7)
+    assert list(first) == ["SYN0000", "SYN0001", "SYN0002"]
+    for ticker, frame in first.items():
+        assert frame.equals(second[ticker])
+        assert len(frame) == 50 and frame["DateTime"].is_monotonic_increasing
+        assert np.all(frame["high"] >= frame[["open", "close"]].max(axis=1))
+        assert np.all(frame["low"] <= frame[["open", "close"]].min(axis=1))
+    assert not generate_ohlcv(3, 50, "5min", seed=8)["SYN0000"].equals(first["SYN0000"])
+
+
+def test_suite_runs_offline_and_reports_json(tmp_path):
+    from adapters.historical_data_adapters import tiingo_historical_data_adapter
+    from adapters.request_scheduler import DEFAULT_RATE_LIMITS, request_scheduler
+
+    report = run_benchmarks(n_tickers=4, n_bars=120, repeat=1)
+    # The shared scheduler is left as it was for whatever runs next
+    assert tiingo_historical_data_adapter.request_scheduler is request_scheduler
+    assert request_scheduler.limits == DEFAULT_RATE_LIMITS and request_scheduler.transport is None
+    assert report["meta"]["tickers"] == 4
+    names = set(report["results"])
+    assert {"strategy.run_strategy.chaikin_ad_line", "adapter.tiingo_parse.records", "adapter.yfinance_parse.dataframe",
+            "ensemble.run", "ensemble.aggregate", "ranking.update", "metrics.disabled_call", "metrics.raw_call",
+            "startup.registry_import"} <= names
+    assert all(result["median_s"] >= 0 for result in report["results"].values())
+
+    baseline = tmp_path / "baseline.json"
+    assert main(["--tickers", "4", "--bars", "120", "--repeat", "1", "--only", "ranking", "--output", str(baseline)]) == 0
+    saved = json.loads(baseline.read_text())
+    assert set(saved["results"]) == {"ranking.backtest", "ranking.warm_up", "ranking.update", "ranking.duckdb_rank"}
+
+    slower = json.loads(baseline.read_text())
+    for result in slower["results"].values():
+        result["median_s"] *= 10
+    rows = compare(slower, saved)
+    assert all(row["regressed"] for row in rows) and not any(row["regressed"] for row in compare(saved, slower))
@@ -32,18 +32,24 @@ def test_ad_strategy():
     tickers = tickers_adapter.fetch_tickers() # Test with all tickers for better sample
     
     results = {}
-    for ticker in tickers:
+    # Price the whole universe up front in bulk
+    current_prices = current_price_adapter.get_current_prices(tickers)
+    # Fetch historical data for the whole universe concurrently
+    batch = historical_data_adapter.get_historical_data_batch(
+        tickers=tickers,
+        start_date=start_date,
+        end_date=end_date,
+        tick_increment=period  # Use the strategy's ideal period as tick increment
+    )
+    for ticker, historical_data, error in batch:
         try:
-            # Get current price
-            current_price = current_price_adapter.get_current_price(ticker)
+            if error is not None:
+                raise error
             
-            # Get historical data
-            historical_data = historical_data_adapter.get_historical_data(
-                ticker=ticker,
-                start_date=start_date,
-                end_date=end_date,
-                tick_increment=period  # Use the strategy's ideal period as tick increment
-            )
+            # Get current price
+            current_price = current_prices.get(ticker)
+            if current_price is None:
+                raise ValueError("no current price")
             
             # Run strategy
             sentiment_score = strategy.run_strategy(historical_data, current_price)
@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.historical_data_adapters.bar_resampler import resample_bars, resample_start
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.historical_data_adapters.historical_data_formats import standardize_bar_frame
+from adapters.historical_data_adapters.resampling_historical_data_adapter import ResamplingHistoricalDataAdapter
+from registries.standards.adapter_standards import (
+    daily, weekly, monthly, intraday_1min, intraday_30min, intraday_1hour,
+    df_datetime, df_open, df_high, df_low, df_close, df_volume, output_dataframe, output_records,
+)
+
+
+def make_bars(index):
+    rng = np.random.default_rng(0)
+    close = 100 + rng.normal(size=len(index)).cumsum()
+    return standardize_bar_frame(pd.DataFrame({
+        df_datetime: index,
+        df_open: close + rng.normal(size=len(index)),
+        df_high: close + 2,
+        df_low: close - 2,
+        df_close: close,
+        df_volume: rng.integers(1, 1000, size=len(index)),
+    }))
+
+
+def minute_bars(day, end="16:00"):
+    index = pd.date_range(f"{day} 09:30", f"{day} {end}", freq="1min", inclusive="left", tz="America/New_York")
+    return index.tz_convert("UTC")
+
+
+def expected_resample(bars, rule, **kwargs):
+    frame = bars.set_index(df_datetime)
+    return frame.resample(rule, **kwargs).agg(
+        {df_open: "first", df_high: "max", df_low: "min", df_close: "last", df_volume: "sum"}
+    ).dropna()
+
+
+def test_intraday_buckets_anchor_on_session_open():
+    # A regular day and the day-after-Thanksgiving half day
+    bars = make_bars(minute_bars("2024-11-27").append(minute_bars("2024-11-29", end="13:00")))
+    hourly = resample_bars(bars, intraday_1hour)
+
+    local = hourly[df_datetime].dt.tz_convert("America/New_York")
+    assert list(local.dt.strftime("%m-%d %H:%M")) == [
+        "11-27 09:30", "11-27 10:30", "11-27 11:30", "11-27 12:30", "11-27 13:30", "11-27 14:30", "11-27 15:30",
+        "11-29 09:30", "11-29 10:30", "11-29 11:30", "11-29 12:30",
+    ]
+    expected = expected_resample(bars, "60min", offset="30min")
+    for column in (df_open, df_high, df_low, df_close, df_volume):
+        np.testing.assert_allclose(hourly[column].to_numpy(), expected[column].to_numpy())
+    assert hourly[df_volume].sum() == bars[df_volume].sum()
+
+
+def test_weekly_and_monthly_from_daily():
+    days = pd.bdate_range("2024-03-01", "2024-04-30", tz="UTC").drop(pd.Timestamp("2024-03-29", tz="UTC"))
+    bars = make_bars(days)
+
+    weeks = resample_bars(bars.sample(frac=1, random_state=1), weekly)  # input order does not matter
+    expected = expected_resample(bars, "W-SUN")
+    np.testing.assert_allclose(weeks[df_close].to_numpy(), expected[df_close].to_numpy())
+    np.testing.assert_allclose(weeks[df_high].to_numpy(), expected[df_high].to_numpy())
+    # The Good Friday week is labelled with its last trading day
+    assert pd.Timestamp("2024-03-28", tz="UTC") in set(weeks[df_datetime])
+
+    months = resample_bars(bars, monthly)
+    assert list(months[df_datetime].dt.strftime("%Y-%m-%d")) == ["2024-03-28", "2024-04-30"]
+    assert months[df_open].iloc[1] == bars[df_open].iloc[20]
+
+
+def test_resample_start():
+    assert resample_start(datetime(2024, 3, 14, 15), weekly) == datetime(2024, 3, 11)
+    assert resample_start(datetime(2024, 3, 14), monthly) == datetime(2024, 3, 1)
+    assert resample_start(datetime(2024, 3, 14, 15), intraday_30min) == datetime(2024, 3, 14, 15)
+    with pytest.raises(ValueError):
+        resample_bars(make_bars(pd.bdate_range("2024-01-01", periods=3, tz="UTC")), daily)
+
+
+class BaseBarsAdapter(HistoricalDataAdapter):
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        self.requests.append((ticker, start_date, tick_increment))
+        if tick_increment == daily:
+            return make_bars(pd.bdate_range(start_date, end_date, tz="UTC"))
+        if tick_increment == intraday_1min:
+            return make_bars(minute_bars("2024-03-14"))
+        raise AssertionError(f"unexpected increment {tick_increment}")
+
+
+def test_adapter_requests_only_base_increments():
+    base = BaseBarsAdapter()
+    adapter = ResamplingHistoricalDataAdapter(base)
+
+    weeks = adapter.get_historical_data("AAPL", datetime(2024, 3, 13), datetime(2024, 3, 29), weekly, output_format=output_dataframe)
+    assert base.requests[-1] == ("AAPL", datetime(2024, 3, 11), daily)
+    assert list(weeks[df_datetime].dt.strftime("%Y-%m-%d")) == ["2024-03-15", "2024-03-22", "2024-03-29"]
+
+    records = adapter.get_historical_data("AAPL", datetime(2024, 3, 14), datetime(2024, 3, 14), intraday_30min)
+    assert len(records) == 13
+    assert records[0][df_datetime] == "2024-03-14T13:30:00.000Z"
+
+    results = list(adapter.get_historical_data_batch(["AAPL", "MSFT"], datetime(2024, 3, 14), datetime(2024, 3, 14), intraday_1hour))
+    assert sorted(result.ticker for result in results) == ["AAPL", "MSFT"]
+    assert all(result.error is None and len(result.data) == 7 for result in results)
+    assert {request[2] for request in base.requests} == {daily, intraday_1min}
@@ -0,0 +1,122 @@
+import threading
+
+from adapters.current_price_adapters.cached_current_price_adapter import CachedCurrentPriceAdapter
+from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter
+from adapters.market_status_adapters.market_status_adapter import MarketStatusAdapter
+from registries.standards.adapter_standards import market_open, market_closed, market_pre_market
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMarketStatusAdapter(MarketStatusAdapter):
+    def __init__(self, status=market_open):
+        self.status = status
+        self.calls = 0
+
+    def get_market_status(self):
+        self.calls += 1
+        return self.status
+
+
+class CountingPriceAdapter(CurrentPriceAdapter):
+    def __init__(self):
+        self.calls = []
+        self.price = 100.0
+
+    def get_current_price(self, ticker):
+        self.calls.append([ticker])
+        return self.price
+
+    def get_current_prices(self, tickers, max_workers=8):
+        self.calls.append(list(tickers))
+        return {ticker: self.price for ticker in tickers}
+
+
+def make_adapter(status=market_open):
+    clock, inner, market = FakeClock(), CountingPriceAdapter(), FakeMarketStatusAdapter(status)
+    adapter = CachedCurrentPriceAdapter(inner, market, open_ttl=10, pre_market_ttl=60, status_ttl=5, clock=clock)
+    return adapter, inner, market, clock
+
+
+def test_open_and_pre_market_ttls():
+    adapter, inner, market, clock = make_adapter()
+    assert adapter.get_current_price("AAPL") == 100.0
+    clock.now = 9
+    adapter.get_current_price("AAPL")
+    assert len(inner.calls) == 1
+    clock.now = 10
+    adapter.get_current_price("AAPL")
+    assert len(inner.calls) == 2
+
+    market.status = market_pre_market
+    clock.now = 30  # status refreshed, price 20s old: fresh under the pre-market TTL
+    adapter.get_current_price("AAPL")
+    assert len(inner.calls) == 2
+    assert market.calls == 3  # t=0, t=9 and t=30; t=10 reused the status from t=9
+
+
+def test_closed_market_serves_the_close_indefinitely():
+    adapter, inner, market, clock = make_adapter(market_open)
+    adapter.get_current_price("AAPL")  # fetched while open
+    market.status = market_closed
+    clock.now = 6
+    inner.price = 101.0
+    assert adapter.get_current_price("AAPL") == 101.0  # refreshed once after the close
+    clock.now = 100_000
+    assert adapter.get_current_price("AAPL") == 101.0
+    assert len(inner.calls) == 2
+
+
+def test_bulk_fetches_only_stale_tickers():
+    adapter, inner, _, clock = make_adapter()
+    adapter.get_current_prices(["A", "B"])
+    clock.now = 5
+    adapter.get_current_price("C")
+    clock.now = 12
+    assert adapter.get_current_prices(["A", "C", "B"]) == {"A": 100.0, "C": 100.0, "B": 100.0}
+    assert inner.calls == [["A", "B"], ["C"], ["A", "B"]]
+
+
+def test_concurrent_requests_are_coalesced():
+    started, release = threading.Event(), threading.Event()
+
+    class SlowAdapter(CountingPriceAdapter):
+        def get_current_price(self, ticker):
+            started.set()
+            release.wait(5)
+            return super().get_current_price(ticker)
+
+    inner = SlowAdapter()
+    adapter = CachedCurrentPriceAdapter(inner)
+    results = []
+    first = threading.Thread(target=lambda: results.append(adapter.get_current_price("AAPL")))
+    first.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(adapter.get_current_price("AAPL"))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    release.set()
+    for thread in [first, *waiters]:
+        thread.join(5)
+
+    assert results == [100.0] * 4
+    assert inner.calls == [["AAPL"]]
+
+
+def test_failures_are_not_cached_and_release_waiters():
+    class FailingAdapter(CountingPriceAdapter):
+        def get_current_price(self, ticker):
+            super().get_current_price(ticker)
+            raise RuntimeError("down")
+
+    inner = FailingAdapter()
+    adapter = CachedCurrentPriceAdapter(inner)
+    assert adapter.get_current_price("AAPL") is None
+    assert adapter.get_current_price("AAPL") is None
+    assert len(inner.calls) == 2
@@ -0,0 +1,172 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from adapters.historical_data_adapters.cached_historical_data_adapter import CachedHistoricalDataAdapter
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
+from dbs.duck_db_client import DuckDBClient, merge_date_ranges, subtract_date_ranges
+from registries.standards.adapter_standards import (
+    daily, weekly, intraday_1min, df_datetime, df_open, df_high, df_low, df_close, df_volume, output_records
+)
+
+
+class RecordingAdapter(HistoricalDataAdapter):
+    """Returns one bar per weekday in the requested range and records every request."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        self.requests.append((ticker, start_date.date(), end_date.date(), tick_increment))
+        bars = []
+        day = start_date.date()
+        while day <= end_date.date():
+            if day.weekday() < 5:
+                bars.append({
+                    df_datetime: f"{day.isoformat()}T00:00:00.000Z",
+                    df_open: 1.0, df_high: 2.0, df_low: 0.5, df_close: 1.5, df_volume: day.day,
+                })
+            day += timedelta(days=1)
+        return bars
+
+
+class FlakyAdapter(RecordingAdapter):
+    """Fails its first request, like a timeout the provider adapter would log and swallow."""
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        if not self.requests:
+            self.requests.append((ticker, start_date.date(), end_date.date(), tick_increment))
+            raise ConnectionError("timed out")
+        return super().get_historical_data(ticker, start_date, end_date, tick_increment, output_format)
+
+
+class LookbackAdapter(RecordingAdapter):
+    """Like Tiingo intraday: only queries the last five days of any requested range."""
+
+    def get_query_window(self, start_date, end_date, tick_increment=daily):
+        return max(start_date, end_date - timedelta(days=5)), end_date
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        start_date, end_date = self.get_query_window(start_date, end_date, tick_increment)
+        return super().get_historical_data(ticker, start_date, end_date, tick_increment, output_format)
+
+
+@pytest.fixture
+def db_client():
+    client = DuckDBClient(":memory:")
+    yield client
+    client.close()
+
+
+def test_subtract_and_merge_date_ranges():
+    covered = [(date(2024, 1, 5), date(2024, 1, 7)), (date(2024, 1, 1), date(2024, 1, 2))]
+    assert merge_date_ranges(covered + [(date(2024, 1, 3), date(2024, 1, 4))]) == [(date(2024, 1, 1), date(2024, 1, 7))]
+    assert subtract_date_ranges(date(2024, 1, 1), date(2024, 1, 10), covered) == [
+        (date(2024, 1, 3), date(2024, 1, 4)),
+        (date(2024, 1, 8), date(2024, 1, 10)),
+    ]
+    assert subtract_date_ranges(date(2024, 1, 5), date(2024, 1, 6), covered) == []
+
+
+def test_only_missing_days_are_fetched(db_client):
+    inner = RecordingAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+
+    first = adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 10), daily)
+    assert len(first) == 8
+    assert first[0] == {df_datetime: "2024-01-01T00:00:00.000Z", df_open: 1.0, df_high: 2.0,
+                        df_low: 0.5, df_close: 1.5, df_volume: 1}
+
+    # Fully cached: served from the store without touching the wrapped adapter
+    assert adapter.get_historical_data("AAPL", datetime(2024, 1, 3), datetime(2024, 1, 9), daily) == first[2:7]
+    assert len(inner.requests) == 1
+
+    # Extending the window only requests the new days
+    extended = adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 12), daily)
+    assert inner.requests[-1] == ("AAPL", date(2024, 1, 11), date(2024, 1, 12), daily)
+    assert len(extended) == 10
+
+
+def test_failed_fetch_is_not_recorded_as_covered(db_client):
+    inner = FlakyAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+
+    assert adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 10), daily) == []
+    assert db_client.get_covered_ranges("AAPL", daily) == []
+    # The next call asks for the same days again and caches them
+    assert len(adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 10), daily)) == 8
+    assert inner.requests == [("AAPL", date(2024, 1, 1), date(2024, 1, 10), daily)] * 2
+    assert db_client.get_covered_ranges("AAPL", daily) == [(date(2024, 1, 1), date(2024, 1, 10))]
+
+
+def test_only_the_queried_window_is_recorded_as_covered(db_client):
+    assert TiingoHistoricalDataAdapter().get_query_window(datetime(2025, 1, 1), datetime(2025, 1, 31), intraday_1min) == (
+        datetime(2025, 1, 26), datetime(2025, 1, 31)
+    )
+    inner = LookbackAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+
+    adapter.get_historical_data("AAPL", datetime(2025, 1, 1), datetime(2025, 1, 31), intraday_1min)
+    assert db_client.get_covered_ranges("AAPL", intraday_1min) == [(date(2025, 1, 26), date(2025, 1, 31))]
+
+    # The earlier days were never downloaded, so asking for them fetches them instead of returning nothing
+    early = adapter.get_historical_data("AAPL", datetime(2025, 1, 1), datetime(2025, 1, 10), intraday_1min)
+    assert inner.requests[-1] == ("AAPL", date(2025, 1, 5), date(2025, 1, 10), intraday_1min)
+    assert len(early) == 5
+    assert db_client.get_covered_ranges("AAPL", intraday_1min) == [
+        (date(2025, 1, 5), date(2025, 1, 10)), (date(2025, 1, 26), date(2025, 1, 31))
+    ]
+
+    # The batch path records the same window
+    list(adapter.get_historical_data_batch(["MSFT"], datetime(2025, 1, 1), datetime(2025, 1, 31), intraday_1min))
+    assert db_client.get_covered_ranges("MSFT", intraday_1min) == [(date(2025, 1, 26), date(2025, 1, 31))]
+
+
+def test_today_is_refetched_every_time(db_client):
+    inner = RecordingAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+    today = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    adapter.get_historical_data("AAPL", today - timedelta(days=30), today, daily)
+    adapter.get_historical_data("AAPL", today - timedelta(days=30), today, daily)
+
+    assert len(inner.requests) == 2
+    assert inner.requests[-1][1] == inner.requests[-1][2] == today.date()
+
+
+def test_store_survives_restart(tmp_path):
+    db_path = str(tmp_path / "bars.duckdb")
+    inner = RecordingAdapter()
+    first_client = DuckDBClient(db_path)
+    CachedHistoricalDataAdapter(inner, first_client).get_historical_data(
+        "AAPL", datetime(2024, 1, 1), datetime(2024, 1, 5), daily
+    )
+    first_client.close()
+
+    restarted = CachedHistoricalDataAdapter(inner, DuckDBClient(db_path))
+    assert len(restarted.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 5), daily)) == 5
+    assert len(inner.requests) == 1
+
+
+def test_batch_groups_tickers_by_gap(db_client):
+    inner = RecordingAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+    adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 5), daily)
+
+    results = {r.ticker: r for r in adapter.get_historical_data_batch(
+        ["AAPL", "MSFT"], datetime(2024, 1, 1), datetime(2024, 1, 8), daily
+    )}
+
+    assert len(results["AAPL"].data) == 6 and len(results["MSFT"].data) == 6
+    assert ("AAPL", date(2024, 1, 6), date(2024, 1, 8), daily) in inner.requests
+    assert ("MSFT", date(2024, 1, 1), date(2024, 1, 8), daily) in inner.requests
+
+
+def test_uncached_increments_pass_through(db_client):
+    inner = RecordingAdapter()
+    adapter = CachedHistoricalDataAdapter(inner, db_client)
+    adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 5), weekly)
+    adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 5), weekly)
+    assert len(inner.requests) == 2
+    assert db_client.get_bars("AAPL", weekly).empty
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.tickers_adapters.cached_ticker_adapter import CachedTickerAdapter, TickerDiff
+from adapters.tickers_adapters.ticker_adapter import TickerAdapter
+from dbs.duck_db_client import DuckDBClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 2, 12, 0)
+
+    def __call__(self):
+        return self.now
+
+
+class ListTickerAdapter(TickerAdapter):
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.calls = 0
+
+    def fetch_tickers(self):
+        self.calls += 1
+        if self.tickers is None:
+            raise RuntimeError("source down")
+        return list(self.tickers)
+
+
+@pytest.fixture
+def db_client():
+    client = DuckDBClient(":memory:")
+    yield client
+    client.close()
+
+
+def test_fetch_tickers_serves_snapshot_until_refresh_is_due(db_client):
+    clock = FakeClock()
+    source = ListTickerAdapter(["AAPL", "MSFT"])
+    adapter = CachedTickerAdapter(source, universe="spx", db_client=db_client, clock=clock)
+
+    assert adapter.fetch_tickers() == ["AAPL", "MSFT"]
+    clock.now += timedelta(hours=23)
+    assert adapter.fetch_tickers() == ["AAPL", "MSFT"]
+    assert source.calls == 1
+
+    source.tickers = ["AAPL", "NVDA"]
+    clock.now += timedelta(hours=1)
+    assert adapter.fetch_tickers() == ["AAPL", "NVDA"]
+    assert source.calls == 2
+
+    # A new instance reads the persisted snapshot instead of fetching
+    restarted = CachedTickerAdapter(source, universe="spx", db_client=db_client, clock=clock)
+    assert restarted.fetch_tickers() == ["AAPL", "NVDA"]
+    assert source.calls == 2
+
+
+def test_stale_snapshot_is_served_when_refresh_fails(db_client):
+    clock = FakeClock()
+    source = ListTickerAdapter(["AAPL"])
+    adapter = CachedTickerAdapter(source, db_client=db_client, clock=clock)
+    adapter.fetch_tickers()
+
+    source.tickers = None
+    clock.now += timedelta(days=2)
+    assert adapter.fetch_tickers() == ["AAPL"]
+
+    empty = CachedTickerAdapter(source, universe="other", db_client=db_client, clock=clock)
+    with pytest.raises(RuntimeError):
+        empty.fetch_tickers()
+
+
+def test_diff_between_snapshots(db_client):
+    clock = FakeClock()
+    source = ListTickerAdapter(["AAPL", "MSFT", "XOM"])
+    adapter = CachedTickerAdapter(source, universe="spx", db_client=db_client, clock=clock)
+
+    first = adapter.refresh()
+    assert first == TickerDiff(["AAPL", "MSFT", "XOM"], [], None, clock.now)
+    start = clock.now
+
+    clock.now += timedelta(days=1)
+    source.tickers = ["AAPL", "MSFT", "NVDA"]
+    assert adapter.refresh()[:2] == (["NVDA"], ["XOM"])
+
+    clock.now += timedelta(days=1)
+    source.tickers = ["AAPL", "NVDA", "TSLA"]
+    adapter.refresh()
+    assert adapter.diff()[:2] == (["TSLA"], ["MSFT"])
+    since_start = adapter.diff(since=start)
+    assert since_start.added == ["NVDA", "TSLA"]
+    assert since_start.removed == ["MSFT", "XOM"]
+    assert since_start.previous_at == start
+    assert len(db_client.get_ticker_snapshot_times("spx")) == 3
@@ -0,0 +1,114 @@
+from datetime import date, datetime
+
+import pytest
+
+from adapters.market_status_adapters.calendar_market_status_adapter import (
+    CalendarMarketStatusAdapter,
+    EXCHANGE_TZ,
+    nyse_early_closes,
+    nyse_holidays,
+)
+from adapters.market_status_adapters.market_status_adapter import MarketStatusAdapter
+from registries.standards.adapter_standards import market_open, market_closed, market_pre_market
+
+
+def et(*args):
+    return datetime(*args, tzinfo=EXCHANGE_TZ).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMarketStatusAdapter(MarketStatusAdapter):
+    def __init__(self, status):
+        self.status = status
+
+    def get_market_status(self):
+        return self.status
+
+
+def test_nyse_holidays_2024_and_2025():
+    assert sorted(nyse_holidays(2024)) == [
+        date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 27),
+        date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2), date(2024, 11, 28), date(2024, 12, 25),
+    ]
+    holidays_2025 = nyse_holidays(2025)
+    assert date(2025, 4, 18) in holidays_2025  # Good Friday
+    assert date(2025, 1, 9) in holidays_2025   # national day of mourning
+    assert len(holidays_2025) == 11
+
+
+def test_observed_holidays_and_early_closes():
+    # 2021: July 4th on a Sunday is observed Monday, Christmas on a Saturday the Friday before
+    assert date(2021, 7, 5) in nyse_holidays(2021)
+    assert date(2021, 12, 24) in nyse_holidays(2021)
+    assert date(2021, 12, 24) not in nyse_early_closes(2021)
+    # 2022: New Year's Day on a Saturday is not made up
+    assert date(2021, 12, 31) not in nyse_holidays(2021)
+    assert date(2022, 1, 1) not in nyse_holidays(2022)
+    assert nyse_early_closes(2024) == {date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)}
+
+
+@pytest.mark.parametrize("moment, status", [
+    ((2024, 3, 28, 3, 59), market_closed),
+    ((2024, 3, 28, 4, 0), market_pre_market),
+    ((2024, 3, 28, 9, 29), market_pre_market),
+    ((2024, 3, 28, 9, 30), market_open),
+    ((2024, 3, 28, 15, 59), market_open),
+    ((2024, 3, 28, 16, 0), market_closed),   # post-market counts as closed
+    ((2024, 3, 29, 11, 0), market_closed),   # Good Friday
+    ((2024, 3, 30, 11, 0), market_closed),   # Saturday
+    ((2024, 11, 29, 12, 59), market_open),   # half day
+    ((2024, 11, 29, 13, 0), market_closed),
+    ((2024, 3, 10, 10, 0), market_closed),   # Sunday of the DST switch
+    ((2024, 3, 11, 9, 30), market_open),
+])
+def test_status_at(moment, status):
+    adapter = CalendarMarketStatusAdapter(clock=FakeClock(et(2024, 6, 1, 12, 0)))
+    assert adapter.status_at(et(*moment)) == status
+
+
+def test_get_market_status_uses_clock_and_extends_calendar():
+    clock = FakeClock(et(2024, 7, 3, 12, 0))
+    adapter = CalendarMarketStatusAdapter(clock=clock)
+    assert adapter.get_market_status() == market_open
+    clock.now = et(2030, 1, 2, 10, 0)
+    assert adapter.get_market_status() == market_open
+    assert adapter.get_session(date(2030, 1, 1)) is None
+
+
+def test_reconcile_overrides_until_next_interval():
+    clock = FakeClock(et(2024, 3, 28, 10, 0))
+    live = FakeMarketStatusAdapter(market_closed)
+    adapter = CalendarMarketStatusAdapter(
+        reconcile_adapter=live, reconcile_interval=60, clock=clock, start_background=False
+    )
+    assert adapter.reconcile() == market_closed
+    assert adapter.get_market_status() == market_closed
+    clock.now += 61
+    assert adapter.get_market_status() == market_open
+
+    live.status = market_open
+    adapter.reconcile()
+    assert adapter.get_market_status() == market_open
+
+
+def test_reconcile_keeps_the_calendar_when_the_live_status_lags_an_edge():
+    clock = FakeClock(et(2024, 3, 28, 9, 32))
+    live = FakeMarketStatusAdapter(market_pre_market)  # not yet flipped to open
+    adapter = CalendarMarketStatusAdapter(
+        reconcile_adapter=live, reconcile_interval=900, clock=clock, start_background=False
+    )
+    assert adapter.seconds_from_edge(clock.now) == 120
+    assert adapter.reconcile() == market_open
+    assert adapter.get_market_status() == market_open
+
+    # Still disagreeing once the grace period is over: an unscheduled event, so the live status wins
+    clock.now = et(2024, 3, 28, 9, 40)
+    assert adapter.reconcile() == market_pre_market
+    assert adapter.get_market_status() == market_pre_market
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from adapters.current_price_adapters.current_price_adapter import CurrentPriceAdapter
+from adapters.current_price_adapters import tiingo_current_price_adapter, yfinance_current_price_adapter
+from adapters.current_price_adapters.tiingo_current_price_adapter import TiingoCurrentPriceAdapter
+from adapters.current_price_adapters.yfinance_current_price_adapter import YFinanceCurrentPriceAdapter
+
+
+class FakeCurrentPriceAdapter(CurrentPriceAdapter):
+    def __init__(self):
+        self.threads = set()
+
+    def get_current_price(self, ticker):
+        self.threads.add(threading.get_ident())
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+        return float(len(ticker))
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def test_default_prices_concurrently_in_input_order():
+    adapter = FakeCurrentPriceAdapter()
+    prices = adapter.get_current_prices(["MSFT", "BAD", "A", "MSFT"], max_workers=3)
+    assert list(prices.items()) == [("MSFT", 4.0), ("BAD", None), ("A", 1.0)]
+    assert adapter.get_current_prices([]) == {}
+
+
+def test_yfinance_prices_from_one_bulk_download(monkeypatch):
+    index = pd.date_range("2024-01-02 14:30", periods=3, freq="min", tz="UTC")
+    columns = pd.MultiIndex.from_product([["AAPL", "GONE"], ["Open", "High", "Low", "Close", "Volume"]])
+    frame = pd.DataFrame(np.nan, index=index, columns=columns)
+    frame[("AAPL", "Close")] = [190.0, 190.555, np.nan]
+    calls, singles = [], []
+    monkeypatch.setattr(yfinance_current_price_adapter.yf, "download", lambda tickers, **kwargs: calls.append(tickers) or frame)
+
+    adapter = YFinanceCurrentPriceAdapter()
+    monkeypatch.setattr(adapter, "get_current_price", lambda ticker: singles.append(ticker) or 5.0)
+    prices = adapter.get_current_prices(["AAPL", "GONE"])
+
+    assert calls == [["AAPL", "GONE"]]
+    assert singles == ["GONE"]
+    assert prices == {"AAPL": 190.56, "GONE": 5.0}
+
+
+def test_tiingo_prices_from_iex_batches(monkeypatch):
+    requested = []
+
+    def fake_get(self, url, params=None):
+        requested.append(params["tickers"])
+        quotes = {"AAPL": {"ticker": "aapl", "tngoLast": 190.123}, "MSFT": {"ticker": "MSFT", "tngoLast": None, "last": 410.0}}
+        return FakeResponse([quotes[t] for t in params["tickers"].split(",") if t in quotes])
+
+    monkeypatch.setattr(tiingo_current_price_adapter.requests.Session, "get", fake_get)
+    adapter = TiingoCurrentPriceAdapter()
+    adapter.BATCH_CHUNK_SIZE = 2
+    monkeypatch.setattr(adapter, "get_current_price", lambda ticker: None)
+
+    prices = adapter.get_current_prices(["AAPL", "MSFT", "NOPE"])
+    assert requested == ["AAPL,MSFT", "NOPE"]
+    assert prices == {"AAPL": 190.12, "MSFT": 410.0, "NOPE": None}
@@ -0,0 +1,130 @@
+import threading
+from datetime import datetime
+
+import pandas as pd
+import pytest
+import requests
+
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
+from adapters.historical_data_adapters.yfinance_historical_data_adapter import YFinanceHistoricalDataAdapter
+from adapters.historical_data_adapters import yfinance_historical_data_adapter
+from registries.standards.adapter_standards import daily, df_close, df_datetime, df_volume, output_records
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 10)
+
+
+class FakeHistoricalDataAdapter(HistoricalDataAdapter):
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        with self.lock:
+            self.calls.append(ticker)
+        if ticker in self.failing:
+            raise RuntimeError(f"boom {ticker}")
+        return [{df_datetime: "2024-01-02T00:00:00.000Z", df_close: 1.0}]
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200):
+        self.payload = payload
+        self.status = status
+        self.text = str(payload)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise requests.HTTPError(f"{self.status} error", response=self)
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def get(self, url, params=None, headers=None):
+        return self.responses[url]
+
+
+def test_default_batch_reports_errors_per_ticker():
+    adapter = FakeHistoricalDataAdapter(failing={"BAD"})
+    results = {r.ticker: r for r in adapter.get_historical_data_batch(["AAPL", "BAD", "MSFT", "AAPL"], START, END)}
+
+    assert sorted(results) == ["AAPL", "BAD", "MSFT"]
+    assert sorted(adapter.calls) == ["AAPL", "BAD", "MSFT"]
+    assert results["AAPL"].error is None and results["AAPL"].data[0][df_close] == 1.0
+    assert isinstance(results["BAD"].error, RuntimeError)
+    assert results["BAD"].data == []
+
+
+def test_default_batch_empty_tickers():
+    assert list(FakeHistoricalDataAdapter().get_historical_data_batch([], START, END)) == []
+
+
+def test_tiingo_batch_uses_sessions_and_reports_http_errors(monkeypatch):
+    adapter = TiingoHistoricalDataAdapter()
+    ok_url = adapter.DAILY_URL.format(ticker="AAPL")
+    bad_url = adapter.DAILY_URL.format(ticker="BAD")
+    session = FakeSession({
+        ok_url: FakeResponse([{"date": "2024-01-02T00:00:00.000Z", "open": 1.234, "high": 2.0,
+                               "low": 1.0, "close": 1.567, "volume": 10.4}]),
+        bad_url: FakeResponse({"detail": "not found"}, status=404),
+    })
+    monkeypatch.setattr(adapter, "_get_session", lambda: session)
+
+    results = {r.ticker: r for r in adapter.get_historical_data_batch(["AAPL", "BAD"], START, END, daily, max_workers=2)}
+
+    assert results["AAPL"].error is None
+    assert results["AAPL"].data == [{df_datetime: "2024-01-02T00:00:00.000Z", "open": 1.23, df_close: 1.57,
+                                     "high": 2.0, "low": 1.0, df_volume: 10}]
+    assert isinstance(results["BAD"].error, requests.HTTPError)
+    # The single-ticker API keeps logging and returning an empty list
+    assert adapter.get_historical_data("BAD", START, END, daily) == []
+
+
+def test_tiingo_batch_rejects_invalid_increment_up_front():
+    with pytest.raises(ValueError):
+        TiingoHistoricalDataAdapter().get_historical_data_batch(["AAPL"], START, END, "1d")
+
+
+def test_yfinance_batch_splits_multi_ticker_download(monkeypatch):
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date")
+    columns = pd.MultiIndex.from_product([["AAPL", "GONE"], ["Open", "High", "Low", "Close", "Volume"]])
+    frame = pd.DataFrame(
+        [[1.111, 2.0, 1.0, 1.555, 100.0] + [float("nan")] * 5,
+         [1.2, 2.1, 1.1, 1.6, 200.0] + [float("nan")] * 5],
+        index=index, columns=columns,
+    )
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return frame
+
+    monkeypatch.setattr(yfinance_historical_data_adapter.yf, "download", fake_download)
+    results = {r.ticker: r for r in YFinanceHistoricalDataAdapter().get_historical_data_batch(["AAPL", "GONE"], START, END)}
+
+    assert calls == [["AAPL", "GONE"]]
+    assert [row[df_close] for row in results["AAPL"].data] == [1.55, 1.6]
+    assert results["AAPL"].data[0]["open"] == 1.11
+    assert results["GONE"].data == [] and results["GONE"].error is None
+
+
+def test_yfinance_batch_reports_download_failure_per_chunk(monkeypatch):
+    def fake_download(tickers, **kwargs):
+        if "BAD" in tickers:
+            raise RuntimeError("download failed")
+        return pd.DataFrame()
+
+    monkeypatch.setattr(yfinance_historical_data_adapter.yf, "download", fake_download)
+    adapter = YFinanceHistoricalDataAdapter()
+    adapter.BATCH_CHUNK_SIZE = 1
+    results = {r.ticker: r for r in adapter.get_historical_data_batch(["BAD", "AAPL"], START, END)}
+
+    assert isinstance(results["BAD"].error, RuntimeError)
+    assert results["AAPL"].error is None and results["AAPL"].data == []
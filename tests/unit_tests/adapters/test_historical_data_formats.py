@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.historical_data_adapters import yfinance_historical_data_adapter
+from adapters.historical_data_adapters.cached_historical_data_adapter import CachedHistoricalDataAdapter
+from adapters.historical_data_adapters.tiingo_historical_data_adapter import TiingoHistoricalDataAdapter
+from adapters.historical_data_adapters.yfinance_historical_data_adapter import YFinanceHistoricalDataAdapter
+from dbs.duck_db_client import DuckDBClient
+from registries.standards.adapter_standards import (
+    daily, df_datetime, df_open, df_high, df_low, df_close, df_volume,
+    output_records, output_dataframe, output_arrays
+)
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 10)
+
+TIINGO_PAYLOAD = [
+    {"date": "2024-01-02T00:00:00.000Z", "open": 1.234, "high": 2.0, "low": 1.0, "close": 1.567, "volume": 10.4},
+    {"date": "2024-01-03T00:00:00.000Z", "open": "bad", "high": 2.0, "low": 1.0, "close": 1.5, "volume": 10},
+    {"date": "2024-01-04T00:00:00.000Z", "open": 1.0, "high": 2.0, "low": 1.0, "close": 1.5},
+    {"date": "2024-01-05T00:00:00.000Z", "open": 3.005, "high": 4.129, "low": 2.991, "close": 3.5, "volume": 99.6},
+]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def get(self, url, params=None, headers=None):
+        return FakeResponse(self.payload)
+
+
+@pytest.fixture
+def tiingo_adapter(monkeypatch):
+    adapter = TiingoHistoricalDataAdapter()
+    session = FakeSession(TIINGO_PAYLOAD)
+    monkeypatch.setattr(adapter, "_get_session", lambda: session)
+    return adapter
+
+
+def test_tiingo_columnar_formats_match_records(tiingo_adapter):
+    records = tiingo_adapter.get_historical_data("AAPL", START, END, daily)
+    frame = tiingo_adapter.get_historical_data("AAPL", START, END, daily, output_format=output_dataframe)
+    arrays = tiingo_adapter.get_historical_data("AAPL", START, END, daily, output_format=output_arrays)
+
+    assert len(records) == len(frame) == len(arrays[df_close]) == 2
+    for col in (df_open, df_high, df_low, df_close, df_volume):
+        assert frame[col].tolist() == [record[col] for record in records]
+        assert arrays[col].tolist() == [record[col] for record in records]
+    assert frame[df_datetime].dtype == "datetime64[ns, UTC]"
+    assert arrays[df_datetime].dtype == np.dtype("datetime64[ns]")
+    assert arrays[df_close].dtype == np.float64 and arrays[df_close].flags["C_CONTIGUOUS"]
+    assert arrays[df_volume].dtype == np.int64
+
+
+def test_invalid_output_format_rejected(tiingo_adapter):
+    with pytest.raises(ValueError):
+        tiingo_adapter.get_historical_data("AAPL", START, END, daily, output_format="csv")
+
+
+def test_empty_response_in_columnar_format(monkeypatch):
+    adapter = TiingoHistoricalDataAdapter()
+    monkeypatch.setattr(adapter, "_get_session", lambda: FakeSession([]))
+    arrays = adapter.get_historical_data("AAPL", START, END, daily, output_format=output_arrays)
+    assert all(len(values) == 0 for values in arrays.values())
+    assert adapter.get_historical_data("AAPL", START, END, daily, output_format=output_dataframe).empty
+
+
+def test_yfinance_columnar_drops_missing_rows(monkeypatch):
+    hist = pd.DataFrame(
+        {"Open": [1.111, np.nan], "High": [2.0, 2.0], "Low": [1.0, 1.0], "Close": [1.555, 1.5], "Volume": [100.0, 5.0]},
+        index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date").tz_localize("America/New_York"),
+    )
+
+    class FakeTicker:
+        def __init__(self, ticker):
+            pass
+
+        def history(self, **kwargs):
+            return hist
+
+    monkeypatch.setattr(yfinance_historical_data_adapter.yf, "Ticker", FakeTicker)
+    adapter = YFinanceHistoricalDataAdapter()
+
+    records = adapter.get_historical_data("AAPL", START, END, daily)
+    assert records[1][df_open] is None
+    arrays = adapter.get_historical_data("AAPL", START, END, daily, output_format=output_arrays)
+    assert arrays[df_open].tolist() == [1.11]
+    assert arrays[df_datetime][0] == np.datetime64("2024-01-02T05:00:00")
+
+
+def test_cached_adapter_serves_columnar_formats(tiingo_adapter):
+    db_client = DuckDBClient(":memory:")
+    adapter = CachedHistoricalDataAdapter(tiingo_adapter, db_client)
+
+    frame = adapter.get_historical_data("AAPL", START, END, daily, output_format=output_dataframe)
+    records = adapter.get_historical_data("AAPL", START, END, daily, output_format=output_records)
+
+    assert frame[df_close].tolist() == [record[df_close] for record in records] == [1.57, 3.5]
+    assert records[0][df_datetime] == "2024-01-02T00:00:00.000Z"
+    db_client.close()
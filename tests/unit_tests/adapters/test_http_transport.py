@@ -0,0 +1,104 @@
+import glob
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import finnhub
+import pytest
+import requests
+
+from adapters.http_transport import (
+    DATE_PARAMS, Cassette, CassetteMiss, RecordingTransport, ReplayTransport, seed_from_tiingo_logs,
+)
+from adapters.request_scheduler import RequestScheduler
+from registries.standards.adapter_standards import provider_tiingo, market_open
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path.split("?")[0], "n": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_then_replay_without_the_server(local_server, tmp_path):
+    cassette = Cassette(str(tmp_path / "api.jsonl.gz"))
+    scheduler = RequestScheduler(limits={}, transport=RecordingTransport(cassette))
+    live = scheduler.get(provider_tiingo, f"{local_server}/prices", params={"ticker": "AAPL", "token": "secret"}).json()
+    assert live == {"path": "/prices", "n": 1}
+    assert len(cassette) == 1 and "secret" not in cassette.interactions[0].url
+    cassette.save()
+
+    replay = ReplayTransport(Cassette(cassette.path))
+    with scheduler.use_transport(replay):
+        # Same request with a different key still matches; the server is not needed
+        response = scheduler.get(provider_tiingo, f"{local_server}/prices", params={"ticker": "AAPL", "token": "other"})
+        assert response.json() == live and response.ok
+        with pytest.raises(requests.RequestException) as miss:
+            scheduler.get(provider_tiingo, f"{local_server}/prices", params={"ticker": "MSFT"})
+        assert isinstance(miss.value, CassetteMiss)
+    assert scheduler.transport is not replay and replay.requests == 2 and replay.misses == 1
+
+
+def test_injected_latency_is_seeded():
+    cassette = Cassette()
+    cassette.add("GET", "https://example.test/a", 200, "application/json", b"[]")
+
+    def delays(seed):
+        slept = []
+        transport = ReplayTransport(cassette, latency=0.05, jitter=0.01, seed=seed, sleep=slept.append)
+        session = requests.Session()
+        session.mount("https://", transport)
+        for _ in range(5):
+            assert session.get("https://example.test/a").json() == []
+        return slept
+
+    assert delays(1) == delays(1) != delays(2)
+    assert all(0.05 <= delay <= 0.06 for delay in delays(1))
+
+
+def test_tiingo_adapter_replays_captured_logs(monkeypatch):
+    from adapters.historical_data_adapters import tiingo_historical_data_adapter as tiingo_module
+
+    paths = glob.glob(str(PROJECT_ROOT / "logs" / "tiingo_intraday_5min_*.json"))
+    cassette = Cassette()
+    assert seed_from_tiingo_logs(cassette, paths) == len(paths) > 0
+    replay = ReplayTransport(cassette, ignore_params=DATE_PARAMS)
+    monkeypatch.setattr(tiingo_module, "request_scheduler", RequestScheduler(limits={}, transport=replay))
+
+    adapter = tiingo_module.TiingoHistoricalDataAdapter()
+    bars = adapter.get_historical_data("AAPL", datetime(2025, 7, 24), datetime(2025, 7, 25), "5min")
+    with open(sorted(paths)[0]) as file:
+        assert bars == json.load(file)
+    # Unrecorded requests fail like a network error and come back empty
+    assert adapter.get_historical_data("MSFT", datetime(2025, 7, 24), datetime(2025, 7, 25), "5min") == []
+
+
+def test_finnhub_client_calls_go_through_the_transport(monkeypatch):
+    from adapters.market_status_adapters import finnhub_market_status_adapter as finnhub_module
+
+    cassette = Cassette()
+    cassette.add("GET", f"{finnhub.Client.API_URL}//stock/market-status?exchange=US", 200, "application/json",
+                 json.dumps({"exchange": "US", "session": "regular"}).encode())
+    monkeypatch.setattr(finnhub_module, "request_scheduler", RequestScheduler(limits={}, transport=ReplayTransport(cassette)))
+    assert finnhub_module.FinnhubMarketStatusAdapter().get_market_status() == market_open
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from adapters.request_scheduler import RateLimit, RequestScheduler, request_priority, _current_priority
+from registries.standards.adapter_standards import priority_trading, priority_ranking, priority_backfill, daily, output_records
+
+
+def test_burst_then_rate_limited():
+    scheduler = RequestScheduler({"api": RateLimit(rate=50, burst=3)})
+    start = time.monotonic()
+    waits = [scheduler.acquire("api") for _ in range(6)]
+    elapsed = time.monotonic() - start
+
+    assert max(waits[:3]) < 0.005
+    assert 0.04 <= elapsed < 0.5  # three extra tokens at 50/s
+    stats = scheduler.stats()["api"]
+    assert stats["requests"] == 6
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait"] > 0
+
+
+def test_buckets_are_per_api_key_and_unknown_providers_are_unthrottled():
+    scheduler = RequestScheduler({"api": RateLimit(rate=0.001, burst=1)})
+    scheduler.acquire("api", key="first")
+    assert scheduler.acquire("api", key="second") < 0.005
+    for _ in range(100):
+        scheduler.acquire("other")
+    stats = scheduler.stats()
+    assert stats["other"]["requests"] == 100
+    assert len([name for name in stats if name.startswith("api:")]) == 2
+    assert not any("first" in name for name in stats)  # keys are not exposed
+
+
+def test_use_limits_is_scoped_to_the_block():
+    scheduler = RequestScheduler({"api": RateLimit(rate=0.001, burst=1)})
+    scheduler.acquire("api")
+    with scheduler.use_limits({}):
+        for _ in range(50):
+            assert scheduler.acquire("api") < 0.005
+        assert scheduler.stats()["api"]["requests"] == 50
+    # The original bucket, still empty, is back
+    assert scheduler.limits == {"api": RateLimit(rate=0.001, burst=1)}
+    assert scheduler.stats()["api"]["requests"] == 1 and scheduler.stats()["api"]["tokens"] < 1
+
+
+def test_queued_requests_run_by_priority():
+    scheduler = RequestScheduler({"api": RateLimit(rate=20, burst=1)})
+    scheduler.acquire("api")  # drain the bucket so every request below queues
+    order = []
+    lock = threading.Lock()
+
+    def request(priority):
+        scheduler.acquire("api", priority=priority)
+        with lock:
+            order.append(priority)
+
+    threads = []
+    for priority in (priority_backfill, priority_ranking, priority_backfill, priority_trading):
+        thread = threading.Thread(target=request, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.005)
+    assert scheduler.queue_depth("api") >= 3
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # The first backfill request may already hold the head of the queue; the rest follow priority order
+    assert order[-3:] == [priority_trading, priority_ranking, priority_backfill] or order == [
+        priority_trading, priority_ranking, priority_backfill, priority_backfill
+    ]
+    stats = scheduler.stats()["api"]
+    assert stats["max_queue_depth"] >= 3
+    assert "mean_wait_trading" in stats and "mean_wait_backfill" in stats
+
+
+def test_request_priority_follows_batch_workers():
+    seen = []
+
+    class PriorityRecordingAdapter(HistoricalDataAdapter):
+        def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+            seen.append(_current_priority.get())
+            return []
+
+    with request_priority(priority_backfill):
+        list(PriorityRecordingAdapter().get_historical_data_batch(["A", "B", "C"], None, None))
+    assert seen == [priority_backfill] * 3
+    assert _current_priority.get() == priority_ranking
+
+    with pytest.raises(ValueError):
+        with request_priority("urgent"):
+            pass
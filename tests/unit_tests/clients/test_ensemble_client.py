@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from clients.ensemble_client import EnsembleClient, SharedBars
+from clients.metrics_client import kind_strategy, metrics
+from strategies.strategy_cache import StrategyResultCache
+from strategies.talib_strategy import AD_Strategy
+from registries.standards.adapter_standards import intraday_5min, df_datetime, df_close
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+class LastCloseStrategy(AD_Strategy):
+    """Scores the distance between the current price and the last close; fails on read-only violations."""
+
+    def get_strategy_name(self):
+        return "last_close"
+
+    def get_ideal_period(self):
+        return intraday_5min
+
+    def run_strategy(self, historical_data, current_price):
+        closes = historical_data[df_close]
+        if len(closes) < 2:
+            raise ValueError("need two bars")
+        return float(np.clip(current_price / closes[-1] - 1, -1, 1))
+
+
+def make_universe(n_tickers=6, seed=0):
+    data = {}
+    for i in range(n_tickers):
+        frame = generate_ohlcv(tickers=[f"T{i}"], n_bars=20 + 5 * i, seed=seed + i)[f"T{i}"]
+        # Mix the output formats the adapters can return
+        data[f"T{i}"] = [frame, frame.to_dict("records"), {c: frame[c].to_numpy() for c in frame}][i % 3]
+    data["SHORT"] = data["T0"].iloc[:1]
+    return data
+
+
+def test_pool_matches_serial_run_in_input_order():
+    data = make_universe()
+    prices = {"T1": 150.0}
+    serial = EnsembleClient([AD_Strategy, LastCloseStrategy], max_workers=1).run(data, prices)
+    pooled = EnsembleClient([AD_Strategy, LastCloseStrategy], max_workers=3, chunk_size=1, start_method="fork").run(data, prices)
+
+    assert [(r.ticker, r.strategy) for r in pooled] == [
+        (ticker, name) for ticker in data for name in ("chaikin_ad_line", "last_close")
+    ]
+    assert [r.score for r in pooled] == [r.score for r in serial]
+    assert pooled[3].score == pytest.approx(150.0 / data["T1"][-1][df_close] - 1)
+
+    frame = data["T0"]
+    assert pooled[0].score == AD_Strategy().run_strategy(frame, frame[df_close].iloc[-1])
+    # Failures are reported per task and do not stop the run
+    short = [r for r in pooled if r.ticker == "SHORT"]
+    assert all(r.score is None and isinstance(r.error, ValueError) for r in short)
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_worker_metrics_are_merged_into_the_parent(start_method):
+    data = make_universe()
+    metrics.reset()
+    metrics.configure(1.0)
+    try:
+        EnsembleClient([AD_Strategy, LastCloseStrategy], max_workers=2, chunk_size=3, start_method=start_method).run(data)
+        series = [entry for entry in metrics.snapshot()["series"] if entry["kind"] == kind_strategy]
+    finally:
+        metrics.configure(0.0)
+        metrics.reset()
+
+    calls = {name: sum(entry["calls"] for entry in series if entry["name"] == name) for name in ("chaikin_ad_line", "last_close")}
+    assert calls == {"chaikin_ad_line": len(data), "last_close": len(data)}
+    assert sum(entry["errors"] for entry in series if entry["name"] == "last_close") == 1
+    assert all(sum(entry["latency"]["buckets"].values()) == entry["calls"] for entry in series)
+
+
+def test_cache_skips_unchanged_tasks_before_sharding():
+    data = make_universe()
+    cache = StrategyResultCache()
+    client = EnsembleClient([AD_Strategy, LastCloseStrategy], max_workers=2, start_method="fork", cache=cache, tick_increment=intraday_5min)
+    uncached = EnsembleClient([AD_Strategy, LastCloseStrategy], max_workers=1)
+
+    def scores(results):
+        return [(r.ticker, r.strategy, r.score) for r in results]
+
+    assert scores(client.run(data)) == scores(uncached.run(data))
+    assert cache.stats()["hits"] == 0
+
+    # The next 5min cycle moves every price: the daily agent ignores it and is served from the cache,
+    # the 5min agent reruns; the failing SHORT task is never cached
+    prices = {ticker: 1000.0 for ticker in data}
+    cycle = client.run(data, prices)
+    assert scores(cycle) == scores(uncached.run(data, prices))
+    assert cache.stats()["hits"] == len(data) - 1
+    assert cache.stats()["hit_rate"] == pytest.approx((len(data) - 1) / (4 * len(data)))
+    assert isinstance(cycle[-1].error, ValueError)
+
+
+def test_shared_bars_round_trip_and_cleanup():
+    data = make_universe(3)
+    with SharedBars.create(data) as bars:
+        attached = SharedBars.attach(bars.spec)
+        arrays = attached.arrays(1)
+        np.testing.assert_array_equal(arrays[df_close], [row[df_close] for row in data["T1"]])
+        assert arrays[df_datetime][0] == np.datetime64(data["T1"][0][df_datetime].tz_localize(None))
+        assert not arrays[df_close].flags.writeable
+        del arrays
+        attached.close()
+        name = bars.memory.name
+
+    with pytest.raises(FileNotFoundError):
+        SharedBars.attach(bars.spec._replace(name=name))
+
+
+def test_empty_runs():
+    assert EnsembleClient([AD_Strategy]).run({}) == []
+    assert EnsembleClient([]).run(make_universe(1)) == []
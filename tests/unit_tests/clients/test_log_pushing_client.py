@@ -0,0 +1,126 @@
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+from clients.log_pushing_client import LogPushingClient, LogPushingHandler
+from dbs.duck_db_client import DuckDBClient
+from pipelines.log_pushing_pipeline import run_log_pushing_pipeline
+
+
+@pytest.fixture
+def test_logger():
+    logger = logging.getLogger("tests.log_pushing")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+
+class BlockingDBClient:
+    def __init__(self, fail=False):
+        self.release = threading.Event()
+        self.rows = []
+        self.fail = fail
+
+    def insert_logs(self, rows):
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("db down")
+        self.rows.extend(rows)
+        return len(rows)
+
+
+def test_records_are_written_in_batches(test_logger):
+    db = DuckDBClient(":memory:")
+    client = run_log_pushing_pipeline(db, logging.INFO, test_logger, batch_size=500, flush_interval=30)
+    for i in range(1200):
+        test_logger.info("tick %d", i)
+    test_logger.debug("below the shipped level")
+    try:
+        test_logger.error("failed", exc_info=ValueError("boom"))
+    finally:
+        client.close(timeout=5)
+
+    logs = db.get_logs()
+    assert len(logs) == 1201 and client.stats()["batches"] >= 3
+    assert logs["message"].iloc[0] == "tick 0" and logs["logger"].iloc[0] == "tests.log_pushing"
+    errors = db.get_logs(min_level=logging.ERROR)
+    assert len(errors) == 1 and "ValueError: boom" in errors["message"].iloc[0]
+    assert not any(isinstance(handler, LogPushingHandler) for handler in test_logger.handlers)
+
+
+def test_overload_samples_low_levels_then_drops():
+    client = LogPushingClient(BlockingDBClient(), max_queue=100, batch_size=1000, overload_threshold=0.5, overload_sample_rate=0.25)
+    record = lambda level: logging.LogRecord("x", level, __file__, 1, "m", None, None)
+    assert all(client.push(record(logging.INFO)) for _ in range(50))
+    kept = sum(client.push(record(logging.INFO)) for _ in range(40))
+    assert kept == 10 and client.sampled_out == 30
+    assert all(client.push(record(logging.WARNING)) for _ in range(40))
+    assert not client.push(record(logging.ERROR))
+    assert client.stats() == {"queued": 100, "enqueued": 100, "written": 0, "dropped": 1, "sampled_out": 30, "batches": 0, "failures": 0, "malformed": 0}
+
+
+def test_malformed_records_are_skipped_and_the_writer_survives():
+    db = DuckDBClient(":memory:")
+    client = LogPushingClient(db, batch_size=2, flush_interval=0.01).start()
+    record = lambda msg, *args: logging.LogRecord("x", logging.INFO, __file__, 1, msg, args, None)
+    broken = record("no timestamp")
+    broken.created = None
+    try:
+        assert not client.push(record("%d", "x"))
+        assert client.push(broken) and client.push(record("before"))
+        time.sleep(0.1)
+        # The writer shipped the good record of the batch and is still running
+        assert client.stats()["written"] == 1 and client._thread.is_alive()
+        client.push(record("after"))
+    finally:
+        client.close(timeout=5)
+    assert db.get_logs()["message"].tolist() == ["before", "after"]
+    assert client.stats()["malformed"] == 2 and client.stats()["failures"] == 0
+
+
+def test_records_are_snapshotted_when_pushed():
+    client = LogPushingClient(BlockingDBClient())
+    state = {"position": 1}
+    assert client.push(logging.LogRecord("x", logging.INFO, __file__, 1, "state %s", (state,), None))
+    state["position"] = 2
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    original = logging.LogRecord("x", logging.ERROR, __file__, 1, "failed", None, exc_info)
+    assert client.push(original)
+    assert original.exc_info is exc_info  # other handlers still see the exception
+
+    queued = list(client._queue)
+    assert queued[0].getMessage() == "state {'position': 1}" and queued[0].args is None
+    assert queued[1].exc_info is None and queued[1].getMessage().startswith("failed\nTraceback")
+    assert "ValueError: boom" in client._to_row(queued[1])[4]
+
+
+def test_logging_never_waits_on_a_slow_or_failing_db(test_logger):
+    db = BlockingDBClient(fail=True)
+    client = LogPushingClient(db, batch_size=1, flush_interval=0.01)
+    client.install(test_logger)
+    test_logger.info("first")
+    time.sleep(0.05)  # the writer is now stuck in insert_logs
+
+    start = time.perf_counter()
+    for i in range(1000):
+        test_logger.info("during outage %d", i)
+    assert (time.perf_counter() - start) / 1000 < 1e-4
+
+    # The writer's own failure report is not fed back into the queue
+    handler = next(handler for handler in test_logger.handlers if isinstance(handler, LogPushingHandler))
+    logging.getLogger("clients.log_pushing_client").addHandler(handler)
+    try:
+        db.release.set()
+        client.close(timeout=5)
+    finally:
+        logging.getLogger("clients.log_pushing_client").removeHandler(handler)
+    stats = client.stats()
+    assert stats["queued"] == 0 and stats["failures"] >= 1 and stats["written"] == 0
+    assert stats["dropped"] == 1001
@@ -0,0 +1,199 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.http_transport import Cassette, ReplayTransport
+from adapters.request_scheduler import RequestScheduler
+from adapters.tickers_adapters.ticker_adapter import TickerAdapter
+from clients.metrics_client import MetricsClient, kind_historical_data, kind_tickers, metrics
+from registries.standards.adapter_standards import provider_tiingo
+from strategies.talib_strategy import AD_Strategy
+
+
+class StaticTickerAdapter(TickerAdapter):
+    def __init__(self, tickers=None, fail=False):
+        self.tickers = tickers or ["AAPL", "MSFT"]
+        self.fail = fail
+
+    def fetch_tickers(self):
+        if self.fail:
+            raise RuntimeError("scrape failed")
+        return self.tickers
+
+
+class WrappingTickerAdapter(StaticTickerAdapter):
+    def fetch_tickers(self):
+        # Calls the instrumented parent on the same object; only counted once
+        return super().fetch_tickers()
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.configure(1.0)
+    yield metrics
+    metrics.configure(0.0)
+    metrics.reset()
+
+
+def series(snapshot, kind):
+    return [entry for entry in snapshot["series"] if entry["kind"] == kind]
+
+
+def test_disabled_path_never_measures(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("measured while disabled")
+
+    # The overhead of this path is timed by the metrics.* cases in tests/benchmarks
+    monkeypatch.setattr(metrics, "measure", fail)
+    monkeypatch.setattr(metrics, "record", fail)
+    assert not metrics.enabled
+    assert StaticTickerAdapter().fetch_tickers() == ["AAPL", "MSFT"]
+    assert metrics.call(kind_tickers, StaticTickerAdapter(), None, sum, [1, 2]) == 3
+    assert metrics.snapshot()["series"] == []
+
+
+def test_calls_rows_errors_and_ticker_buckets(enabled_metrics):
+    assert WrappingTickerAdapter().fetch_tickers() == ["AAPL", "MSFT"]
+    with pytest.raises(RuntimeError):
+        StaticTickerAdapter(fail=True).fetch_tickers()
+
+    frame = pd.DataFrame({
+        "DateTime": pd.date_range("2024-01-01", periods=60, tz="UTC"),
+        "open": np.linspace(10, 20, 60), "high": np.linspace(11, 21, 60), "low": np.linspace(9, 19, 60),
+        "close": np.linspace(10.5, 20.5, 60), "volume": np.full(60, 1000),
+    })
+    strategy = AD_Strategy()
+    with enabled_metrics.ticker_scope("AAPL"):
+        strategy.run_strategy(frame, 20.5)
+    strategy.run_strategy(frame, 20.5)
+
+    snapshot = enabled_metrics.snapshot()
+    tickers = {entry["name"]: entry for entry in series(snapshot, "tickers")}
+    assert tickers["WrappingTickerAdapter"]["calls"] == 1 and tickers["WrappingTickerAdapter"]["rows"] == 2
+    assert tickers["StaticTickerAdapter"]["errors"] == 1
+    strategies = series(snapshot, "strategy")
+    assert {entry["ticker_bucket"] for entry in strategies} == {enabled_metrics.ticker_bucket("AAPL"), "-"}
+    assert all(entry["name"] == "chaikin_ad_line" and entry["rows"] == 60 for entry in strategies)
+    latency = strategies[0]["latency"]
+    assert sum(latency["buckets"].values()) == 1 and latency["min"] <= latency["p50"] <= latency["max"]
+
+
+def test_http_bytes_and_failed_requests_are_attributed(enabled_metrics, monkeypatch):
+    from adapters.historical_data_adapters import tiingo_historical_data_adapter as tiingo_module
+
+    body = json.dumps([{"date": "2024-01-02T00:00:00.000Z", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}]).encode()
+    cassette = Cassette()
+    cassette.add("GET", f"{tiingo_module.TiingoHistoricalDataAdapter.DAILY_URL.format(ticker='AAPL')}?resampleFreq=daily", 200, "application/json", body)
+    cassette.add("GET", f"{tiingo_module.TiingoHistoricalDataAdapter.DAILY_URL.format(ticker='MSFT')}?resampleFreq=daily", 500, "text/plain", b"oops")
+    replay = ReplayTransport(cassette, ignore_params=("startDate", "endDate"))
+    monkeypatch.setattr(tiingo_module, "request_scheduler", RequestScheduler(limits={}, transport=replay))
+
+    adapter = tiingo_module.TiingoHistoricalDataAdapter()
+    assert len(adapter.get_historical_data("AAPL", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05"))) == 1
+    assert adapter.get_historical_data("MSFT", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05")) == []
+
+    entries = {entry["ticker_bucket"]: entry for entry in series(enabled_metrics.snapshot(), "historical_data")}
+    aapl, msft = entries[enabled_metrics.ticker_bucket("AAPL")], entries[enabled_metrics.ticker_bucket("MSFT")]
+    assert (aapl["bytes"], aapl["rows"], aapl["errors"]) == (len(body), 1, 0)
+    assert (msft["bytes"], msft["errors"]) == (4, 1)
+
+
+def test_batch_fetches_are_measured_per_ticker(enabled_metrics, monkeypatch):
+    from adapters.historical_data_adapters import tiingo_historical_data_adapter as tiingo_module
+    from adapters.historical_data_adapters import yfinance_historical_data_adapter as yfinance_module
+
+    body = json.dumps([{"date": "2024-01-02T00:00:00.000Z", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}]).encode()
+    cassette = Cassette()
+    cassette.add("GET", f"{tiingo_module.TiingoHistoricalDataAdapter.DAILY_URL.format(ticker='AAPL')}?resampleFreq=daily", 200, "application/json", body)
+    monkeypatch.setattr(tiingo_module, "request_scheduler", RequestScheduler(limits={}, transport=ReplayTransport(cassette, ignore_params=("startDate", "endDate"))))
+    results = {result.ticker: result for result in tiingo_module.TiingoHistoricalDataAdapter().get_historical_data_batch(
+        ["AAPL", "MSFT"], pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05"))}
+    assert results["MSFT"].error is not None
+
+    def failed_download(tickers, **kwargs):
+        raise RuntimeError("download failed")
+
+    monkeypatch.setattr(yfinance_module.yf, "download", failed_download)
+    assert all(result.error for result in yfinance_module.YFinanceHistoricalDataAdapter().get_historical_data_batch(
+        ["AAPL", "MSFT"], pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05")))
+
+    entries = {(entry["name"], entry["ticker_bucket"]): entry for entry in series(enabled_metrics.snapshot(), "historical_data")}
+    aapl, msft = enabled_metrics.ticker_bucket("AAPL"), enabled_metrics.ticker_bucket("MSFT")
+    tiingo_aapl, tiingo_msft = entries[("TiingoHistoricalDataAdapter", aapl)], entries[("TiingoHistoricalDataAdapter", msft)]
+    assert (tiingo_aapl["calls"], tiingo_aapl["rows"], tiingo_aapl["bytes"], tiingo_aapl["errors"]) == (1, 1, len(body), 0)
+    assert (tiingo_msft["calls"], tiingo_msft["errors"]) == (1, 1)
+    assert all(entries[("YFinanceHistoricalDataAdapter", bucket)]["errors"] == 1 for bucket in (aapl, msft))
+
+
+def test_export_to_file_and_endpoint(enabled_metrics, tmp_path):
+    StaticTickerAdapter().fetch_tickers()
+    path = tmp_path / "metrics" / "snapshots.jsonl"
+    enabled_metrics.export(str(path))
+    enabled_metrics.export(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[1])["series"][0]["calls"] == 1
+
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        enabled_metrics.export(f"http://127.0.0.1:{server.server_address[1]}/metrics")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert received[0]["series"][0]["name"] == "StaticTickerAdapter"
+
+
+def test_snapshots_merge_across_clients():
+    worker, parent = MetricsClient(1.0), MetricsClient(1.0)
+    for seconds in (1e-5, 2e-3, 0.5):
+        worker.record(kind_tickers, "StaticTickerAdapter", None, seconds, rows=2)
+    parent.record(kind_tickers, "StaticTickerAdapter", None, 3e-3, rows=2, error=True)
+    expected = MetricsClient(1.0)
+    expected.merge(parent.snapshot())
+    expected.merge(worker.snapshot())
+
+    parent.merge(worker.snapshot(reset=True))
+    assert worker.snapshot()["series"] == []
+    assert parent.snapshot()["series"] == expected.snapshot()["series"]
+    (entry,) = parent.snapshot()["series"]
+    assert (entry["calls"], entry["errors"], entry["rows"]) == (4, 1, 8)
+    assert entry["latency"]["min"] == 1e-5 and entry["latency"]["max"] == 0.5
+    assert sum(entry["latency"]["buckets"].values()) == 4
+
+
+def test_batch_scope_charges_each_ticker_a_share_of_the_shared_work():
+    now = [0.0]
+    client = MetricsClient(1.0, clock=lambda: now[0])
+    adapter = StaticTickerAdapter()
+    with client.batch(kind_historical_data, adapter, ["AAPL", "MSFT"]) as batch:
+        now[0] += 0.5  # the download
+    assert batch.call("AAPL", lambda: [{"close": 1.0}] * 3) == [{"close": 1.0}] * 3
+    with pytest.raises(ValueError):
+        batch.call("MSFT", lambda: (_ for _ in ()).throw(ValueError("bad frame")))
+    with pytest.raises(RuntimeError):
+        with client.batch(kind_historical_data, adapter, ["NVDA"]):
+            now[0] += 0.125
+            raise RuntimeError("download failed")
+
+    by_bucket = {entry["ticker_bucket"]: entry for entry in client.snapshot()["series"]}
+    assert len(by_bucket) == 3
+    aapl, msft, nvda = (by_bucket[client.ticker_bucket(ticker)] for ticker in ("AAPL", "MSFT", "NVDA"))
+    assert (aapl["calls"], aapl["rows"], aapl["errors"], aapl["latency"]["total"]) == (1, 3, 0, 0.25)
+    assert (msft["errors"], msft["latency"]["total"]) == (1, 0.25)
+    assert (nvda["errors"], nvda["latency"]["total"], nvda["name"]) == (1, 0.125, "StaticTickerAdapter")
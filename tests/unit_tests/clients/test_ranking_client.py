@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+from clients.ranking_client import RankingClient
+
+
+def reference_stats(returns, periods_per_year=252):
+    std = returns.std()
+    equity = np.concatenate([[1.0], np.cumprod(1 + returns)])
+    active = returns != 0
+    return {
+        "mean_return": returns.mean(),
+        "sharpe": returns.mean() / std * math.sqrt(periods_per_year) if std > 0 else 0.0,
+        "hit_rate": (returns[active] > 0).mean() if active.any() else 0.0,
+        "drawdown": equity[-1] / equity.max() - 1,
+    }
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_sliding_statistics_match_full_recomputation(window):
+    rng = np.random.default_rng(window)
+    returns = rng.normal(0.001, 0.02, (3, 60))
+    returns[1, ::4] = 0.0
+    client = RankingClient(["a", "b", "c"], window=window)
+
+    for t in range(returns.shape[1]):
+        client.update(returns[:, t])
+        stats = client.stats()
+        start = max(0, t + 1 - window)
+        for i, agent in enumerate(client.agents):
+            for key, value in reference_stats(returns[i, start:t + 1]).items():
+                assert stats[agent][key] == pytest.approx(value, abs=1e-9), (t, agent, key)
+
+
+def test_recompute_matches_incremental_state():
+    rng = np.random.default_rng(0)
+    client = RankingClient(["a", "b"], window=10)
+    client.warm_up(rng.normal(0, 0.01, (2, 37)))
+    before = client.stats()
+    client.recompute()
+    after = client.stats()
+    for agent in client.agents:
+        for key in before[agent]:
+            assert after[agent][key] == pytest.approx(before[agent][key], abs=1e-12)
+    # Updates keep working from the rebuilt state
+    client.update({"a": -0.5})
+    assert client.stats()["a"]["drawdown"] == pytest.approx(-0.5, abs=0.05)
+
+
+def test_coefficients_favour_better_agents():
+    client = RankingClient(["steady", "noisy", "losing"], window=4)
+    assert client.coefficients() == pytest.approx({"steady": 1 / 3, "noisy": 1 / 3, "losing": 1 / 3})
+
+    for returns in ([0.01, 0.03, -0.01], [0.012, -0.02, -0.02], [0.011, 0.02, -0.015]):
+        client.update(returns)
+    coefficients = client.coefficients()
+    assert sum(coefficients.values()) == pytest.approx(1.0)
+    assert client.ranking() == ["steady", "noisy", "losing"]
+    assert coefficients["steady"] > coefficients["noisy"] > coefficients["losing"] > 0
+
+
+def test_rejects_unknown_agents_and_bad_shapes():
+    client = RankingClient(["a"])
+    with pytest.raises(ValueError):
+        client.update({"b": 0.1})
+    with pytest.raises(ValueError):
+        client.update([0.1, 0.2])
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from clients.testing_client import TestingClient
+from pipelines.testing_pipeline import run_testing_pipeline
+from strategies.cross_sectional_engine import BarMatrix
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from registries.standards.adapter_standards import daily, output_records
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+def make_bars(close):
+    close = np.asarray(close, dtype=np.float64)
+    days = np.arange(close.shape[1]).astype("datetime64[D]").astype("datetime64[ns]")
+    return BarMatrix([f"T{i}" for i in range(close.shape[0])], days, close, close, close, close, np.ones_like(close))
+
+
+def test_positions_are_held_until_the_next_close():
+    bars = make_bars([[100, 110, 99, 99], [50, 50, 55, 55]])
+    always_long = np.ones(bars.shape)
+    # Bullish only on the bar before T0 rises; bearish sentiment is ignored in long-only mode
+    timed = np.array([[1.0, -1.0, np.nan, 0], [0.0, 1.0, 0, 0]])
+    result = TestingClient(cost_bps=0).run(bars, {"long": always_long, "timed": timed})
+
+    np.testing.assert_allclose(result.portfolio_returns[0], [0.05, (-0.1 + 0.1) / 2, 0.0])
+    np.testing.assert_allclose(result.portfolio_returns[1], [0.05, 0.05, 0.0])
+    np.testing.assert_allclose(result.ticker_returns[0], [-0.01, 0.1])
+    assert result.metrics["timed"]["total_return"] == pytest.approx(1.05 * 1.05 - 1)
+    assert result.metrics["long"]["max_drawdown"] == pytest.approx(0.0)
+    assert TestingClient.rank(result, "total_return") == ["timed", "long"]
+
+
+def test_costs_and_shorts():
+    bars = make_bars([[100, 90, 90]])
+    short = np.array([[-1.0, 0.0, 0.0]])
+    result = TestingClient(cost_bps=10, long_only=False).run(bars, {"short": short})
+    # Entry cost on the first bar, exit cost when the position is closed on the second
+    np.testing.assert_allclose(result.portfolio_returns[0], [0.1 - 0.001, -0.001])
+    assert result.metrics["short"]["turnover"] == pytest.approx(1.0)
+    assert result.metrics["short"]["exposure"] == pytest.approx(-0.5)
+
+
+def test_rejects_misaligned_sentiments():
+    bars = make_bars([[1, 2, 3]])
+    with pytest.raises(ValueError):
+        TestingClient().run(bars, {"bad": np.zeros((1, 2))})
+
+
+def test_many_agents_in_one_pass():
+    rng = np.random.default_rng(0)
+    bars = BarMatrix.from_historical_data(generate_ohlcv(200, 252))
+    sentiments = {f"agent{i}": rng.uniform(-1, 1, bars.shape) for i in range(50)}
+    result = TestingClient().run(bars, sentiments)
+    assert result.portfolio_returns.shape == (50, 251)
+    assert set(result.metrics) == set(sentiments)
+
+
+class FrameAdapter(HistoricalDataAdapter):
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        if ticker not in self.frames:
+            raise RuntimeError("unknown ticker")
+        return self.frames[ticker]
+
+
+def test_testing_pipeline_backtests_registered_indicators():
+    frames = generate_ohlcv(tickers=["AAA", "BBB"], n_bars=80, seed=1)
+    result = run_testing_pipeline(datetime(2024, 1, 1), datetime(2024, 3, 31), tickers=["AAA", "BBB", "MISSING"],
+                                  indicators=["RSI", "SMA"], historical_data_adapter=FrameAdapter(frames))
+    assert result.agents == ["RSI", "SMA"]
+    assert result.tickers == ["AAA", "BBB"]
+    assert result.portfolio_returns.shape == (2, 79)
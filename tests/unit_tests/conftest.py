@@ -0,0 +1,18 @@
+import sys
+import types
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Unit tests never reach the real APIs, so provide placeholder keys when config.py is absent
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType("config")
+    config.Tiingo_API_KEY = "test-tiingo-key"
+    config.FMP_API_KEY = "test-fmp-key"
+    config.FINNHUB_API_KEY = "test-finnhub-key"
+    sys.modules["config"] = config
@@ -0,0 +1,154 @@
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from clients.ranking_client import RankingClient
+from dbs.db_client import SentimentRecord
+from dbs.duck_db_client import DuckDBClient, RANKING_COLUMNS
+from pipelines.ranking_pipeline import run_ranking_pipeline
+from registries.standards.adapter_standards import daily, intraday_1hour, df_datetime, df_open, df_high, df_low, df_close, df_volume, output_records
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+T0 = datetime(2024, 3, 1)
+
+
+@pytest.fixture
+def db():
+    client = DuckDBClient(":memory:")
+    yield client
+    client.close()
+
+
+@pytest.mark.parametrize("window", [1, 5, 40])
+def test_sql_ranking_matches_the_online_ranking_client(db, window):
+    rng = np.random.default_rng(3)
+    agents = ["rsi", "macd", "flat", "bust"]
+    returns = rng.normal(0.0005, 0.01, (len(agents), 120))
+    returns[2] = 0.001
+    returns[3, 100] = -1.5  # clamped like RankingClient does
+    datetimes = pd.date_range(T0, periods=returns.shape[1], freq="D", tz="UTC")
+    assert db.save_agent_returns(agents, datetimes, returns) == returns.size
+    # Re-saving replaces rows instead of duplicating them
+    db.save_agent_returns(agents, datetimes[-10:], returns[:, -10:])
+
+    ranking = db.rank_agents(window=window, periods_per_year=252, temperature=0.5)
+    client = RankingClient(agents, window=window, periods_per_year=252, temperature=0.5)
+    client.warm_up(returns)
+    stats, coefficients = client.stats(), client.coefficients()
+
+    assert list(ranking) == RANKING_COLUMNS and all(isinstance(column, np.ndarray) for column in ranking.values())
+    assert ranking["strategy"].tolist() == sorted(agents, key=lambda agent: (-stats[agent]["sharpe"], agent))
+    for i, agent in enumerate(ranking["strategy"]):
+        for key in ("count", "mean_return", "volatility", "sharpe", "hit_rate", "drawdown"):
+            assert ranking[key][i] == pytest.approx(stats[agent][key], rel=1e-7, abs=1e-10), key
+        assert ranking["coefficient"][i] == pytest.approx(coefficients[agent])
+
+    # as_of ranks on the history up to that bar only
+    earlier = db.rank_agents(window=window, as_of=datetimes[59])
+    client.reset()
+    client.warm_up(returns[:, :60])
+    assert dict(zip(earlier["strategy"], earlier["sharpe"])) == pytest.approx({a: s["sharpe"] for a, s in client.stats().items()})
+
+
+def test_rolling_returns_compound_over_the_window(db):
+    db.save_agent_returns(["a"], pd.date_range(T0, periods=4, freq="D"), np.array([[0.1, -0.1, 0.2, 0.0]]))
+    rolling = db.rolling_agent_returns(window=2)
+    np.testing.assert_allclose(rolling["rolling_return"], [0.1, 1.1 * 0.9 - 1, 0.9 * 1.2 - 1, 0.2])
+    assert rolling["timestamp"].dtype.kind == "M"
+
+
+def test_weighted_ensemble_scores_and_top_tickers(db):
+    tickers = ["AAPL", "MSFT", "NVDA"]
+    datetimes = [T0, T0 + timedelta(days=1)]
+    written = db.save_sentiment_matrices(tickers, datetimes, {
+        "rsi": np.array([[0.0, 1.0], [0.0, -0.5], [0.0, 0.2]]),
+        "macd": np.array([[0.0, 0.0], [0.0, 1.0], [np.nan, np.nan]]),
+    })
+    assert written == 10
+    db.save_sentiments([SentimentRecord("NVDA", "macd", T0 + timedelta(days=2), 1.0)])
+    db.save_coefficients(T0, {"rsi": 0.75, "macd": 0.25})
+
+    scores = db.ensemble_scores(as_of=T0 + timedelta(hours=30))
+    assert scores["ticker"].tolist() == ["AAPL", "NVDA", "MSFT"]
+    np.testing.assert_allclose(scores["score"], [0.75, 0.2, -0.125])
+    assert scores["agents"].tolist() == [2, 1, 2]
+    assert db.top_tickers(1).tolist() == ["NVDA"]
+    assert db.top_tickers(2, as_of=T0 + timedelta(days=1)).tolist() == ["AAPL", "NVDA"]
+
+    assert db.get_latest_sentiments(as_of=T0 + timedelta(days=1))["macd"] == {"AAPL": 0.0, "MSFT": 1.0}
+    assert len(db.get_sentiments(ticker="NVDA")) == 3
+    assert db.get_coefficients() == {"rsi": 0.75, "macd": 0.25} and db.get_coefficients(as_of=T0 - timedelta(days=1)) == {}
+
+
+class FrameAdapter(HistoricalDataAdapter):
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        return self.frames[ticker]
+
+
+def test_increments_and_universes_are_kept_apart(db):
+    days = pd.date_range(T0, periods=30, freq="D")
+    hours = pd.date_range(T0, periods=24 * 30, freq="h")
+    spread = lambda n: np.resize([0.01, -0.01], n)
+    db.save_agent_returns(["rsi", "macd"], days, np.array([[0.01], [-0.01]]) + spread(30))
+    db.save_agent_returns(["rsi", "macd", "obv"], hours, np.array([[-0.05], [0.05], [0.02]]) + spread(24 * 30),
+                          tick_increment=intraday_1hour)
+    db.save_agent_returns(["rsi"], days, np.full((1, 30), -0.2), universe="small_caps")
+
+    daily_ranking = db.rank_agents(window=10, as_of=days[-1])
+    assert daily_ranking["strategy"].tolist() == ["rsi", "macd"]
+    np.testing.assert_allclose(daily_ranking["mean_return"], [0.01, -0.01], atol=1e-12)
+    assert db.rank_agents(window=10, tick_increment=intraday_1hour)["strategy"].tolist() == ["macd", "obv", "rsi"]
+    assert len(db.rolling_agent_returns(window=5, universe="small_caps")["strategy"]) == 30
+
+    # Replacing a run's rows leaves the other increments alone
+    db.save_agent_returns(["macd"], days, np.full((1, 30), 0.02), replace=True)
+    assert db.rank_agents(window=10)["strategy"].tolist() == ["macd"]
+    assert len(db.rank_agents(tick_increment=intraday_1hour)["strategy"]) == 3
+
+    db.save_sentiments([SentimentRecord("AAPL", "rsi", days[-1], 1.0)])
+    db.save_sentiments([SentimentRecord("AAPL", "rsi", hours[-1], -1.0)], tick_increment=intraday_1hour)
+    db.save_coefficients(days[-1], {"rsi": 1.0})
+    assert db.ensemble_scores()["score"].tolist() == [1.0]
+    assert len(db.ensemble_scores(tick_increment=intraday_1hour)["ticker"]) == 0
+    assert db.get_latest_sentiments(tick_increment=intraday_1hour) == {"rsi": {"AAPL": -1.0}}
+
+
+def test_ranking_pipeline_stores_returns_and_coefficients(db):
+    rng = np.random.default_rng(2)
+    frames = {}
+    for ticker in ("AAA", "BBB", "CCC"):
+        close = 100 + np.cumsum(rng.normal(0, 1, 90))
+        frames[ticker] = pd.DataFrame({
+            df_datetime: pd.date_range("2024-01-01", periods=90, tz="UTC"),
+            df_open: close, df_high: close + 1, df_low: close - 1, df_close: close, df_volume: 1000,
+        })
+    # Returns of another increment and of agents dropped since an earlier run stay out of the ranking
+    db.save_agent_returns(["RSI", "SMA", "OLD"], pd.date_range("2024-01-01", periods=2000, freq="h"), rng.normal(0, 0.1, (3, 2000)),
+                          tick_increment=intraday_1hour)
+    db.save_agent_returns(["OLD"], pd.date_range("2024-01-01", periods=90, freq="D"), np.full((1, 90), 0.05))
+    ranking_client = run_ranking_pipeline(datetime(2024, 1, 1), datetime(2024, 3, 31), window=20, db_client=db,
+                                          tickers=list(frames), indicators=["RSI", "SMA"], historical_data_adapter=FrameAdapter(frames))
+
+    coefficients = db.get_coefficients()
+    assert coefficients == pytest.approx(ranking_client.coefficients())
+    assert set(coefficients) == {"RSI", "SMA"}
+    ranking = db.rank_agents(window=20)
+    assert ranking_client.ranking() == ranking["strategy"].tolist()
+    stats = ranking_client.stats()
+    np.testing.assert_allclose(ranking["sharpe"], [stats[agent]["sharpe"] for agent in ranking["strategy"]])
+    assert len(db.rolling_agent_returns(window=20)["strategy"]) == 2 * 89
+
+
+def test_store_does_not_import_the_clients():
+    script = "import sys, dbs.duck_db_client\nprint(sorted(m for m in sys.modules if m.split('.')[0] in ('clients', 'strategies', 'talib')))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,128 @@
+import subprocess
+import sys
+import textwrap
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.historical_data_adapters.cached_historical_data_adapter import CachedHistoricalDataAdapter
+from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+from dbs.duck_db_client import DuckDBClient
+from dbs.memmap_bar_store import MemmapBarStore
+from registries.standards.adapter_standards import (
+    daily, df_datetime, df_open, df_high, df_low, df_close, df_volume, output_arrays, output_records,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def make_frame(days, close=100.0):
+    index = pd.to_datetime(days, utc=True)
+    return pd.DataFrame({
+        df_datetime: index,
+        df_open: close, df_high: close + 1, df_low: close - 1, df_close: np.arange(len(index)) + close,
+        df_volume: np.arange(len(index)) + 10,
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MemmapBarStore(str(tmp_path / "bars"))
+
+
+def test_round_trip_returns_read_only_views(store):
+    days = pd.bdate_range("2024-01-02", periods=10)
+    assert store.write_bars("BRK/B", daily, make_frame(days)) == 10
+
+    arrays = store.open_bars("BRK/B", daily)
+    assert arrays[df_datetime].dtype == np.dtype("datetime64[ns]")
+    assert arrays[df_close].dtype == np.float64 and arrays[df_volume].dtype == np.int64
+    np.testing.assert_array_equal(arrays[df_close], np.arange(10) + 100.0)
+    assert arrays[df_close].flags.c_contiguous
+    assert not arrays[df_close].flags.owndata  # a view of the mapped file
+    with pytest.raises(ValueError):
+        arrays[df_close][0] = 0.0
+
+    window = store.open_bars("BRK/B", daily, date(2024, 1, 4), date(2024, 1, 9))
+    assert list(pd.to_datetime(window[df_datetime]).strftime("%m-%d")) == ["01-04", "01-05", "01-08", "01-09"]
+    assert np.shares_memory(window[df_close], arrays[df_close])
+    assert store.get_tickers(daily) == ["BRK/B"]
+    assert store.open_bars("MSFT", daily) is None
+
+
+def test_append_merges_and_replaces_atomically(store):
+    store.write_bars("AAPL", daily, make_frame(pd.bdate_range("2024-01-02", periods=5)))
+    before = store.open_bars("AAPL", daily)
+
+    update = make_frame(pd.bdate_range("2024-01-08", periods=3), close=200.0)  # overlaps the last stored day
+    assert store.append_bars("AAPL", daily, update) == 7
+    after = store.open_bars("AAPL", daily)
+    np.testing.assert_array_equal(after[df_close], [100, 101, 102, 103, 200, 201, 202])
+    # Views taken before the replacement still see the old file
+    np.testing.assert_array_equal(before[df_close], [100, 101, 102, 103, 104])
+
+    # The arrays format and unsorted input are accepted too
+    reversed_arrays = {name: values[::-1] for name, values in after.items()}
+    assert store.write_bars("AAPL", daily, reversed_arrays) == 7
+    np.testing.assert_array_equal(store.open_bars("AAPL", daily)[df_close], after[df_close])
+
+
+class DailyAdapter(HistoricalDataAdapter):
+    def __init__(self):
+        self.requests = 0
+
+    def get_historical_data(self, ticker, start_date, end_date, tick_increment=daily, output_format=output_records):
+        self.requests += 1
+        return make_frame(pd.bdate_range(start_date.date(), end_date.date()))
+
+
+def test_cached_adapter_serves_arrays_from_bar_files(store):
+    db_client = DuckDBClient(":memory:")
+    adapter = CachedHistoricalDataAdapter(DailyAdapter(), db_client=db_client, bar_store=store)
+
+    arrays = adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31), daily, output_format=output_arrays)
+    records = adapter.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31), daily)
+    assert len(arrays[df_close]) == len(records) == 23
+    assert store.has_bars("AAPL", daily)
+
+    adapter.get_historical_data("AAPL", datetime(2024, 2, 1), datetime(2024, 2, 9), daily)
+    assert len(store.open_bars("AAPL", daily)[df_close]) == 30
+
+    # A ticker already in DuckDB but without a file is exported on first arrays request
+    store.delete("AAPL", daily)
+    window = adapter.get_historical_data("AAPL", datetime(2024, 2, 5), datetime(2024, 2, 9), daily, output_format=output_arrays)
+    assert len(window[df_close]) == 5
+    db_client.close()
+
+
+def test_reader_process_shares_the_bar_files_while_a_writer_holds_duckdb(tmp_path):
+    db_path, root = str(tmp_path / "hyper.duckdb"), str(tmp_path / "bars")
+    writer_db = DuckDBClient(db_path)
+    writer = CachedHistoricalDataAdapter(DailyAdapter(), db_client=writer_db, bar_store=MemmapBarStore(root))
+    writer.get_historical_data("AAPL", datetime(2024, 1, 1), datetime(2024, 1, 31), daily)
+    writer.get_historical_data("AAPL", datetime(2024, 2, 1), datetime(2024, 2, 9), daily, output_format=output_arrays)
+
+    # The writer keeps its connection, and so DuckDB's file lock, while the reader runs
+    script = textwrap.dedent(f"""
+        from datetime import datetime
+        from adapters.historical_data_adapters.cached_historical_data_adapter import CachedHistoricalDataAdapter
+        from adapters.historical_data_adapters.historical_data_adapter import HistoricalDataAdapter
+        from dbs.duck_db_client import DuckDBClient
+        from dbs.memmap_bar_store import MemmapBarStore
+
+        class Offline(HistoricalDataAdapter):
+            def get_historical_data(self, *args, **kwargs):
+                raise AssertionError("fetched a cached range")
+
+        reader = CachedHistoricalDataAdapter(Offline(), db_client=DuckDBClient({db_path!r}), bar_store=MemmapBarStore({root!r}))
+        arrays = reader.get_historical_data("AAPL", datetime(2024, 1, 2), datetime(2024, 2, 9), "daily", output_format="arrays")
+        print(len(arrays["close"]), reader.db_client._connection is None)
+    """)
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert output.returncode == 0, output.stderr
+    assert output.stdout.split() == ["29", "True"]
+    assert MemmapBarStore(root).get_covered_ranges("AAPL", daily) == writer_db.get_covered_ranges("AAPL", daily)
+    writer_db.close()
@@ -0,0 +1,103 @@
+import inspect
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo import MongoClient
+
+from clients.ensemble_client import EnsembleResult
+from dbs.db_client import SentimentRecord, sentiment_records
+from dbs.mongo_db_client import MongoDBClient
+
+# Set to run against a real server, e.g. mongodb://localhost:27017
+MONGO_URI = os.environ.get("HYPER_TEST_MONGO_URI")
+T0 = datetime(2024, 3, 1, 15, 30)
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    if MONGO_URI:
+        client = MongoClient(MONGO_URI)
+        client.drop_database("hyper_system_test")
+    else:
+        mongomock = pytest.importorskip("mongomock")
+        # mongomock 4.3 predates the sort argument newer pymongo passes to bulk update builders
+        for name in ("add_update", "add_replace"):
+            original = getattr(mongomock.collection.BulkOperationBuilder, name)
+            if "sort" not in inspect.signature(original).parameters:
+                def compatible(self, *args, _original=original, sort=None, **kwargs):
+                    return _original(self, *args, **kwargs)
+                monkeypatch.setattr(mongomock.collection.BulkOperationBuilder, name, compatible)
+        client = mongomock.MongoClient()
+    db = MongoDBClient(database="hyper_system_test", bulk_batch_size=5, client=client)
+    yield db
+    client.drop_database("hyper_system_test")
+    db.close()
+
+
+def test_sentiments_are_bulk_upserted_in_batches(mongo_client, monkeypatch):
+    records = [
+        SentimentRecord(ticker, strategy, T0 + timedelta(days=day), 0.1 * i)
+        for day in range(2)
+        for i, (ticker, strategy) in enumerate((t, s) for t in ("AAPL", "MSFT", "NVDA") for s in ("rsi", "macd"))
+    ]
+    calls = []
+    collection_type = type(mongo_client._sentiments())
+    original = collection_type.bulk_write
+    monkeypatch.setattr(collection_type, "bulk_write", lambda self, ops, **kw: calls.append(len(ops)) or original(self, ops, **kw))
+
+    assert mongo_client.save_sentiments(records) == 12
+    assert calls == [5, 5, 2]
+    # Re-saving a cycle replaces its documents
+    mongo_client.save_sentiments([SentimentRecord("AAPL", "rsi", T0.replace(tzinfo=timezone.utc), -0.5)])
+
+    frame = mongo_client.get_sentiments(ticker="AAPL")
+    assert len(frame) == 4 and list(frame.columns) == ["ticker", "strategy", "timestamp", "sentiment"]
+    assert frame[(frame.strategy == "rsi") & (frame.timestamp == T0)]["sentiment"].tolist() == [-0.5]
+    assert len(mongo_client.get_sentiments(strategy="macd", start=T0 + timedelta(days=1))) == 3
+
+    latest = mongo_client.get_latest_sentiments()
+    assert set(latest) == {"rsi", "macd"} and latest["macd"]["NVDA"] == pytest.approx(0.5)
+    assert mongo_client.get_latest_sentiments(as_of=T0)["rsi"]["AAPL"] == -0.5
+
+    indexes = [info["key"] for info in mongo_client._sentiments().index_information().values()]
+    scope = [("universe", 1), ("tick_increment", 1)]
+    assert scope + [("strategy", 1), ("timestamp", -1)] in indexes and scope + [("ticker", 1), ("strategy", 1), ("timestamp", 1)] in indexes
+
+
+def test_coefficients_by_time_and_ensemble_results(mongo_client):
+    assert mongo_client.get_coefficients() == {}
+    mongo_client.save_coefficients(T0, {"rsi": 0.7, "macd": 0.3})
+    mongo_client.save_coefficients(T0 + timedelta(days=1), {"rsi": 0.4, "macd": 0.6})
+    assert mongo_client.get_coefficients() == {"rsi": 0.4, "macd": 0.6}
+    assert mongo_client.get_coefficients(as_of=T0 + timedelta(hours=1)) == {"rsi": 0.7, "macd": 0.3}
+
+    results = [
+        EnsembleResult("AAPL", "rsi", 0.25),
+        EnsembleResult("AAPL", "macd", None, ValueError("no data")),
+        EnsembleResult("MSFT", "rsi", -1.0),
+    ]
+    records = sentiment_records(results, T0)
+    assert records == [SentimentRecord("AAPL", "rsi", T0, 0.25), SentimentRecord("MSFT", "rsi", T0, -1.0)]
+    assert mongo_client.save_sentiments(records) == 2 and mongo_client.save_sentiments([]) == 0
+
+
+def test_increments_and_universes_are_kept_apart(mongo_client):
+    hourly = {"tick_increment": "1hour"}
+    mongo_client.save_sentiments([SentimentRecord("AAPL", "rsi", T0, 0.5)])
+    # Same key at a later time in the hourly scope; it must not become the daily "latest"
+    mongo_client.save_sentiments([SentimentRecord("AAPL", "rsi", T0, -0.5),
+                                  SentimentRecord("AAPL", "rsi", T0 + timedelta(hours=1), -0.25)], **hourly)
+    mongo_client.save_sentiments([SentimentRecord("SPY", "rsi", T0 + timedelta(days=1), 0.1)], universe="etfs")
+
+    assert mongo_client.get_latest_sentiments() == {"rsi": {"AAPL": 0.5}}
+    assert mongo_client.get_latest_sentiments(**hourly) == {"rsi": {"AAPL": -0.25}}
+    assert mongo_client.get_latest_sentiments(universe="etfs") == {"rsi": {"SPY": 0.1}}
+    assert mongo_client.get_sentiments(ticker="AAPL")["sentiment"].tolist() == [0.5]
+    assert mongo_client.get_sentiments(ticker="AAPL", **hourly)["sentiment"].tolist() == [-0.5, -0.25]
+
+    mongo_client.save_coefficients(T0, {"rsi": 1.0})
+    mongo_client.save_coefficients(T0 + timedelta(hours=1), {"rsi": 0.2}, **hourly)
+    assert mongo_client.get_coefficients() == {"rsi": 1.0}
+    assert mongo_client.get_coefficients(**hourly) == {"rsi": 0.2}
+    assert mongo_client.get_coefficients(universe="etfs") == {}
@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from registries.lazy_registry import LazyRegistry, load_target
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Importing the registries must not pull these in; the import time itself is the
+# startup.registry_import case in tests/benchmarks
+HEAVY_MODULES = ["pandas", "numpy", "talib", "yfinance", "finnhub", "requests", "duckdb", "config"]
+
+
+def test_targets_resolve_on_first_use_and_are_cached():
+    built = []
+
+    def factory():
+        built.append(1)
+        return object()
+
+    registry = LazyRegistry(instantiate=True)
+    registry.register("adapter", factory)
+    registry.register("decoder", "json:JSONDecoder")
+    assert registry.names() == ["adapter", "decoder"]
+    assert not built and not registry.is_resolved("adapter")
+
+    first = registry.get("adapter")
+    assert registry.get("adapter") is first
+    assert built == [1]
+    assert isinstance(registry.get("decoder"), json.JSONDecoder)
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_load_target_and_class_registry():
+    assert load_target("json:JSONDecoder.decode") is json.JSONDecoder.decode
+    registry = LazyRegistry()
+    registry.register("decoder", "json:JSONDecoder")
+    assert registry.values() == [json.JSONDecoder]
+    assert "decoder" in registry
+
+
+def test_registry_modules_import_without_heavy_dependencies():
+    script = (
+        "import sys\n"
+        "import registries.adapter_registries, registries.strategy_registries\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_strategy_registry_resolves_classes():
+    from registries import strategy_registries
+    from strategies.talib_strategy import AD_Strategy
+
+    assert strategy_registries.strategies == [AD_Strategy]
+    with pytest.raises(AttributeError):
+        strategy_registries.not_registered
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import talib
+
+from clients.testing_client import TestingClient
+from registries.strategy_registries import strategy_ideal_periods
+from strategies.candlestick_scanner import CANDLESTICK_PATTERNS, CandlestickScanner
+from strategies.cross_sectional_engine import BarMatrix
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return BarMatrix.from_historical_data(generate_ohlcv(4, 300, seed=3))
+
+
+def test_scan_matches_talib_for_every_pattern(bars):
+    scan = CandlestickScanner().scan(bars)
+
+    assert scan.signals.shape == (4, 300, len(CANDLESTICK_PATTERNS)) and scan.signals.dtype == np.int8
+    assert np.count_nonzero(scan.signals) > 0
+    for i in range(len(bars.tickers)):
+        for pattern in CANDLESTICK_PATTERNS:
+            expected = getattr(talib, pattern)(bars.open[i], bars.high[i], bars.low[i], bars.close[i]) // 100
+            np.testing.assert_array_equal(scan.pattern(pattern)[i], expected, err_msg=pattern)
+
+
+def test_bitsets_and_sentiments(bars):
+    scan = CandlestickScanner().scan(bars)
+    bullish, bearish = scan.packbits()
+    assert bullish.shape == (4, 300, (len(CANDLESTICK_PATTERNS) + 7) // 8)
+    unpacked = np.unpackbits(bullish, axis=2, count=len(CANDLESTICK_PATTERNS)).astype(bool)
+    np.testing.assert_array_equal(unpacked, scan.signals > 0)
+    np.testing.assert_array_equal(np.unpackbits(bearish, axis=2, count=len(CANDLESTICK_PATTERNS)).astype(bool), scan.signals < 0)
+
+    sentiments = scan.sentiments(["CDLENGULFING", "CDLHIKKAKE"])
+    assert set(sentiments) == {"CDLENGULFING", "CDLHIKKAKE"}
+    assert np.abs(sentiments["CDLHIKKAKE"]).max() <= 1
+    latest = scan.latest_scores(["CDLENGULFING"])["CDLENGULFING"]
+    assert latest == dict(zip(scan.tickers, sentiments["CDLENGULFING"][:, -1].tolist()))
+
+    # Pattern agents backtest like any other agent
+    result = TestingClient().run(bars, sentiments)
+    assert result.agents == ["CDLENGULFING", "CDLHIKKAKE"]
+
+
+def test_registry_lists_every_pattern_and_unknown_patterns_raise():
+    assert {name for name in strategy_ideal_periods if name.startswith("CDL")} == set(CANDLESTICK_PATTERNS)
+    with pytest.raises(ValueError):
+        CandlestickScanner(["CDLNOTAPATTERN"])
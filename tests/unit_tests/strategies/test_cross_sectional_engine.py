@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from registries import strategy_registries
+from strategies import indicator_kernels as kernels
+from strategies import indicator_graph as graph_nodes
+from strategies.indicator_graph import IndicatorGraph
+from strategies.cross_sectional_engine import BarMatrix, CrossSectionalIndicatorEngine, INDICATORS
+from strategies.talib_strategy import AD_Strategy
+from clients.testing_client import TestingClient
+from registries.standards.adapter_standards import df_datetime, df_open, df_high, df_low, df_close, df_volume
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+MACD_LINE = graph_nodes._sub(graph_nodes._ema(graph_nodes.CLOSE, 12, start=14), graph_nodes._ema(graph_nodes.CLOSE, 26))
+MACD_SIGNAL = graph_nodes._ema(MACD_LINE, 9, start=25)
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return BarMatrix.from_historical_data(generate_ohlcv(3, 120, seed=1))
+
+
+def test_kernels_match_talib(bars):
+    # TA-Lib hides the MACD line until its signal line is defined
+    graph = IndicatorGraph({"MACD": graph_nodes._op("mask_before", MACD_LINE, params=(33,)), "MACD_SIGNAL": MACD_SIGNAL, "PLUS_DI": graph_nodes.PLUS_DI_14,
+                            "MINUS_DI": graph_nodes.MINUS_DI_14, "DX": graph_nodes.DX_14, "ADX": graph_nodes.ADX_14,
+                            "ADXR": graph_nodes.ADXR_14, "TRIMA": graph_nodes._trima(graph_nodes.CLOSE, 30),
+                            "TRIMA_ODD": graph_nodes._trima(graph_nodes.CLOSE, 7)})
+    values = graph.evaluate(bars)
+    for i in range(len(bars.tickers)):
+        o, h, l, c, v = bars.open[i], bars.high[i], bars.low[i], bars.close[i], bars.volume[i]
+        ref_macd, ref_signal, _ = talib.MACD(c)
+        upper, middle, _ = talib.BBANDS(c)
+        pairs = [
+            (kernels.sma(bars.close, 30)[i], talib.SMA(c, 30)),
+            (kernels.ema(bars.close, 30)[i], talib.EMA(c, 30)),
+            (kernels.true_range(bars.high, bars.low, bars.close)[i], talib.TRANGE(h, l, c)),
+            (kernels.wilder(kernels.true_range(bars.high, bars.low, bars.close), 14, start=1)[i], talib.ATR(h, l, c)),
+            (kernels.ad(bars.high, bars.low, bars.close, bars.volume)[i], talib.AD(h, l, c, v)),
+            (kernels.obv(bars.close, bars.volume)[i], talib.OBV(c, v)),
+            (2 * kernels.rolling_std(bars.close, 20)[i], upper - middle),
+            (values["MACD"][i], ref_macd),
+            (values["MACD_SIGNAL"][i], ref_signal),
+            (values["PLUS_DI"][i], talib.PLUS_DI(h, l, c)),
+            (values["MINUS_DI"][i], talib.MINUS_DI(h, l, c)),
+            (values["DX"][i], talib.DX(h, l, c)),
+            (values["ADX"][i], talib.ADX(h, l, c)),
+            (values["ADXR"][i], talib.ADXR(h, l, c)),
+            (values["TRIMA"][i], talib.TRIMA(c)),
+            (values["TRIMA_ODD"][i], talib.TRIMA(c, 7)),
+        ]
+        for mine, reference in pairs:
+            np.testing.assert_allclose(mine, reference, atol=1e-8, equal_nan=True)
+
+
+def test_macd_variants_match_talib(bars):
+    sentiments = IndicatorGraph.compile(["MACD", "MACDFIX", "MACDEXT"]).evaluate(bars)
+    for i in range(len(bars.tickers)):
+        c = bars.close[i]
+        for name, (_, _, histogram) in [("MACD", talib.MACD(c)), ("MACDFIX", talib.MACDFIX(c)), ("MACDEXT", talib.MACDEXT(c))]:
+            np.testing.assert_allclose(sentiments[name][i], histogram / c, atol=1e-10, equal_nan=True)
+
+
+def test_graph_computes_shared_intermediates_once(bars, monkeypatch):
+    calls = []
+    true_range = graph_nodes.OPS["true_range"]
+    monkeypatch.setitem(graph_nodes.OPS, "true_range", lambda *args: calls.append(1) or true_range(*args))
+
+    names = ["ATR", "NATR", "TRANGE", "PLUS_DI", "MINUS_DI", "ADX"]
+    graph = IndicatorGraph.compile(names)
+    shared = graph.shared_nodes()
+    assert sorted(shared[graph_nodes.TRUE_RANGE]) == sorted(names)
+    assert sorted(shared[graph_nodes.ATR_14]) == ["ATR", "NATR"]
+    assert len(graph.order) == len(set(graph.order))
+
+    combined = graph.evaluate(bars)
+    assert len(calls) == 1
+    # Sharing does not change any indicator's output
+    for name in names:
+        alone = IndicatorGraph.compile([name]).evaluate(bars)[name]
+        np.testing.assert_array_equal(combined[name], alone)
+
+
+def test_moving_averages_share_one_running_total(bars, monkeypatch):
+    calls = []
+    running_total = graph_nodes.OPS["running_total"]
+    monkeypatch.setitem(graph_nodes.OPS, "running_total", lambda *args: calls.append(1) or running_total(*args))
+
+    names = ["SMA", "MA", "TRIMA", "BBANDS", "MACDEXT"]
+    graph = IndicatorGraph.compile(names)
+    assert sorted(graph.shared_nodes()[graph_nodes.CLOSE_TOTAL]) == sorted(names)
+
+    combined = graph.evaluate(bars)
+    # One total over the close, plus one each over TRIMA's inner average and MACDEXT's line
+    assert len(calls) == 3
+    for name in names:
+        np.testing.assert_array_equal(combined[name], IndicatorGraph.compile([name]).evaluate(bars)[name])
+
+
+def test_engine_outputs_sentiment_matrices(bars):
+    sentiments = CrossSectionalIndicatorEngine().run(bars)
+
+    assert set(sentiments) == set(INDICATORS)
+    for matrix in sentiments.values():
+        assert matrix.shape == bars.shape
+        finite = matrix[np.isfinite(matrix)]
+        assert finite.size and finite.min() >= -1 and finite.max() <= 1
+
+
+def test_ad_sentiment_matches_ad_strategy(bars):
+    sentiments = CrossSectionalIndicatorEngine(["chaikin_ad_line"]).run(bars)
+    scores = CrossSectionalIndicatorEngine.latest_scores(bars, sentiments)["chaikin_ad_line"]
+
+    strategy = AD_Strategy()
+    for i, ticker in enumerate(bars.tickers):
+        arrays = {df_datetime: bars.datetimes, df_open: bars.open[i], df_high: bars.high[i],
+                  df_low: bars.low[i], df_close: bars.close[i], df_volume: bars.volume[i]}
+        assert scores[ticker] == pytest.approx(strategy.run_strategy(arrays, bars.close[i, -1]))
+
+
+def test_bar_matrix_aligns_tickers():
+    days = pd.date_range("2024-01-01", periods=5, tz="UTC")
+    frame = pd.DataFrame({df_datetime: days, df_open: 1.0, df_high: 2.0, df_low: 0.5,
+                          df_close: [1.0, 1.1, 1.2, 1.3, 1.4], df_volume: 10})
+    late = frame.iloc[[1, 2, 4]]  # starts a day later and has no bar on day 4
+    bars = BarMatrix.from_historical_data({"A": frame, "B": late.to_dict("records"), "EMPTY": []})
+
+    assert bars.tickers == ["A", "B"]
+    assert bars.shape == (2, 5)
+    assert bars.close[0].tolist() == [1.0, 1.1, 1.2, 1.3, 1.4]
+    np.testing.assert_array_equal(bars.close[1], [np.nan, 1.1, 1.2, 1.2, 1.4])
+    np.testing.assert_array_equal(bars.volume[1], [np.nan, 10, 10, 0, 10])
+    assert bars.high[1, 3] == 1.2
+    assert bars.first_bars().tolist() == [0, 1]
+
+
+def test_short_history_ticker_keeps_the_universe_timeline():
+    frames = generate_ohlcv(tickers=["T0", "T1", "T2"], n_bars=150, seed=1)
+    frames["T2"] = frames["T2"].iloc[90:]  # T2 lists late
+    bars = BarMatrix.from_historical_data(frames)
+    assert bars.shape == (3, 150) and np.isnan(bars.close[2, :90]).all()
+
+    engine = CrossSectionalIndicatorEngine(["RSI", "MACD", "chaikin_ad_line"])
+    sentiments = engine.run(bars)
+    alone = {ticker: engine.run(BarMatrix.from_historical_data({ticker: frames[ticker]})) for ticker in ("T0", "T2")}
+    for name in engine.indicators:
+        np.testing.assert_allclose(sentiments[name][0], alone["T0"][name][0], equal_nan=True)
+        assert np.isnan(sentiments[name][2, :90]).all()
+        np.testing.assert_allclose(sentiments[name][2, 90:], alone["T2"][name][0], equal_nan=True)
+        assert not np.isnan(sentiments[name][2, -1])
+
+    # The late ticker is left out of the equal weighting until it lists
+    result = TestingClient(cost_bps=0).run(bars, {"long": np.ones(bars.shape)})
+    returns = np.diff(bars.close[:2], axis=1) / bars.close[:2, :-1]
+    np.testing.assert_allclose(result.portfolio_returns[0, :89], returns[:, :89].mean(axis=0))
+
+
+def test_unknown_indicator_rejected():
+    with pytest.raises(ValueError):
+        CrossSectionalIndicatorEngine(["NOT_AN_INDICATOR"])
+
+
+def test_engine_compiles_registered_strategies():
+    assert CrossSectionalIndicatorEngine.for_strategies(strategy_registries.strategies).indicators == ["chaikin_ad_line"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import talib
+
+from strategies import incremental_indicators as incremental
+from strategies.talib_strategy import AD_Strategy
+from registries.standards.adapter_standards import df_high, df_low, df_close, df_volume
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+def make_frame(n=300, seed=0):
+    return generate_ohlcv(tickers=["AAPL"], n_bars=n, seed=seed)["AAPL"]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_indicators_match_talib_bar_by_bar(seed):
+    frame = make_frame(seed=seed)
+    h, l, c, v = (frame[col].to_numpy(dtype=np.float64) for col in (df_high, df_low, df_close, df_volume))
+    macd, signal, histogram = talib.MACD(c)
+    cases = [
+        (incremental.IncrementalAD(), talib.AD(h, l, c, v)),
+        (incremental.IncrementalOBV(), talib.OBV(c, v)),
+        (incremental.IncrementalEMA(), talib.EMA(c)),
+        (incremental.IncrementalRSI(), talib.RSI(c)),
+        (incremental.IncrementalATR(), talib.ATR(h, l, c)),
+        (incremental.IncrementalSAR(), talib.SAR(h, l)),
+    ]
+    macd_state = incremental.IncrementalMACD()
+    bars = frame.to_dict("records")
+
+    for indicator, reference in cases:
+        streamed = [indicator.update(bar) for bar in bars]
+        np.testing.assert_allclose(streamed, reference, atol=1e-9, equal_nan=True)
+
+    streamed = np.array([(macd_state.update(bar), macd_state.signal, macd_state.histogram) for bar in bars])
+    np.testing.assert_allclose(streamed, np.column_stack([macd, signal, histogram]), atol=1e-9, equal_nan=True)
+
+
+def test_warm_up_then_update_matches_full_history():
+    frame = make_frame()
+    rsi = incremental.IncrementalRSI()
+    rsi.warm_up(frame.iloc[:-1])
+    assert rsi.update(frame.iloc[-1].to_dict()) == pytest.approx(talib.RSI(frame[df_close].to_numpy())[-1])
+
+
+def test_ad_strategy_streams_the_same_scores_as_run_strategy():
+    frame = make_frame(60)
+    strategy = AD_Strategy()
+
+    assert strategy.warm_up(frame.iloc[:40], "AAPL") == strategy.run_strategy(frame.iloc[:40], 1.0)
+    strategy.warm_up(frame.iloc[:10], "MSFT")
+    for i in range(40, 60):
+        bar = frame.iloc[i].to_dict()
+        assert strategy.update(bar, "AAPL") == pytest.approx(strategy.run_strategy(frame.iloc[:i + 1], 1.0))
+    # Other tickers keep their own state
+    assert strategy.update(frame.iloc[10].to_dict(), "MSFT") == pytest.approx(strategy.run_strategy(frame.iloc[:11], 1.0))
+
+
+def test_ad_strategy_update_needs_two_bars():
+    strategy = AD_Strategy()
+    with pytest.raises(ValueError):
+        strategy.update(make_frame(1).iloc[0].to_dict(), "AAPL")
@@ -0,0 +1,103 @@
+import pytest
+
+from strategies.strategy_cache import StrategyResultCache
+from strategies.talib_strategy import AD_Strategy
+from registries.standards.adapter_standards import df_datetime, df_close
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+class CountingStrategy(AD_Strategy):
+    def __init__(self, timeperiod=14):
+        super().__init__()
+        self.timeperiod = timeperiod
+        self._calls = 0
+
+    def run_strategy(self, historical_data, current_price):
+        self._calls += 1
+        return super().run_strategy(historical_data, current_price)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_frame(n=30, seed=0):
+    return generate_ohlcv(tickers=["AAPL"], n_bars=n, seed=seed)["AAPL"]
+
+
+def test_identical_inputs_hit_the_cache():
+    cache = StrategyResultCache()
+    strategy = CountingStrategy()
+    frame = make_frame()
+
+    first = cache.run_strategy(strategy, "AAPL", frame, 101.234)
+    assert cache.run_strategy(strategy, "AAPL", frame.copy(), 101.2349) == first
+    assert strategy._calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # A new bar, another ticker, another price bucket or other parameters all miss
+    cache.run_strategy(strategy, "AAPL", make_frame(31), 101.234)
+    cache.run_strategy(strategy, "MSFT", frame, 101.234)
+    cache.run_strategy(strategy, "AAPL", frame, 105.0)
+    cache.run_strategy(CountingStrategy(timeperiod=7), "AAPL", frame, 101.234)
+    assert strategy._calls == 4
+    assert cache.stats()["misses"] == 5
+
+
+def test_updated_last_bar_misses():
+    cache = StrategyResultCache()
+    strategy = CountingStrategy()
+    frame = make_frame()
+    cache.run_strategy(strategy, "AAPL", frame, 100.0)
+
+    forming = frame.copy()
+    forming.loc[forming.index[-1], df_close] += 1
+    cache.run_strategy(strategy, "AAPL", forming, 100.0)
+    assert strategy._calls == 2
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = StrategyResultCache(max_size=2, ttl_seconds=10, clock=clock)
+    strategy = CountingStrategy()
+    frame = make_frame()
+
+    cache.run_strategy(strategy, "A", frame, 1.0)
+    clock.now = 11
+    cache.run_strategy(strategy, "A", frame, 1.0)
+    assert strategy._calls == 2
+
+    cache.run_strategy(strategy, "B", frame, 1.0)
+    cache.run_strategy(strategy, "A", frame, 1.0)  # refreshes A
+    cache.run_strategy(strategy, "C", frame, 1.0)  # evicts B
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+    cache.run_strategy(strategy, "A", frame, 1.0)  # still cached
+    assert strategy._calls == 4
+    cache.run_strategy(strategy, "B", frame, 1.0)
+    assert strategy._calls == 5
+
+
+def test_fingerprint_covers_all_output_formats():
+    cache = StrategyResultCache()
+    strategy = CountingStrategy()
+    frame = make_frame()
+    arrays = {col: frame[col].to_numpy() for col in frame.columns}
+    records = frame.assign(**{df_datetime: frame[df_datetime].dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")}).to_dict("records")
+
+    scores = {cache.run_strategy(strategy, "AAPL", data, 1.0) for data in (frame, arrays, records)}
+    assert len(scores) == 1
+    cache.run_strategy(strategy, "AAPL", arrays, 1.0)
+    cache.run_strategy(strategy, "AAPL", records, 1.0)
+    assert cache.stats()["hits"] == 3  # frame and arrays share a key, then both repeats hit
+
+
+def test_exceptions_are_not_cached():
+    cache = StrategyResultCache()
+    strategy = CountingStrategy()
+    with pytest.raises(ValueError):
+        cache.run_strategy(strategy, "AAPL", make_frame(1), 1.0)
+    assert len(cache) == 0
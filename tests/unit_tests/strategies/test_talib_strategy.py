@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import talib
+
+from adapters.historical_data_adapters.historical_data_formats import bar_frame_to_records
+from strategies.talib_strategy import AD_Strategy
+from registries.standards.adapter_standards import df_open, df_high, df_low, df_close, df_volume
+from tests.benchmarks.synthetic_data import generate_ohlcv
+
+
+def make_records(n=30, seed=7):
+    return bar_frame_to_records(generate_ohlcv(tickers=["AAPL"], n_bars=n, seed=seed)["AAPL"])
+
+
+def test_ad_strategy_gives_same_score_for_every_format():
+    records = make_records()
+    frame = pd.DataFrame(records)
+    arrays = {col: frame[col].to_numpy() for col in frame.columns}
+    arrays[df_volume] = arrays[df_volume].astype(np.int64)
+    strategy = AD_Strategy()
+
+    scores = [strategy.run_strategy(data, 100.0) for data in (records, frame.copy(), arrays)]
+
+    ad = talib.AD(frame[df_high].to_numpy(float), frame[df_low].to_numpy(float),
+                  frame[df_close].to_numpy(float), frame[df_volume].to_numpy(float))
+    expected = float(np.clip((ad[-1] - ad[-2]) / abs(ad[-2]), -1, 1))
+    assert scores == [expected] * 3
+    assert -1 <= expected <= 1
+
+
+def test_ad_strategy_does_not_modify_input():
+    frame = pd.DataFrame(make_records())
+    AD_Strategy().run_strategy(frame, 100.0)
+    assert frame[df_volume].dtype == np.int64
+
+
+def test_price_arrays_are_not_copied_for_float_columns():
+    close = np.arange(5, dtype=np.float64)
+    arrays = {df_open: close, df_high: close, df_low: close, df_close: close, df_volume: np.arange(5)}
+    prices = AD_Strategy().get_price_arrays(arrays)
+    assert prices[df_close] is close
+    assert prices[df_volume].dtype == np.float64